@@ -1 +1,52 @@
+import os
+
 GRADE_PATTERN = r"(?i)GRADE\s*:\s*([CPI])(.*)"
+
+# Quantitative evaluation concurrency
+# NOTE: When enabled, all ten_perspective tasks are submitted to inspect_ai in a single eval() call
+EVAL_CONCURRENT_PERSPECTIVES = os.getenv(
+    "EVAL_CONCURRENT_PERSPECTIVES", "true").lower() == "true"
+# Maximum number of perspective tasks that inspect_ai runs in parallel
+EVAL_MAX_TASKS = int(os.getenv("EVAL_MAX_TASKS", "10"))
+# Maximum number of concurrent connections per model (None: inspect_ai default)
+EVAL_MAX_CONNECTIONS = int(os.getenv("EVAL_MAX_CONNECTIONS")) if os.getenv(
+    "EVAL_MAX_CONNECTIONS") else None
+
+# Quantitative evaluation job queue (src/worker/evaluation_worker.py)
+# Number of worker processes that pull jobs from the evaluation_job table
+EVAL_WORKER_PROCESSES = int(os.getenv("EVAL_WORKER_PROCESSES", "2"))
+# Seconds between polls of the job table when the queue is empty
+EVAL_WORKER_POLL_INTERVAL = float(os.getenv("EVAL_WORKER_POLL_INTERVAL", "5"))
+# Seconds between heartbeats of a running job
+EVAL_JOB_HEARTBEAT_INTERVAL = float(os.getenv("EVAL_JOB_HEARTBEAT_INTERVAL", "15"))
+# A running job whose heartbeat is older than this (seconds) is considered abandoned and is picked up again
+EVAL_JOB_STALE_AFTER = float(os.getenv("EVAL_JOB_STALE_AFTER", "300"))
+# Maximum number of attempts for a job before it is marked as failed
+EVAL_JOB_MAX_ATTEMPTS = int(os.getenv("EVAL_JOB_MAX_ATTEMPTS", "3"))
+
+# GSN YAML registry (src/gsn/gsn_registry.py)
+# Path of the compiled GSN trees sidecar reused at startup (unset: parse the YAML files at first use)
+GSN_REGISTRY_CACHE_PATH = os.getenv("GSN_REGISTRY_CACHE_PATH") or None
+
+# Response cache of the quantitative evaluation (src/inspect/eval_cache.py)
+EVAL_CACHE_ENABLED = os.getenv("EVAL_CACHE_ENABLED", "true").lower() == "true"
+# Lifetime of a cached response (inspect_ai CachePolicy expiry, e.g. "12h", "1W"; "none": no expiry)
+EVAL_CACHE_EXPIRY = None if os.getenv("EVAL_CACHE_EXPIRY", "1W").lower() == "none" else os.getenv(
+    "EVAL_CACHE_EXPIRY", "1W")
+# Size limit of the cache directory in bytes (0: no limit)
+EVAL_CACHE_MAX_BYTES = int(os.getenv("EVAL_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# Per-endpoint rate limiting of the model calls (src/inspect/rate_limiter.py)
+# Maximum concurrent calls of a model whose AIModel.max_concurrency is not set
+RATE_LIMIT_DEFAULT_CONCURRENCY = int(os.getenv("RATE_LIMIT_DEFAULT_CONCURRENCY", "10"))
+RATE_LIMIT_MIN_CONCURRENCY = int(os.getenv("RATE_LIMIT_MIN_CONCURRENCY", "1"))
+# Multiplicative decrease of the concurrency limit on 429
+RATE_LIMIT_DECREASE_FACTOR = float(os.getenv("RATE_LIMIT_DECREASE_FACTOR", "0.5"))
+# Minimum seconds between two decreases
+RATE_LIMIT_COOLDOWN = float(os.getenv("RATE_LIMIT_COOLDOWN", "5"))
+
+# Paraphrase generation of /scoring-dataset (src/inspect/scoring_datasets.py)
+# Maximum number of paraphrase requests in flight
+PARAPHRASE_CONCURRENCY = int(os.getenv("PARAPHRASE_CONCURRENCY", "5"))
+# Seconds a finished /scoring-dataset job (and its events) is kept in memory
+SCORING_JOB_TTL = float(os.getenv("SCORING_JOB_TTL", "3600"))
@@ -0,0 +1,176 @@
+"""
+Benchmark of the hot lookups with and without the secondary indexes of define_tables.py.
+
+Creates the tables in a scratch schema of the configured PostgreSQL database, seeds them,
+times each query without the secondary indexes, creates the indexes, times again and prints both.
+The scratch schema is dropped at the end; the application tables are not touched.
+
+Usage:
+    PYTHONPATH=/app python src/db/benchmark_indexes.py --datasets 20000 --evaluations 2000
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from sqlalchemy import create_engine, event, insert, text, select
+from sqlalchemy.orm import Session
+from src.db.session import DATABASE_URL
+from src.db.define_tables import (
+    Base, Dataset, EvaluationPerspective, CustomDatasets, DatasetCustomMapping,
+    Evaluation, EvaluationResult, UseGSN
+)
+from src.constants.perspectives import TEN_PERSPECTIVES_JA
+from src.utils.logger import logger
+
+SCHEMA = "index_benchmark"
+
+
+def create_benchmark_engine():
+    bench_engine = create_engine(DATABASE_URL)
+
+    @event.listens_for(bench_engine, "connect")
+    def set_search_path(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.close()
+        dbapi_connection.commit()
+
+    return bench_engine
+
+
+def seed(bench_engine, n_datasets: int, n_evaluations: int, batch_size: int = 1000):
+    """
+    Seed perspectives, datasets (half of them GSN), custom datasets, evaluations and results
+    """
+    logger.info(
+        f"seed: datasets={n_datasets}, evaluations={n_evaluations} のデータを投入します。")
+    n_custom = max(n_evaluations, 1)
+    with bench_engine.begin() as conn:
+        conn.execute(insert(EvaluationPerspective), [
+            {"id": i + 1, "perspective_name": name} for i, name in enumerate(TEN_PERSPECTIVES_JA)])
+        for start in range(0, n_datasets, batch_size):
+            conn.execute(insert(Dataset), [
+                {
+                    "id": i + 1,
+                    "name": f"GSN_G{i % 10 + 1}-{i}" if i % 2 == 0 else f"dataset_{i}",
+                    "data_content": b"\x00" * 64,
+                    "type": "quantitative" if i % 3 else "qualitative",
+                    "score_rate": 1.0,
+                    "evaluation_perspective_id": i % 10 + 1,
+                }
+                for i in range(start, min(start + batch_size, n_datasets))
+            ])
+        conn.execute(insert(CustomDatasets), [
+            {"id": i + 1, "name": f"custom_{i}"} for i in range(n_custom)])
+        # Each custom dataset maps 20 datasets
+        mappings = [
+            {"dataset_id": (c * 20 + k) % n_datasets + 1, "custom_datasets_id": c + 1,
+             "perspective_id": k % 10 + 1, "percentage": 1.0}
+            for c in range(n_custom) for k in range(20)
+        ]
+        for start in range(0, len(mappings), batch_size):
+            conn.execute(insert(DatasetCustomMapping),
+                         mappings[start:start + batch_size])
+        now = datetime.now()
+        conn.execute(insert(Evaluation), [
+            {"id": i + 1, "name": f"evaluation_{i}", "created_date": now, "custom_datasets_id": i % n_custom + 1}
+            for i in range(n_evaluations)])
+        # Five results per evaluation
+        results = [
+            {"id": i + 1, "name": f"result_{i}", "created_date": now,
+             "evaluation_id": i % n_evaluations + 1, "quantitative_eval_state": "done"}
+            for i in range(n_evaluations * 5)
+        ]
+        for start in range(0, len(results), batch_size):
+            conn.execute(insert(EvaluationResult),
+                         results[start:start + batch_size])
+        conn.execute(insert(UseGSN), [
+            {"evaluation_id": i + 1, "evaluation_perspective_id": i % 10 + 1}
+            for i in range(n_evaluations)])
+
+
+def hot_queries(n_datasets: int, n_evaluations: int) -> dict:
+    """
+    The lookups of the application hot paths (statement built the same way as in the managers)
+    """
+    probe = n_evaluations // 2 + 1
+    return {
+        # GSNExplorer.get_gsn_data
+        "gsn_datasets_by_perspective": select(Dataset.id).where(
+            Dataset.name.like("GSN_%"), Dataset.evaluation_perspective_id == 3),
+        # DatasetManager.get_summaries / Quantitative/QualitativeDatasetService.get_all
+        "datasets_by_type_without_gsn": select(Dataset.id, Dataset.name).where(
+            Dataset.type == "qualitative", ~Dataset.name.startswith("GSN_")),
+        # QuantitativeDatasetService.get_by_name
+        "dataset_by_name_and_type": select(Dataset.id).where(
+            Dataset.name == f"dataset_{n_datasets // 2 + 1}", Dataset.type == "quantitative"),
+        # CustomDatasetsManager / EvaluationManager.get_all
+        "mappings_by_custom_datasets_id": select(DatasetCustomMapping.dataset_id).where(
+            DatasetCustomMapping.custom_datasets_id == probe),
+        "results_by_evaluation_id": select(EvaluationResult.id).where(
+            EvaluationResult.evaluation_id == probe),
+        "use_gsn_by_evaluation_id": select(UseGSN.evaluation_perspective_id).where(
+            UseGSN.evaluation_id == probe),
+    }
+
+
+def time_queries(bench_engine, queries: dict, repeat: int) -> dict:
+    """
+    :return: {name: (median milliseconds, first line of the plan)}
+    """
+    timings = {}
+    with Session(bench_engine) as db:
+        for name, stmt in queries.items():
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                db.execute(stmt).all()
+                samples.append((time.perf_counter() - start) * 1000)
+            sql = str(stmt.compile(bench_engine,
+                      compile_kwargs={"literal_binds": True}))
+            plan = db.execute(text(f"EXPLAIN {sql}")).scalars().all()
+            timings[name] = (statistics.median(samples), plan[0].strip())
+    return timings
+
+
+def run_benchmark(n_datasets: int, n_evaluations: int, repeat: int):
+    bench_engine = create_benchmark_engine()
+    with bench_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    bench_engine.dispose()
+    try:
+        Base.metadata.create_all(bench_engine)
+        indexes = [index for table in Base.metadata.sorted_tables for index in table.indexes]
+        for index in indexes:
+            index.drop(bind=bench_engine)
+
+        seed(bench_engine, n_datasets, n_evaluations)
+        queries = hot_queries(n_datasets, n_evaluations)
+        with bench_engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        before = time_queries(bench_engine, queries, repeat)
+
+        for index in indexes:
+            index.create(bind=bench_engine)
+        with bench_engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        after = time_queries(bench_engine, queries, repeat)
+
+        print(f"datasets={n_datasets}, evaluations={n_evaluations}, repeat={repeat} (median ms)")
+        print(f"{'query':<34}{'before':>10}{'after':>10}  plan after")
+        for name in queries:
+            print(f"{name:<34}{before[name][0]:>10.3f}{after[name][0]:>10.3f}  {after[name][1]}")
+    finally:
+        with bench_engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        bench_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--datasets", type=int, default=20000)
+    parser.add_argument("--evaluations", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run_benchmark(args.datasets, args.evaluations, args.repeat)
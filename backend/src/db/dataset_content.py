@@ -0,0 +1,158 @@
+"""
+Serialization of Dataset.data_content.
+
+Dataset contents are stored as Parquet (zstd compressed) so that readers can project
+only the columns they need instead of unpickling the whole DataFrame.
+A list of dicts is stored as Parquet only if it decodes back to the same values and types;
+otherwise (missing values, nested dicts with different keys, ...) it is pickled.
+Rows registered before this format existed are pickled; their Dataset.content_format is NULL.
+"""
+import math
+import hashlib
+import io
+import pickle
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.utils.logger import logger
+
+CONTENT_FORMAT_PICKLE = "pickle"
+CONTENT_FORMAT_PARQUET = "parquet-zstd-v1"
+
+# Columns read by the quantitative evaluation (register_quantitative_result / eval_datasets)
+EVAL_DATASET_COLUMNS = ["text", "output", "ten_perspective",
+                        "scorer", "gsn_perspective", "requirement", "choices"]
+# Multiple choice datasets keep their options in columns such as ans1, ans2, ... (df.filter(like='ans'))
+EVAL_DATASET_COLUMNS_LIKE = ["ans"]
+
+# Parquet key-value metadata telling the reader which python object to rebuild
+_KIND_KEY = b"aisev.content_kind"
+_KIND_DATAFRAME = b"dataframe"
+_KIND_RECORDS = b"records"
+
+
+def _records_to_frame(records: list) -> pd.DataFrame | None:
+    """
+    Convert a list of dicts to a DataFrame (only when every row has the same keys)
+    """
+    if not records or not all(isinstance(r, dict) for r in records):
+        return None
+    keys = list(records[0].keys())
+    if any(list(r.keys()) != keys for r in records):
+        return None
+    return pd.DataFrame.from_records(records, columns=keys)
+
+
+def _same_value(a, b) -> bool:
+    """
+    Equality that also requires the same python types (1 != 1.0, None != nan)
+    """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same_value(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_same_value(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+
+def encode_content(content) -> tuple[bytes, str]:
+    """
+    Serialize dataset contents for Dataset.data_content
+    :param content: pd.DataFrame or list of dicts
+    :return: (binary, content_format)
+    """
+    if isinstance(content, pd.DataFrame):
+        df, kind = content, _KIND_DATAFRAME
+    else:
+        df, kind = _records_to_frame(content), _KIND_RECORDS
+    if df is not None:
+        try:
+            table = pa.Table.from_pandas(df)
+            table = table.replace_schema_metadata(
+                {**(table.schema.metadata or {}), _KIND_KEY: kind})
+            buffer = io.BytesIO()
+            pq.write_table(table, buffer, compression="zstd")
+            binary_content = buffer.getvalue()
+            # NOTE: Arrow unifies the types of a column (None -> nan, int -> float, struct keys merged);
+            # records are only kept as Parquet when they decode back unchanged
+            if kind == _KIND_DATAFRAME or _same_value(
+                    content, decode_content(binary_content, CONTENT_FORMAT_PARQUET)):
+                return binary_content, CONTENT_FORMAT_PARQUET
+            logger.info("encode_content: Parquetでは元の値を復元できないためpickleで保存します")
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            # NOTE: Columns with mixed python types cannot be converted to Arrow; keep them pickled
+            logger.warning(f"encode_content: Parquetに変換できないためpickleで保存します: {e}")
+    return pickle.dumps(content), CONTENT_FORMAT_PICKLE
+
+
+def build_content_columns(content) -> dict:
+    """
+    Serialize dataset contents and compute the metadata columns stored next to them,
+    so that listings never have to read data_content.
+    :param content: pd.DataFrame or list of dicts
+    :return: dict of Dataset column values (data_content, content_format, row_count, column_names, byte_size, content_hash)
+    """
+    binary_content, content_format = encode_content(content)
+    if isinstance(content, pd.DataFrame):
+        column_names = [str(c) for c in content.columns]
+    elif content and isinstance(content[0], dict):
+        column_names = [str(c) for c in content[0].keys()]
+    else:
+        column_names = []
+    return {
+        "data_content": binary_content,
+        "content_format": content_format,
+        "row_count": len(content),
+        "column_names": column_names,
+        "byte_size": len(binary_content),
+        "content_hash": hashlib.sha256(binary_content).hexdigest(),
+    }
+
+
+def content_to_records(content) -> list:
+    """
+    Convert decoded contents to JSON-compatible records (NaN -> None)
+    """
+    if isinstance(content, pd.DataFrame):
+        return content.astype(object).where(content.notna(), None).to_dict(orient="records")
+    return list(content)
+
+
+def _select_columns(data: bytes, columns: list[str] | None, columns_like: list[str] | None) -> list[str] | None:
+    if columns is None and columns_like is None:
+        return None
+    names = pq.read_schema(pa.BufferReader(data)).names
+    return [name for name in names
+            if (columns and name in columns) or (columns_like and any(s in name for s in columns_like))]
+
+
+def decode_content(data: bytes, content_format: str | None, columns: list[str] | None = None, columns_like: list[str] | None = None):
+    """
+    Deserialize Dataset.data_content
+    :param data: Dataset.data_content
+    :param content_format: Dataset.content_format (None for rows stored before the column existed)
+    :param columns: Columns to read (None reads all). Missing columns are ignored.
+    :param columns_like: Also read columns whose name contains one of these strings
+    :return: pd.DataFrame or list of dicts (same type as registered)
+    """
+    if content_format != CONTENT_FORMAT_PARQUET:
+        content = pickle.loads(data)
+        if isinstance(content, pd.DataFrame) and (columns is not None or columns_like is not None):
+            content = content[[c for c in content.columns
+                               if (columns and c in columns) or (columns_like and any(s in str(c) for s in columns_like))]]
+        return content
+
+    selected = _select_columns(data, columns, columns_like)
+    table = pq.read_table(pa.BufferReader(data), columns=selected)
+    df = table.to_pandas()
+    # NOTE: Arrow list columns come back as numpy arrays; restore python lists (e.g. choices)
+    for field in table.schema:
+        if pa.types.is_list(field.type) or pa.types.is_large_list(field.type):
+            df[field.name] = df[field.name].map(
+                lambda v: v.tolist() if hasattr(v, "tolist") else v)
+    if (table.schema.metadata or {}).get(_KIND_KEY) == _KIND_RECORDS:
+        return df.to_dict(orient="records")
+    return df
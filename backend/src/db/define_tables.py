@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON, LargeBinary, DateTime, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, LargeBinary, DateTime, Float, Boolean, Index
 from sqlalchemy.orm import declarative_base, relationship
 from src.db.session import engine
 from src.utils.logger import logger
@@ -10,9 +10,24 @@ Base = declarative_base()
 
 class Dataset(Base):
     __tablename__ = "dataset"
+    __table_args__ = (
+        # GSN datasets of a perspective: evaluation_perspective_id = ? AND name LIKE 'GSN_%'
+        Index("ix_dataset_perspective_name", "evaluation_perspective_id", "name",
+              postgresql_ops={"name": "text_pattern_ops"}),
+        # Listings by type excluding GSN datasets, and lookups by (name, type)
+        Index("ix_dataset_type_name", "type", "name",
+              postgresql_ops={"name": "text_pattern_ops"}),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String)
     data_content = Column(LargeBinary)
+    # Serialization of data_content (see src/db/dataset_content.py). NULL means legacy pickle
+    content_format = Column(String)
+    # Metadata of data_content written at registration time (used by dataset listings)
+    row_count = Column(Integer)
+    column_names = Column(JSON)
+    byte_size = Column(Integer)
+    content_hash = Column(String)
     type = Column(String)  # "quantitative/qualitative"
     score_rate = Column(Float)
     second_goal = Column(String)
@@ -55,6 +70,10 @@ class EvaluationPerspective(Base):
 
 class DatasetCustomMapping(Base):
     __tablename__ = "dataset_custom_mapping"
+    __table_args__ = (
+        # The primary key starts with dataset_id, so lookups by custom_datasets_id need their own index
+        Index("ix_dataset_custom_mapping_custom_datasets_id", "custom_datasets_id"),
+    )
     dataset_id = Column(Integer, ForeignKey("dataset.id"), primary_key=True)
     custom_datasets_id = Column(Integer, ForeignKey(
         "custom_datasets.id"), primary_key=True)
@@ -80,6 +99,10 @@ class AIModel(Base):
     api_key = Column(String)
     api_request_format = Column(JSON)
     type = Column(String)  # "target/eval/both"
+    # Rate limits of the endpoint (None: no limit / default concurrency), see src/inspect/rate_limiter.py
+    rpm_limit = Column(Integer)  # requests per minute
+    tpm_limit = Column(Integer)  # tokens per minute
+    max_concurrency = Column(Integer)
     # relationships
     target_evaluation_results = relationship(
         "EvaluationResult", back_populates="target_ai_model", foreign_keys='EvaluationResult.target_ai_model_id')
@@ -87,11 +110,14 @@ class AIModel(Base):
         "EvaluationResult", back_populates="evaluator_ai_model", foreign_keys='EvaluationResult.evaluator_ai_model_id')
 
     def __repr__(self):
-        return f"<AIModel(id={self.id}, name={self.name}, model_name={self.model_name}, url={self.url}, api_key={self.api_key}, api_request_format={self.api_request_format}, type={self.type})>"
+        return f"<AIModel(id={self.id}, name={self.name}, model_name={self.model_name}, url={self.url}, api_key={self.api_key}, api_request_format={self.api_request_format}, type={self.type}, rpm_limit={self.rpm_limit}, tpm_limit={self.tpm_limit}, max_concurrency={self.max_concurrency})>"
 
 
 class Evaluation(Base):
     __tablename__ = "evaluation"
+    __table_args__ = (
+        Index("ix_evaluation_custom_datasets_id", "custom_datasets_id"),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String)
     created_date = Column(DateTime)
@@ -108,6 +134,9 @@ class Evaluation(Base):
 
 class EvaluationResult(Base):
     __tablename__ = "evaluation_result"
+    __table_args__ = (
+        Index("ix_evaluation_result_evaluation_id", "evaluation_id"),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String)
     created_date = Column(DateTime)
@@ -123,6 +152,14 @@ class EvaluationResult(Base):
         "AIModel", back_populates="target_evaluation_results", foreign_keys=[target_ai_model_id])
     evaluator_ai_model = relationship(
         "AIModel", back_populates="evaluator_evaluation_results", foreign_keys=[evaluator_ai_model_id])
+    jobs = relationship("EvaluationJob", back_populates="evaluation_result",
+                        cascade="all, delete")
+    log_blobs = relationship("EvaluationLogBlob", back_populates="evaluation_result",
+                             cascade="all, delete")
+    sample_results = relationship("EvaluationSampleResult", back_populates="evaluation_result",
+                                  cascade="all, delete")
+    score_cache = relationship("EvaluationScoreCache", back_populates="evaluation_result",
+                               cascade="all, delete", uselist=False)
 
     def __repr__(self):
         return f"<EvaluationResult(id={self.id}, name={self.name}, created_date={self.created_date}, evaluation_id={self.evaluation_id}, target_ai_model_id={self.target_ai_model_id}, evaluator_ai_model_id={self.evaluator_ai_model_id},  quantitative_eval_state={self.quantitative_eval_state})>"
@@ -130,6 +167,7 @@ class EvaluationResult(Base):
 
 class UseGSN(Base):
     __tablename__ = "use_gsn"
+    # NOTE: The primary key (evaluation_id, evaluation_perspective_id) also serves lookups by evaluation_id
     evaluation_id = Column(Integer, ForeignKey(
         "evaluation.id"), primary_key=True)
     evaluation_perspective_id = Column(Integer, ForeignKey(
@@ -143,6 +181,125 @@ class UseGSN(Base):
         return f"<UseGSN(evaluation_id={self.evaluation_id}, evaluation_perspective_id={self.evaluation_perspective_id})>"
 
 
+class EvaluationJob(Base):
+    __tablename__ = "evaluation_job"
+    __table_args__ = (
+        # Queue polling (status = ? ORDER BY id) and the latest job of a result
+        Index("ix_evaluation_job_status_id", "status", "id"),
+        Index("ix_evaluation_job_result_id", "evaluation_result_id", "id"),
+    )
+    id = Column(Integer, primary_key=True)
+    evaluation_result_id = Column(Integer, ForeignKey("evaluation_result.id"))
+    payload = Column(JSON)  # dataset_ids, target/evaluator model ids, etc.
+    status = Column(String)  # "queued", "running", "done", "failed"
+    progress = Column(Float)  # 0.0 - 1.0
+    progress_message = Column(String)
+    attempts = Column(Integer)
+    worker_id = Column(String)
+    error = Column(String)
+    created_date = Column(DateTime)
+    started_date = Column(DateTime)
+    heartbeat_date = Column(DateTime)
+    finished_date = Column(DateTime)
+    rate_limits = Column(JSON)  # rate limiter snapshot of the worker process (written with the heartbeat)
+    # relationships
+    evaluation_result = relationship("EvaluationResult", back_populates="jobs")
+
+    def __repr__(self):
+        return f"<EvaluationJob(id={self.id}, evaluation_result_id={self.evaluation_result_id}, status={self.status}, progress={self.progress}, worker_id={self.worker_id}, attempts={self.attempts})>"
+
+
+class EvaluationLogBlob(Base):
+    """
+    inspect_ai log of one perspective of a quantitative evaluation (compressed JSON)
+    """
+    __tablename__ = "evaluation_log_blob"
+    id = Column(Integer, primary_key=True)
+    evaluation_result_id = Column(
+        Integer, ForeignKey("evaluation_result.id"), index=True)
+    perspective = Column(String)
+    encoding = Column(String)  # "zlib-json"
+    data = Column(LargeBinary)
+    raw_size = Column(Integer)
+    accuracy = Column(Float)  # results.scores[0].metrics.accuracy of the log
+    sample_count = Column(Integer)
+    # relationships
+    evaluation_result = relationship(
+        "EvaluationResult", back_populates="log_blobs")
+
+    def __repr__(self):
+        return f"<EvaluationLogBlob(id={self.id}, evaluation_result_id={self.evaluation_result_id}, perspective={self.perspective}, raw_size={self.raw_size}, accuracy={self.accuracy})>"
+
+
+class EvaluationSampleResult(Base):
+    """
+    Score of one sample of a quantitative evaluation.
+    input/output are not copied; they are referenced by (log_blob_id, sample_index).
+    """
+    __tablename__ = "evaluation_sample_result"
+    __table_args__ = (
+        Index("ix_evaluation_sample_result_result_perspective",
+              "evaluation_result_id", "perspective"),
+    )
+    id = Column(Integer, primary_key=True)
+    evaluation_result_id = Column(Integer, ForeignKey("evaluation_result.id"))
+    log_blob_id = Column(Integer, ForeignKey("evaluation_log_blob.id"))
+    perspective = Column(String)
+    sample_index = Column(Integer)  # index in samples of the log
+    sample_id = Column(String)
+    score = Column(Float)  # reduced score value (0.0 if missing)
+    answered = Column(Boolean)  # False if the model returned no choices
+    # relationships
+    evaluation_result = relationship(
+        "EvaluationResult", back_populates="sample_results")
+    gsn_links = relationship("EvaluationSampleGSN", back_populates="sample_result",
+                             cascade="all, delete")
+
+    def __repr__(self):
+        return f"<EvaluationSampleResult(id={self.id}, evaluation_result_id={self.evaluation_result_id}, perspective={self.perspective}, sample_id={self.sample_id}, score={self.score})>"
+
+
+class EvaluationSampleGSN(Base):
+    """
+    GSN perspectives (e.g. "G1-2") a sample belongs to
+    """
+    __tablename__ = "evaluation_sample_gsn"
+    __table_args__ = (
+        Index("ix_evaluation_sample_gsn_result_perspective_gsn",
+              "evaluation_result_id", "perspective", "gsn_perspective"),
+    )
+    sample_result_id = Column(Integer, ForeignKey(
+        "evaluation_sample_result.id"), primary_key=True)
+    gsn_perspective = Column(String, primary_key=True)
+    # Denormalized from EvaluationSampleResult so that GSN aggregates can use a single index
+    evaluation_result_id = Column(Integer, ForeignKey("evaluation_result.id"))
+    perspective = Column(String)
+    # relationships
+    sample_result = relationship(
+        "EvaluationSampleResult", back_populates="gsn_links")
+
+    def __repr__(self):
+        return f"<EvaluationSampleGSN(sample_result_id={self.sample_result_id}, gsn_perspective={self.gsn_perspective})>"
+
+class EvaluationScoreCache(Base):
+    """
+    Computed 10-perspective scores of an evaluation result.
+    Valid only while the fingerprint of the scoring inputs matches.
+    """
+    __tablename__ = "evaluation_score_cache"
+    evaluation_result_id = Column(Integer, ForeignKey(
+        "evaluation_result.id"), primary_key=True)
+    fingerprint = Column(String)
+    scores = Column(JSON)
+    gsn_breakdown = Column(JSON)  # {perspective: {qual_score, quant_score, normalization_factor}}
+    created_date = Column(DateTime)
+    # relationships
+    evaluation_result = relationship(
+        "EvaluationResult", back_populates="score_cache")
+
+    def __repr__(self):
+        return f"<EvaluationScoreCache(evaluation_result_id={self.evaluation_result_id}, fingerprint={self.fingerprint}, created_date={self.created_date})>"
+
 class InitialDataMigrator():
     def __init__(self, engine):
         self.session = sessionmaker(bind=engine)()
@@ -0,0 +1,71 @@
+"""
+One-shot migration of Dataset.data_content from pickle to Parquet (see src/db/dataset_content.py).
+Adds the content_format and metadata columns (row_count, column_names, byte_size, content_hash)
+to an existing dataset table, re-encodes every legacy row and backfills the metadata.
+Rows that cannot be converted stay pickled (content_format="pickle") and are still readable.
+
+Usage:
+    PYTHONPATH=/app python src/db/migrate_dataset_content.py
+"""
+from sqlalchemy import or_, text
+from sqlalchemy.orm import sessionmaker
+from src.db.session import engine
+from src.db.define_tables import Dataset
+from src.db.dataset_content import build_content_columns, decode_content, CONTENT_FORMAT_PARQUET
+from src.utils.logger import logger
+
+
+def add_content_columns():
+    with engine.begin() as conn:
+        for column, column_type in [("content_format", "VARCHAR"), ("row_count", "INTEGER"),
+                                    ("column_names", "JSON"), ("byte_size", "INTEGER"),
+                                    ("content_hash", "VARCHAR")]:
+            conn.execute(text(
+                f"ALTER TABLE dataset ADD COLUMN IF NOT EXISTS {column} {column_type}"))
+
+
+def migrate_dataset_content() -> tuple[int, int]:
+    """
+    Re-encode legacy datasets and fill missing metadata one row at a time (data_content can be large)
+    :return: (number of converted rows, number of rows left as pickle)
+    """
+    logger.info("migrate_dataset_content: データセットの変換処理を開始します。")
+    session = sessionmaker(bind=engine)()
+    converted = 0
+    skipped = 0
+    try:
+        dataset_ids = [r.id for r in session.query(Dataset.id).filter(
+            or_(Dataset.content_format.is_(None), Dataset.row_count.is_(None))).order_by(Dataset.id).all()]
+        for dataset_id in dataset_ids:
+            dataset = session.query(Dataset).filter_by(id=dataset_id).first()
+            try:
+                content = decode_content(
+                    dataset.data_content, dataset.content_format)
+            except Exception as e:
+                logger.error(
+                    f"migrate_dataset_content: ID={dataset_id} のデシリアライズに失敗しました: {e}")
+                skipped += 1
+                continue
+            content_columns = build_content_columns(content)
+            for column, value in content_columns.items():
+                setattr(dataset, column, value)
+            session.commit()
+            session.expunge(dataset)
+            if content_columns["content_format"] == CONTENT_FORMAT_PARQUET:
+                converted += 1
+            else:
+                skipped += 1
+        logger.info(
+            f"migrate_dataset_content: {converted}件を変換しました。({skipped}件はpickleのままです)")
+        return converted, skipped
+    except Exception as e:
+        logger.error(f"migrate_dataset_content: 変換処理中にエラーが発生しました: {e}")
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    add_content_columns()
+    migrate_dataset_content()
@@ -0,0 +1,43 @@
+"""
+One-shot migration that creates the secondary indexes declared in define_tables.py
+(__table_args__ / index=True) on an existing database. Indexes that already exist are skipped,
+so it is safe to run repeatedly. Run ANALYZE afterwards so that the planner picks them up.
+
+Usage:
+    PYTHONPATH=/app python src/db/migrate_indexes.py
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from src.db.session import engine
+from src.db.define_tables import Base
+from src.utils.logger import logger
+
+
+def create_missing_indexes(bind: Engine = engine) -> list[str]:
+    """
+    Create declared indexes that do not exist yet
+    :return: Names of the created indexes
+    """
+    logger.info("create_missing_indexes: インデックスの作成処理を開始します。")
+    created = []
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name, schema=table.schema):
+                continue
+            existing = {i["name"] for i in inspector.get_indexes(
+                table.name, schema=table.schema)}
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                if index.name in existing:
+                    continue
+                index.create(bind=conn)
+                created.append(index.name)
+                logger.info(f"create_missing_indexes: {index.name} を作成しました。")
+        if created and conn.dialect.name == "postgresql":
+            conn.execute(text("ANALYZE"))
+    logger.info(f"create_missing_indexes: {len(created)}件のインデックスを作成しました。")
+    return created
+
+
+if __name__ == "__main__":
+    create_missing_indexes()
@@ -0,0 +1,26 @@
+"""
+One-shot migration that adds the rate limit columns (see src/inspect/rate_limiter.py)
+to existing ai_model and evaluation_job tables. Safe to run repeatedly.
+
+Usage:
+    PYTHONPATH=/app python src/db/migrate_rate_limits.py
+"""
+from sqlalchemy import text
+from src.db.session import engine
+from src.utils.logger import logger
+
+
+def add_rate_limit_columns():
+    logger.info("add_rate_limit_columns: レート制限カラムの追加処理を開始します。")
+    with engine.begin() as conn:
+        for table, column, column_type in [("ai_model", "rpm_limit", "INTEGER"),
+                                           ("ai_model", "tpm_limit", "INTEGER"),
+                                           ("ai_model", "max_concurrency", "INTEGER"),
+                                           ("evaluation_job", "rate_limits", "JSON")]:
+            conn.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {column_type}"))
+    logger.info("add_rate_limit_columns: レート制限カラムの追加が完了しました。")
+
+
+if __name__ == "__main__":
+    add_rate_limit_columns()
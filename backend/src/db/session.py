@@ -2,11 +2,16 @@
 Module for managing db sessions
 """
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
+import importlib.util
 import os
+import threading
+import time
 from pathlib import Path
+from src.utils.logger import logger
 
 
 # Reading the .env file
@@ -19,11 +24,98 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
+# Connection pool (per process: the API and every evaluation worker have their own pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+# Seconds to wait for a free connection before raising TimeoutError
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Seconds after which a pooled connection is replaced (-1: never)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Async engine (asyncpg) for the read-only endpoints. Falls back to the sync engine when asyncpg is not installed
+# NOTE: Off by default: with asyncpg, run_sync executes the sync managers on the event loop
+DB_ASYNC_ENABLED = os.getenv("DB_ASYNC_ENABLED", "false").lower() == "true"
+
 DATABASE_URL = f"postgresql+pg8000://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+
+class PoolMetrics:
+    """
+    Counters of a pool, updated by its connect / checkout / checkin events
+    (held time: from checkout to checkin of a connection)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.checked_out_max = 0
+        self.held_seconds_total = 0.0
+        self.held_seconds_max = 0.0
+
+    def attach(self, engine):
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checkout_time"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out_max = max(self.checked_out_max, self.checkouts - self.checkins)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("checkout_time", None)
+        held = time.perf_counter() - started if started is not None else 0.0
+        with self._lock:
+            self.checkins += 1
+            self.held_seconds_total += held
+            self.held_seconds_max = max(self.held_seconds_max, held)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checked_out_max": self.checked_out_max,
+                "held_seconds_avg": round(self.held_seconds_total / self.checkins, 6) if self.checkins else 0.0,
+                "held_seconds_max": round(self.held_seconds_max, 6),
+            }
+
+
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
+pool_metrics = PoolMetrics()
+pool_metrics.attach(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = None
+async_pool_metrics = None
+AsyncSessionLocal = None
+if DB_ASYNC_ENABLED:
+    if importlib.util.find_spec("asyncpg") is None:
+        logger.warning("session: asyncpgがインストールされていないため、同期エンジンを使用します。")
+    else:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+        async_pool_metrics = PoolMetrics()
+        async_pool_metrics.attach(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db():
     db = SessionLocal()
@@ -31,3 +123,55 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+class ThreadpoolReadSession:
+    """
+    Session of get_async_db when the async engine is disabled (default).
+    Provides AsyncSession.run_sync over a sync Session, running the function in the threadpool.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.db, *args, **kwargs)
+
+
+async def get_async_db():
+    """
+    Session for read-only async endpoints. Call managers with `await db.run_sync(Manager.method, ...)`
+    (a sync Session in the threadpool, or AsyncSession on asyncpg when DB_ASYNC_ENABLED)
+    NOTE: With asyncpg, run_sync executes on the event loop and blocks it for the Python side of the call
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield ThreadpoolReadSession(db)
+        finally:
+            db.close()
+
+
+def _pool_status(pool, metrics: PoolMetrics) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "timeout": pool.timeout(),
+        **metrics.as_dict(),
+    }
+
+
+def get_pool_stats() -> dict:
+    """
+    Connection pool metrics of this process
+    """
+    stats = {"sync": _pool_status(engine.pool, pool_metrics)}
+    stats["async"] = _pool_status(
+        async_engine.sync_engine.pool, async_pool_metrics) if async_engine is not None else None
+    return stats
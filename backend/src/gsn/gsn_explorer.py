@@ -1,15 +1,17 @@
+import numpy as np
+import pandas as pd
 from src.db.define_tables import EvaluationPerspective, Dataset
 from src.db.session import SessionLocal
 from src.utils.logger import logger
 
 """
-Class that recursively searches YAML for GoalStructureNotation(GNS)
+Class that searches YAML for GoalStructureNotation(GNS)
 """
 
 
 class GSNExplorer:
     """
-    GSNExplorer is a class that recursively explores the YAML of GoalStructureNotation (GSN).
+    GSNExplorer is a class that explores the YAML of GoalStructureNotation (GSN).
     """
 
     def __init__(self, yaml_data):
@@ -22,74 +24,117 @@ class GSNExplorer:
 
     def explore(self, current_position="", second_goal="", current_score_rate=1.0):
         """
-        Recursively explore YAML data and display hierarchical structures.
+        Explore YAML data and return the leaves of the hierarchical structure.
         The result will contain
         - leaf: Final question
         - score_rate: Score rate
         - second_goal: Definition of SecondGoal
         """
-        logger.info(f"explore: current_position={current_position}, second_goal={second_goal}, current_score_rate={current_score_rate}")
         try:
             # Find the starting point for TopGoal search
             if current_position == "":
-                # Initialization at first call
-                self.results = []
-                # Search TopGoal
-                for key, node in self.yaml_data.items():
-                    if node.get('goalType') == 'TopGoal':
-                        next_position = node['supportedBy'][0]
-                        self.explore(current_position=next_position,
-                                     second_goal="",
-                                     current_score_rate=1.0)
-                        return self.results
+                top_goal = next((node for node in self.yaml_data.values()
+                                 if node.get('goalType') == 'TopGoal'), None)
+                if top_goal is None:
+                    raise ValueError("TopGoal not found")
+                current_position = top_goal['supportedBy'][0]
+                second_goal = ""
+                current_score_rate = 1.0
 
-            # See elements specified by supported_by
-            node = self.yaml_data[current_position]
-            scores = node.get('scoreRate')
-
-            # print(f"current_position: {current_position}")
-            # print(f"node: {node}")
-
-            # If goalType is SecondGoal, set second_goal
-            if node.get('goalType') == 'SecondGoal':
-                second_goal = node.get('definition', '')
-
-            # If leaf、add to result
-            if node.get('undeveloped', False):
+            self.results = []
+            for node_id, leaf, absolute, factors, leaf_second_goal in self._leaf_entries(current_position):
+                score_rate = 1.0 if absolute else current_score_rate
+                for factor in factors:
+                    score_rate = score_rate * factor
                 self.results.append({
-                    'ID': current_position,
-                    'leaf': node.get('question', ''),
-                    'score_rate': current_score_rate,
-                    'second_goal': second_goal,
+                    'ID': node_id,
+                    'leaf': leaf,
+                    'score_rate': score_rate,
+                    'second_goal': second_goal if leaf_second_goal is None else leaf_second_goal,
                 })
-
-            # If choice、continued search with no change in score
-            # -> If a node has no score, the search continues without changing the score.
-            # elif node.get('relationshipType') == 'choice':
-            elif scores is None:
-                for next_position in node.get('supportedBy', []):
-                    self.explore(current_position=next_position,
-                                 second_goal=second_goal,
-                                 current_score_rate=current_score_rate,)
-
-            # If it is just a node, update the score and continue the search
-            else:
-                for next_position, score_rate in zip(node.get('supportedBy', []), node.get('scoreRate', [])):
-                    # If current_position is Sn-1 (n is an integer between 1 and 10), the first node directly connected from Top
-                    if current_position.startswith('S') and current_position.endswith('-1'):
-                        new_score_rate = 1.0 * score_rate
-                    else:
-                        new_score_rate = current_score_rate * score_rate
-                    # print(f"next_position: {next_position}, score_rate: {score_rate}, new_score_rate: {new_score_rate}")
-                    # Recursive search
-                    self.explore(current_position=next_position,
-                                second_goal=second_goal,
-                                current_score_rate=new_score_rate,)
-            logger.info(f"explore: current_position={current_position} の探索が完了しました。")
+            logger.info(
+                f"explore: {current_position} から{len(self.results)}件のリーフを取得しました。")
+            return self.results
         except Exception as e:
             logger.error(f"explore: 探索処理中にエラーが発生しました: {e}")
             raise
 
+    def _leaf_entries(self, start_position) -> list[tuple]:
+        """
+        Iterative post-order traversal from start_position. Each node's leaves are computed once and
+        shared by every parent that refers to it.
+        Leaf entry: (ID, question, absolute, factors, second_goal)
+        - absolute: the score is restarted at 1.0 (below an Sn-1 node) instead of the caller's score
+        - factors: scoreRate values to multiply in order (keeps the float result of the recursive search)
+        - second_goal: definition of the nearest SecondGoal above the leaf (None: inherited from the caller)
+        """
+        memo = {}
+        on_path = set()
+        stack = [(start_position, False)]
+        while stack:
+            position, children_done = stack.pop()
+            if position in memo:
+                continue
+            node = self.yaml_data[position]
+            is_leaf = node.get('undeveloped', False)
+            if not children_done:
+                if position in on_path:
+                    raise ValueError(f"GSN has a cycle at {position}")
+                on_path.add(position)
+                stack.append((position, True))
+                if not is_leaf:
+                    for next_position in reversed(node.get('supportedBy', [])):
+                        if next_position in on_path:
+                            raise ValueError(
+                                f"GSN has a cycle: {position} -> {next_position}")
+                        if next_position not in memo:
+                            stack.append((next_position, False))
+                continue
+
+            on_path.discard(position)
+            own_second_goal = node.get('definition', '') if node.get('goalType') == 'SecondGoal' else None
+            scores = node.get('scoreRate')
+            # If leaf、add to result
+            if is_leaf:
+                entries = [(position, node.get('question', ''), False, (), None)]
+            # If a node has no score, the search continues without changing the score.
+            elif scores is None:
+                entries = [entry for next_position in node.get('supportedBy', [])
+                           for entry in memo[next_position]]
+            # If it is just a node, the score rate of the child is applied
+            else:
+                # If current_position is Sn-1 (n is an integer between 1 and 10), the first node directly connected from Top
+                restart = position.startswith('S') and position.endswith('-1')
+                entries = []
+                for next_position, score_rate in zip(node.get('supportedBy', []), scores):
+                    for node_id, leaf, absolute, factors, leaf_second_goal in memo[next_position]:
+                        if not absolute:
+                            absolute, factors = restart, (score_rate,) + factors
+                        entries.append((node_id, leaf, absolute, factors, leaf_second_goal))
+            if own_second_goal is not None:
+                entries = [(node_id, leaf, absolute, factors,
+                            own_second_goal if leaf_second_goal is None else leaf_second_goal)
+                           for node_id, leaf, absolute, factors, leaf_second_goal in entries]
+            memo[position] = entries
+        return memo[start_position]
+
+    def leaf_weight_table(self) -> pd.DataFrame:
+        """
+        Leaf weight table indexed by leaf ID (columns: leaf, score_rate, second_goal).
+        A leaf reached by several paths keeps the last one, as in register_gsn_dataset.
+        """
+        table = pd.DataFrame(self.explore(), columns=['ID', 'leaf', 'score_rate', 'second_goal'])
+        return table.drop_duplicates(subset=['ID'], keep='last').set_index('ID')
+
+    @staticmethod
+    def lookup_leaf_weights(table: pd.DataFrame, leaf_ids, default: float = np.nan) -> np.ndarray:
+        """
+        score_rate of each leaf ID (default for IDs that are not in the table)
+        :param table: Result of leaf_weight_table
+        :param leaf_ids: Leaf IDs (e.g. ["G1-12", "G1-13"])
+        """
+        return table['score_rate'].reindex(list(leaf_ids)).fillna(default).to_numpy(dtype=float)
+
     def get_gsn_data(self, perspective_id) -> list[Dataset]:
         """
         Obtains GSN data based on the specified evaluation viewpoint ID.
@@ -0,0 +1,167 @@
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+import yaml
+from src.gsn.gsn_explorer import GSNExplorer
+from src.constants.config import GSN_REGISTRY_CACHE_PATH
+from src.utils.logger import logger
+
+"""
+Process-wide registry of the parsed GSN YAML trees
+"""
+
+GSN_DIR = Path(__file__).parent  # /app/src/gsn/
+GSN_LIST = [
+    "01_Control_of_Toxic_Output_GSN.yaml",
+    "02_Prevention_of_Misinformation_Disinformation_and_Manipulation_GSN.yaml",
+    "03_Fairness_and_Inclusion_GSN.yaml",
+    "04_Addressing_High-risk_Use_and_Unintended_Use_GSN.yaml",
+    "05_Privacy_Protection_GSN.yaml",
+    "06_Ensuring_Security_GSN.yaml",
+    "07_Explainability_GSN.yaml",
+    "08_Robustness_GSN.yaml",
+    "09_Data_Quality_GSN.yaml",
+    "10_Verifiability_GSN.yaml",
+]
+# Bump when the layout of the compiled sidecar changes
+SIDECAR_VERSION = 1
+
+
+class GSNRegistry:
+    """
+    Parses each GSN YAML file once and keeps the tree, its flattened leaves (GSNExplorer.explore)
+    and a node ID index. A file is parsed again when its mtime or size changes.
+    When a sidecar path is configured, the compiled trees are stored there and reused at startup.
+
+    The returned YAML trees are shared: callers must not modify them.
+    """
+
+    def __init__(self, gsn_dir: Path = GSN_DIR, gsn_list: List[str] = GSN_LIST,
+                 sidecar_path: str | None = GSN_REGISTRY_CACHE_PATH):
+        self.gsn_dir = Path(gsn_dir)
+        self.gsn_list = list(gsn_list)
+        self.sidecar_path = Path(sidecar_path) if sidecar_path else None
+        # file name -> {"stamp", "yaml_data", "leaves"}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # node ID -> file name
+        self._node_index: Dict[str, str] = {}
+        # Leaf weight table of all files (see GSNExplorer.leaf_weight_table)
+        self._leaf_weights: pd.DataFrame | None = None
+        self._lock = threading.Lock()
+        self._sidecar_loaded = False
+
+    def _stamp(self, file_name: str) -> tuple[int, int]:
+        stat = os.stat(self.gsn_dir / file_name)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _parse(self, file_name: str, stamp: tuple[int, int]) -> Dict[str, Any]:
+        logger.info(f"GSNRegistry: {file_name} のパースを開始します。")
+        with open(self.gsn_dir / file_name, "r", encoding="utf-8") as f:
+            yaml_data = yaml.safe_load(f.read().replace('\x0b', ''))
+        leaves = GSNExplorer(yaml_data).explore()
+        return {"stamp": stamp, "yaml_data": yaml_data, "leaves": leaves}
+
+    def _load_sidecar(self):
+        self._sidecar_loaded = True
+        if self.sidecar_path is None or not self.sidecar_path.exists():
+            return
+        try:
+            with open(self.sidecar_path, "rb") as f:
+                compiled = pickle.load(f)
+            if compiled.get("version") != SIDECAR_VERSION:
+                logger.info("GSNRegistry: サイドカーのバージョンが異なるため使用しません。")
+                return
+            self._entries = compiled["entries"]
+            logger.info(
+                f"GSNRegistry: サイドカー {self.sidecar_path} から{len(self._entries)}件のGSNを読み込みました。")
+        except Exception as e:
+            logger.error(f"GSNRegistry: サイドカーの読み込みに失敗しました: {e}")
+            self._entries = {}
+
+    def _save_sidecar(self):
+        if self.sidecar_path is None:
+            return
+        try:
+            tmp_path = self.sidecar_path.with_suffix(
+                self.sidecar_path.suffix + ".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": SIDECAR_VERSION, "entries": self._entries},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.sidecar_path)
+        except Exception as e:
+            logger.error(f"GSNRegistry: サイドカーの保存に失敗しました: {e}")
+
+    def _refresh(self):
+        """
+        Parse files that are new or changed since they were last parsed
+        """
+        with self._lock:
+            if not self._sidecar_loaded:
+                self._load_sidecar()
+            changed = False
+            for file_name in self.gsn_list:
+                stamp = self._stamp(file_name)
+                entry = self._entries.get(file_name)
+                if entry is None or entry["stamp"] != stamp:
+                    self._entries[file_name] = self._parse(file_name, stamp)
+                    changed = True
+            if changed or not self._node_index:
+                self._node_index = {
+                    node_id: file_name
+                    for file_name in self.gsn_list
+                    for node_id in self._entries[file_name]["yaml_data"]
+                }
+                leaves = [leaf for file_name in self.gsn_list
+                          for leaf in self._entries[file_name]["leaves"]]
+                self._leaf_weights = pd.DataFrame(
+                    leaves, columns=['ID', 'leaf', 'score_rate', 'second_goal']
+                ).drop_duplicates(subset=['ID'], keep='last').set_index('ID')
+            if changed:
+                self._save_sidecar()
+
+    def get_yaml_data_list(self) -> List[Dict[str, Any]]:
+        """
+        GSN YAML trees in the order of GSN_LIST
+        """
+        self._refresh()
+        return [self._entries[file_name]["yaml_data"] for file_name in self.gsn_list]
+
+    def get_leaves(self, file_name: str) -> List[Dict[str, Any]]:
+        """
+        Flattened leaves of a GSN file (the result of GSNExplorer.explore)
+        """
+        self._refresh()
+        return [dict(leaf) for leaf in self._entries[file_name]["leaves"]]
+
+    def find_leaves(self, yaml_data: Dict[str, Any]) -> List[Dict[str, Any]] | None:
+        """
+        Precomputed leaves of a tree returned by get_yaml_data_list (None for any other tree)
+        """
+        for entry in self._entries.values():
+            if entry["yaml_data"] is yaml_data:
+                return [dict(leaf) for leaf in entry["leaves"]]
+        return None
+
+    def get_leaf_weights(self, leaf_ids, default: float = np.nan) -> np.ndarray:
+        """
+        score_rate of each leaf ID across all GSN files (default for unknown IDs)
+        """
+        self._refresh()
+        return GSNExplorer.lookup_leaf_weights(self._leaf_weights, leaf_ids, default)
+
+    def get_node(self, gsn_id: str) -> Dict[str, Any] | None:
+        """
+        Node of any GSN file by its ID (e.g. "G1-12", "G10-3")
+        """
+        self._refresh()
+        file_name = self._node_index.get(gsn_id)
+        if file_name is None:
+            return None
+        return self._entries[file_name]["yaml_data"].get(gsn_id)
+
+
+gsn_registry = GSNRegistry()
@@ -1,29 +1,19 @@
 from typing import List, Dict, Any
 from src.gsn.gsn_explorer import GSNExplorer
+from src.gsn.gsn_registry import gsn_registry, GSN_LIST
 from pathlib import Path
 import pandas as pd
-from src.manager.quantitative_dataset_manager import QuantitativeDatasetService
-from src.manager.qualitative_dataset_manager import QualitativeDatasetService
+from src.manager.dataset_manager import DatasetManager
+from src.manager.qualitative_dataset_manager import to_qualitative_contents
 from sqlalchemy.orm import Session
 from src.utils.logger import logger
-import pickle
+from src.db.dataset_content import decode_content
 from sqlalchemy import text
 from src.db.define_tables import Dataset
 
 
 class RegisterDatasetForGSN:
-    GSN_LIST = [
-        "01_Control_of_Toxic_Output_GSN.yaml",
-        "02_Prevention_of_Misinformation_Disinformation_and_Manipulation_GSN.yaml",
-        "03_Fairness_and_Inclusion_GSN.yaml",
-        "04_Addressing_High-risk_Use_and_Unintended_Use_GSN.yaml",
-        "05_Privacy_Protection_GSN.yaml",
-        "06_Ensuring_Security_GSN.yaml",
-        "07_Explainability_GSN.yaml",
-        "08_Robustness_GSN.yaml",
-        "09_Data_Quality_GSN.yaml",
-        "10_Verifiability_GSN.yaml",
-    ]
+    GSN_LIST = GSN_LIST
 
     def __init__(self, db: Session, gsn_yaml_data: Dict[str, Any], dataset: pd.DataFrame):
         self.db = db
@@ -34,7 +24,10 @@ class RegisterDatasetForGSN:
         logger.info("RegisterDatasetForGSN: GSNExplorerによるGSN情報のパースを開始します。")
         self.gsn_explorer = GSNExplorer(gsn_yaml_data)
         try:
-            self.gsn_results = self.gsn_explorer.explore()
+            # Trees from prepare_gsn_yaml_data have their leaves precomputed by the registry
+            self.gsn_results = gsn_registry.find_leaves(gsn_yaml_data)
+            if self.gsn_results is None:
+                self.gsn_results = self.gsn_explorer.explore()
             logger.info("RegisterDatasetForGSN: GSN情報のパースが完了しました。")
         except Exception as e:
             logger.error(
@@ -47,29 +40,17 @@ class RegisterDatasetForGSN:
     @staticmethod
     def prepare_gsn_yaml_data():
         """
-        Load a set of GSN YAML files and return them in a list.
+        Return the set of GSN YAML data in a list (parsed once per file by gsn_registry).
         """
-        import yaml
-        from pathlib import Path
-        base_path = Path(__file__).parent  # /app/src/gsn/
-        gsn_yaml_files = [
-            base_path / file_name for file_name in RegisterDatasetForGSN.GSN_LIST]
-        gsn_yaml_data = []
-        for file in gsn_yaml_files:
-            with open(file, "r") as f:
-                yaml_text = f.read().replace('\x0b', '')
-                gsn_yaml_data.append(yaml.safe_load(yaml_text))
-        return gsn_yaml_data
+        return gsn_registry.get_yaml_data_list()
 
     @staticmethod
     def get_gsn_detail_by_id(gsn_id: str) -> Dict[str, Any]:
         """
         Get GSN details based on GSN ID
         """
-        gsn_yaml_data = RegisterDatasetForGSN.prepare_gsn_yaml_data()
-        gsn_n = gsn_id[1]
         logger.info(f"get_gsn_detail_by_id: GSN ID '{gsn_id}' の詳細を取得します。")
-        return gsn_yaml_data[int(gsn_n)-1].get(gsn_id)
+        return gsn_registry.get_node(gsn_id)
 
     @staticmethod
     def prepare_dataset(dataset_path):
@@ -136,6 +117,7 @@ class RegisterDatasetForGSN:
             gsn_json = {
                 "name": [p.name for p in perspective_gsn_data],
                 "contents": [p.data_content for p in perspective_gsn_data],
+                "content_format": [p.content_format for p in perspective_gsn_data],
                 "score_rate": [p.score_rate for p in perspective_gsn_data],
                 "second_goal": [p.second_goal for p in perspective_gsn_data],
                 "gsn_leaf": [p.gsn_leaf for p in perspective_gsn_data],
@@ -146,7 +128,7 @@ class RegisterDatasetForGSN:
         # Merge dataframes from the existing database
         if len(gsn_dfs) == 0:
             db_gsn_df = pd.DataFrame(columns=[
-                'name', 'contents', 'score_rate', 'second_goal', 'gsn_leaf', 'criterion'
+                'name', 'contents', 'content_format', 'score_rate', 'second_goal', 'gsn_leaf', 'criterion'
             ])
         else:
             db_gsn_df = pd.concat(gsn_dfs, ignore_index=True)
@@ -193,11 +175,11 @@ class RegisterDatasetForGSN:
             'output': db_gsn_df['gsn_leaf'],
             'gsn_perspective': db_gsn_df['gsn_perspective']
         })
-        # pickle loads db_gsn_df contents
+        # decode db_gsn_df contents
         db_include_dataset = self.dataset.copy()
-        for content in db_gsn_df['contents']:
+        for content, content_format in zip(db_gsn_df['contents'], db_gsn_df['content_format']):
             if isinstance(content, bytes):
-                content = pickle.loads(content)
+                content = decode_content(content, content_format)
             else:
                 content = content
             
@@ -210,78 +192,65 @@ class RegisterDatasetForGSN:
         # remove ID duplicates
         db_include_dataset = db_include_dataset.drop_duplicates(subset=['ID'], keep='last')
 
-        try:
-            # for result in self.gsn_results:
-            for result in db_include_gsn_results:
-                ID = result['ID']
-                leaf = result['leaf']
-                score_rate = result['score_rate']
-                second_goal = result['second_goal']
-
-                # Search by ID from gsn_perspective column of df to get small data frames
-                # subset_df = self.dataset[self.dataset['gsn_perspective'] == ID]
-                subset_df = db_include_dataset[db_include_dataset['gsn_perspective'] == ID]
-                # If ID starts with G10, use ID[0:3], otherwise use ID[0:2] for perspective_map
-                if ID.startswith("G10"):
-                    criterion = perspective_map.get(ID[0:3])
-                else:
-                    criterion = perspective_map.get(ID[0:2])
-
-                subset_df = subset_df.copy()
-                subset_df['ten_perspective'] = criterion
-
-                # If the data frame is not empty, it is registered as quantitative data
-                if not subset_df.empty:
-                    dataset_dict = {
-                        "name": f"GSN_{ID}",
-                        # "criterion": leaf,
-                        "contents": subset_df,
-                        "score_rate": score_rate,
-                        "second_goal": second_goal,
-                        "gsn_leaf": leaf,  # Maintains information as a GSN leaf
-                        "criterion": criterion
-                    }
-                    try:
-                        # Register in the database using the Quantitative Dataset Service
-                        QuantitativeDatasetService.add_from_json(
-                            self.db, dataset_dict)
-                        logger.info(
-                            f"register_gsn_dataset: 定量データセット 'GSN_{ID}' を登録しました。")
-                    except Exception as e:
-                        logger.error(
-                            f"register_gsn_dataset: 定量データセット 'GSN_{ID}' の登録中にエラーが発生しました: {e}")
-                        continue
+        # Build all datasets first and register them in one INSERT / commit (all-or-nothing per GSN file)
+        gsn_datasets = []
+        # for result in self.gsn_results:
+        for result in db_include_gsn_results:
+            ID = result['ID']
+            leaf = result['leaf']
+            score_rate = result['score_rate']
+            second_goal = result['second_goal']
+
+            # Search by ID from gsn_perspective column of df to get small data frames
+            # subset_df = self.dataset[self.dataset['gsn_perspective'] == ID]
+            subset_df = db_include_dataset[db_include_dataset['gsn_perspective'] == ID]
+            # If ID starts with G10, use ID[0:3], otherwise use ID[0:2] for perspective_map
+            if ID.startswith("G10"):
+                criterion = perspective_map.get(ID[0:3])
+            else:
+                criterion = perspective_map.get(ID[0:2])
+
+            subset_df = subset_df.copy()
+            subset_df['ten_perspective'] = criterion
+
+            # If the data frame is not empty, it is registered as quantitative data
+            if not subset_df.empty:
+                gsn_datasets.append({
+                    "name": f"GSN_{ID}",
+                    "type": "quantitative",
+                    "contents": subset_df,
+                    "score_rate": score_rate,
+                    "second_goal": second_goal,
+                    "gsn_leaf": leaf,  # Maintains information as a GSN leaf
+                    "criterion": criterion
+                })
+            else:
+                # If data frame is empty, register as qualitative data
+                # Qualitative questions are registered as a single text
+                gsn_datasets.append({
+                    "name": f"GSN_{ID}",
+                    "type": "qualitative",
+                    "contents": to_qualitative_contents([leaf], second_goal),
+                    "score_rate": score_rate,
+                    "second_goal": second_goal,
+                    "gsn_leaf": leaf,  # Maintains information as a GSN leaf
+                    "criterion": criterion
+                })
 
-                else:
-                    # If data frame is empty, register as qualitative data
-                    dataset_dict = {
-                        "name": f"GSN_{ID}",
-                        # "criterion": leaf,
-                        # Qualitative questions are registered as a single text
-                        "contents": [leaf],
-                        "score_rate": score_rate,
-                        "second_goal": second_goal,
-                        "gsn_leaf": leaf,  # Maintains information as a GSN leaf
-                        "criterion": criterion
-                    }
-                    try:
-                        # Register in the database using the Qualitative Dataset Service
-                        QualitativeDatasetService.add_from_json(
-                            self.db, dataset_dict)
-                        logger.info(
-                            f"register_gsn_dataset: 定性データセット 'GSN_{ID}' を登録しました。")
-                    except Exception as e:
-                        logger.error(
-                            f"register_gsn_dataset: 定性データセット 'GSN_{ID}' の登録中にエラーが発生しました: {e}")
-                        continue
+        try:
+            DatasetManager.bulk_register(session, gsn_datasets, commit=False)
+            session.commit()
+            quantitative_count = sum(
+                1 for d in gsn_datasets if d["type"] == "quantitative")
+            logger.info(
+                f"register_gsn_dataset: 定量データセット{quantitative_count}件、定性データセット{len(gsn_datasets) - quantitative_count}件を登録しました。")
             logger.info("register_gsn_dataset: GSNデータセット登録処理が完了しました。")
         except Exception as e:
             logger.error(
                 f"register_gsn_dataset: GSNデータセット登録処理中にエラーが発生しました: {e}")
+            session.rollback()
             raise
 
-        session.commit()
-
 
 def sampling_parquet():
     """
@@ -201,8 +201,7 @@ class DataCategorizer():
         """
         Collect all terminal data from all perspectives and assign one terminal data to each data entry
         """
-        import yaml
-        from src.gsn.gsn_explorer import GSNExplorer
+        from src.gsn.gsn_registry import gsn_registry
 
         logger.info("exec_categorize_data: GSNファイルの読み込みを開始します。")
         results = []
@@ -210,11 +209,7 @@ class DataCategorizer():
         all_IDs = []
         for gsn_file in self.gsn_list:
             try:
-                with open(root / "src" / "gsn" / gsn_file, "r", encoding="utf-8") as f:
-                    content = f.read().replace('\x0b', '')
-                    yaml_data = yaml.safe_load(content)
-                explorer = GSNExplorer(yaml_data)
-                results = explorer.explore()
+                results = gsn_registry.get_leaves(gsn_file)
                 leaves = [r["leaf"] for r in results]
                 IDs = [r["ID"] for r in results]
                 all_leaves.extend(leaves)
@@ -0,0 +1,83 @@
+import os
+from pathlib import Path
+from inspect_ai.model import Model, CachePolicy, GenerateConfig, get_model, cache_path, cache_prune
+from src.constants.config import EVAL_CACHE_ENABLED, EVAL_CACHE_EXPIRY, EVAL_CACHE_MAX_BYTES
+from src.utils.logger import logger
+
+"""
+Response cache of the quantitative evaluation (target model answers and grader verdicts).
+
+Uses the inspect_ai generate cache: the key is the md5 of the generate config, the full input messages
+(question text for the target model; grading template with question, answer and target for the grader)
+and the base URL, stored per model name under INSPECT_CACHE_DIR (default: the inspect_ai user cache dir).
+Re-running an unchanged evaluation therefore does not call the models again, and changing the grading
+template only calls the grader.
+"""
+
+
+class CachedModel(Model):
+    """
+    Model whose generate() calls use a CachePolicy unless the caller passes its own
+    """
+
+    def __init__(self, model: Model, cache_policy: CachePolicy):
+        super().__init__(model.api, model.config, model.model_args)
+        self.cache_policy = cache_policy
+
+    async def generate(self, input, tools=[], tool_choice=None, config=GenerateConfig(), cache=False):
+        return await super().generate(input, tools=tools, tool_choice=tool_choice, config=config,
+                                      cache=cache or self.cache_policy)
+
+
+def eval_cache_policy(use_cache: bool | None = None) -> CachePolicy | None:
+    """
+    :param use_cache: False bypasses the cache for this run. None uses EVAL_CACHE_ENABLED
+    :return: CachePolicy or None if caching is disabled
+    """
+    if use_cache is None:
+        use_cache = EVAL_CACHE_ENABLED
+    if not use_cache:
+        return None
+    return CachePolicy(expiry=EVAL_CACHE_EXPIRY)
+
+
+def with_cache(model_name: str, cache_policy: CachePolicy | None) -> str | Model:
+    """
+    Model to pass to eval() / scorers: the model name as is when caching is disabled
+    """
+    if cache_policy is None:
+        return model_name
+    return CachedModel(get_model(model_name), cache_policy)
+
+
+def prune_eval_cache(max_bytes: int = EVAL_CACHE_MAX_BYTES) -> int:
+    """
+    Delete expired cache entries, then the least recently written ones until the cache fits in max_bytes
+    :param max_bytes: Size limit of the whole cache directory (0: no limit)
+    :return: Number of deleted entries (size eviction only)
+    """
+    cache_prune()
+    if not max_bytes:
+        return 0
+    root = cache_path()
+    entries = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    if removed:
+        logger.info(
+            f"prune_eval_cache: {removed}件のキャッシュを削除しました。(残り {total} bytes)")
+    return removed
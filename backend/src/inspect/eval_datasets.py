@@ -3,11 +3,13 @@ from inspect_ai import Task, eval
 from inspect_ai.dataset import Sample
 from inspect_ai.solver import generate, Solver, multiple_choice
 from inspect_ai.scorer import exact, model_graded_qa, Scorer
+from inspect_ai.model import Model
 from pathlib import Path
 from inspect_ai.log import read_eval_log, EvalLog
 from inspect_ai.log._file import eval_log_json_str, eval_log_json
 import os
 from src.utils.logger import logger
+from src.constants.config import EVAL_CONCURRENT_PERSPECTIVES, EVAL_MAX_TASKS, EVAL_MAX_CONNECTIONS
 
 root_dir = Path(__file__).parent.parent.parent
 data_dir = root_dir / 'dataset' / 'output'
@@ -25,14 +27,10 @@ def load_samples_from_csv(csv_path):
     return samples
 
 
-def new_eval_by_ten_perspective(df: pd.DataFrame, target_model_name: str, scorer: Scorer, eval_type: str):
-    import json
-    logger.info("new_eval_by_ten_perspective: 10観点ごとの新しい評価を開始します。")
-
-    # If row has NaN, remove it
-    logger.debug(f"df: {df}")
-    logger.debug(f"df columns: {df.columns}")
-
+def _drop_nan_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove rows (or all-NaN columns) that cannot be used for evaluation
+    """
     if 'text' in df.columns:
         df = df.dropna(subset=['text'])
         logger.debug(f"NaNを含む'text'列を削除しました。残りの行数: {len(df)}")
@@ -57,88 +55,194 @@ def new_eval_by_ten_perspective(df: pd.DataFrame, target_model_name: str, scorer
     if 'gsn_perspective' in df.columns:
         df = df.dropna(subset=['gsn_perspective'])
         logger.debug(f"NaNを含む'gsn_perspective'列を削除しました。残りの行数: {len(df)}")
+    return df
 
 
-    results = {}
+def _build_perspective_task(sub_df: pd.DataFrame, scorer: Scorer, eval_type: str, perspective: str, task_name: str) -> Task:
+    """
+    Build an inspect_ai Task for the rows of a single ten_perspective.
+    The perspective is kept in the task metadata so that the log can be split back afterwards.
+    """
+    if eval_type in ["multiple_choice_eval"]:
+        def parse_choices(df: pd.DataFrame):
+            import pandas as pd
+            # Get ans columns and convert to list excluding nan values
+            ans_cols = df.filter(like='ans')
+            choices_list = []
+            for _, row in ans_cols.iterrows():
+                choices = [str(val)
+                           for val in row.values if pd.notna(val)]
+                choices_list.append(choices)
+            df['choices'] = choices_list
+            return df
+        # NOTE: multiple_choice target is in ABC order of choices (e.g. when answer is 2, choices=[1,2,3], target="B")
+        if 'choices' not in sub_df.columns:
+            sub_df = parse_choices(sub_df.copy())
+        samples = [Sample(input=row['text'], target=row['output'],
+                          choices=row['choices']) for _, row in sub_df.iterrows()]
+        solver = [multiple_choice()]
+    elif eval_type == "requirement_eval":
+        # NOTE: Use requirement column as target
+        samples = [Sample(input=row['text'], target=row['requirement'])
+                   for _, row in sub_df.iterrows()]
+        solver = [generate()]
+    else:
+        # NOTE: If not specified, use output as target and check semantic match with expected answer
+        samples = [Sample(input=row['text'], target=row['output'])
+                   for _, row in sub_df.iterrows()]
+        solver = [generate()]
+    return Task(dataset=samples, solver=solver, scorer=scorer,
+                name=task_name, metadata={"ten_perspective": perspective})
+
+
+def _attach_gsn_perspective(eval_log: dict, sub_df: pd.DataFrame) -> dict:
+    """
+    Add gsn_perspective of each row of sub_df to the corresponding sample of eval_log
+    """
+    import ast
+    # gsn_perspectiveをも持っていれば
+    if 'gsn_perspective' not in sub_df.columns or not eval_log.get('samples'):
+        return eval_log
+    logger.debug(f"sub_df: {sub_df}")
+    # Reset index to ensure proper alignment
+    sub_df_reset = sub_df.reset_index(drop=True)
+    # Add gsn_perspective to each corresponding sample
+    for i, sample in enumerate(eval_log.get('samples', [])):
+        if i < len(sub_df_reset):
+            gsn_perspective = sub_df_reset.iloc[i]['gsn_perspective']
+            # Handle both string and list cases
+            if pd.notna(gsn_perspective):
+                if isinstance(gsn_perspective, str):
+                    # If it's a string, try to parse as list or use as single item
+                    try:
+                        # Try to parse as JSON list first
+                        parsed = ast.literal_eval(gsn_perspective)
+                        if isinstance(parsed, list):
+                            sample['gsn_perspective'] = parsed
+                        else:
+                            sample['gsn_perspective'] = [gsn_perspective]
+                    except (ValueError, SyntaxError):
+                        # If parsing fails, treat as single string
+                        sample['gsn_perspective'] = [gsn_perspective]
+                elif isinstance(gsn_perspective, list):
+                    sample['gsn_perspective'] = gsn_perspective
+                else:
+                    sample['gsn_perspective'] = [str(gsn_perspective)]
+            else:
+                sample['gsn_perspective'] = []
+    logger.debug(f"Updated eval_log samples with individual gsn_perspective")
+    return eval_log
+
+
+def _eval_log_to_result(log: EvalLog, sub_df: pd.DataFrame) -> str:
+    """
+    Convert an EvalLog into the JSON string stored per perspective in quantitative_results
+    """
+    import json
+    eval_log = json.loads(eval_log_json_str(log))
+    logger.debug(f"sub_df: {sub_df.columns}")
+    logger.debug(f"eval_log: {eval_log.get('samples')[0]}")
+    eval_log = _attach_gsn_perspective(eval_log, sub_df)
+    return json.dumps(eval_log)
+
+
+def _split_by_perspective(df: pd.DataFrame) -> list[tuple[str, pd.DataFrame]]:
+    """
+    Split df into (perspective, sub_df) pairs, skipping empty perspectives
+    """
+    groups = []
     for perspective in df["ten_perspective"].dropna().unique():
-        logger.info(f"観点: {perspective} の評価を開始します。")
         sub_df = df[df["ten_perspective"] == perspective]
         if sub_df.empty:
             logger.info(f"観点: {perspective} のデータが空です。スキップします。")
             continue
+        groups.append((perspective, sub_df))
+    return groups
+
+
+def run_perspective_tasks(entries: list[tuple[str, pd.DataFrame, Task]], target_model_name: str | Model, max_tasks: int | None = None, max_connections: int | None = None) -> list[tuple[str, str]]:
+    """
+    Submit all perspective tasks to inspect_ai in a single eval() call and split the logs back per perspective.
+
+    :param entries: List of (perspective, sub_df, task). Task names must be unique.
+    :return: List of (perspective, eval log JSON string) in the order of entries.
+        Perspectives whose log could not be converted are omitted.
+    """
+    if not entries:
+        return []
+    if max_tasks is None:
+        max_tasks = EVAL_MAX_TASKS
+    if max_connections is None:
+        max_connections = EVAL_MAX_CONNECTIONS
+    logger.info(
+        f"run_perspective_tasks: {len(entries)}件のタスクを同時実行します。max_tasks={max_tasks}, max_connections={max_connections}")
+    eval_logs = eval([task for _, _, task in entries], model=target_model_name,
+                     max_tasks=max_tasks, max_connections=max_connections,
+                     log_format="json", log_dir=str(inspect_ai_log_dir))
+
+    # Match logs to tasks by task name (eval() does not guarantee the order of the returned logs)
+    logs_by_name = {log.eval.task: log for log in eval_logs}
+    results = []
+    for perspective, sub_df, task in entries:
+        log = logs_by_name.get(task.name)
+        if log is None:
+            logger.error(f"観点: {perspective} の評価ログが見つかりません。(task={task.name})")
+            continue
+        if log.status != "success":
+            logger.error(
+                f"観点: {perspective} の評価が正常に終了しませんでした。status={log.status}, error={log.error}")
         try:
-            if eval_type in ["multiple_choice_eval"]:
-                def parse_choices(df: pd.DataFrame):
-                    import pandas as pd
-                    # Get ans columns and convert to list excluding nan values
-                    ans_cols = df.filter(like='ans')
-                    choices_list = []
-                    for _, row in ans_cols.iterrows():
-                        choices = [str(val)
-                                   for val in row.values if pd.notna(val)]
-                        choices_list.append(choices)
-                    df['choices'] = choices_list
-                    return df
-                # NOTE: multiple_choice target is in ABC order of choices (e.g. when answer is 2, choices=[1,2,3], target="B")
-                if 'choices' not in sub_df.columns:
-                    sub_df = parse_choices(sub_df)
-                samples = [Sample(input=row['text'], target=row['output'],
-                                  choices=row['choices']) for _, row in sub_df.iterrows()]
-                task = Task(dataset=samples, solver=[
-                            multiple_choice()], scorer=scorer)
-            elif eval_type == "requirement_eval":
-                # NOTE: Use requirement column as target
-                samples = [Sample(input=row['text'], target=row['requirement'])
-                           for _, row in sub_df.iterrows()]
-                task = Task(dataset=samples, solver=[
-                            generate()], scorer=scorer)
-            else:
-                # NOTE: If not specified, use output as target and check semantic match with expected answer
-                samples = [Sample(input=row['text'], target=row['output'])
-                           for _, row in sub_df.iterrows()]
-                task = Task(dataset=samples, solver=[
-                            generate()], scorer=scorer)
+            results.append((perspective, _eval_log_to_result(log, sub_df)))
+            logger.info(f"観点: {perspective} の評価が完了しました。")
+        except Exception as e:
+            logger.error(f"観点: {perspective} の評価中にエラーが発生しました: {e}")
+    return results
+
+
+def new_eval_by_ten_perspective(df: pd.DataFrame, target_model_name: str | Model, scorer: Scorer, eval_type: str, concurrent: bool | None = None, max_tasks: int | None = None):
+    """
+    Evaluate df for each ten_perspective and return {perspective: eval log JSON string}
+
+    :param concurrent: If True, all perspective tasks are submitted to inspect_ai together in one eval() call.
+        If False, eval() is called once per perspective. Defaults to EVAL_CONCURRENT_PERSPECTIVES.
+    :param max_tasks: Maximum number of perspective tasks run in parallel (concurrent mode only).
+        Defaults to EVAL_MAX_TASKS.
+    """
+    logger.info("new_eval_by_ten_perspective: 10観点ごとの新しい評価を開始します。")
+    if concurrent is None:
+        concurrent = EVAL_CONCURRENT_PERSPECTIVES
+
+    # If row has NaN, remove it
+    logger.debug(f"df: {df}")
+    logger.debug(f"df columns: {df.columns}")
+    df = _drop_nan_rows(df)
+
+    results = {}
+    if concurrent:
+        entries = []
+        for idx, (perspective, sub_df) in enumerate(_split_by_perspective(df)):
+            try:
+                task = _build_perspective_task(
+                    sub_df, scorer, eval_type, perspective, task_name=f"ten_perspective_{idx}")
+                entries.append((perspective, sub_df, task))
+            except Exception as e:
+                logger.error(f"観点: {perspective} のタスク作成中にエラーが発生しました: {e}")
+        try:
+            for perspective, result in run_perspective_tasks(entries, target_model_name, max_tasks=max_tasks):
+                results[perspective] = result
+        except Exception as e:
+            logger.error(f"new_eval_by_ten_perspective: 同時評価中にエラーが発生しました: {e}")
+        logger.info("new_eval_by_ten_perspective: 全観点の評価が完了しました。")
+        return results
+
+    for idx, (perspective, sub_df) in enumerate(_split_by_perspective(df)):
+        logger.info(f"観点: {perspective} の評価を開始します。")
+        try:
+            task = _build_perspective_task(
+                sub_df, scorer, eval_type, perspective, task_name=f"ten_perspective_{idx}")
             eval_result = eval(task, model=target_model_name,
                                log_format="json", log_dir=str(inspect_ai_log_dir))
-            # Add GSN information to eval_results[0][sample]
-            # eval_log = eval_log_json_str(eval_result[0])
-            eval_log = json.loads(eval_log_json_str(eval_result[0]))
-            logger.debug(f"sub_df: {sub_df.columns}")
-            logger.debug(f"eval_log: {eval_log.get('samples')[0]}")
-            # gsn_perspectiveをも持っていれば
-            if 'gsn_perspective' in sub_df.columns and eval_log.get('samples'):
-                logger.debug(f"sub_df: {sub_df}")
-                # Reset index to ensure proper alignment
-                sub_df_reset = sub_df.reset_index(drop=True)
-                # Add gsn_perspective to each corresponding sample
-                for i, sample in enumerate(eval_log.get('samples', [])):
-                    if i < len(sub_df_reset):
-                        gsn_perspective = sub_df_reset.iloc[i]['gsn_perspective']
-                        # Handle both string and list cases
-                        if pd.notna(gsn_perspective):
-                            if isinstance(gsn_perspective, str):
-                                # If it's a string, try to parse as list or use as single item
-                                try:
-                                    # Try to parse as JSON list first
-                                    import ast
-                                    parsed = ast.literal_eval(gsn_perspective)
-                                    if isinstance(parsed, list):
-                                        sample['gsn_perspective'] = parsed
-                                    else:
-                                        sample['gsn_perspective'] = [gsn_perspective]
-                                except (ValueError, SyntaxError):
-                                    # If parsing fails, treat as single string
-                                    sample['gsn_perspective'] = [gsn_perspective]
-                            elif isinstance(gsn_perspective, list):
-                                sample['gsn_perspective'] = gsn_perspective
-                            else:
-                                sample['gsn_perspective'] = [str(gsn_perspective)]
-                        else:
-                            sample['gsn_perspective'] = []
-                logger.debug(f"Updated eval_log samples with individual gsn_perspective")
-                # eval_log.get['samples']['gsn_name'] = sub_df['ID']
-            results[perspective] = json.dumps(eval_log)
-            logger.debug(f"evallog: {eval_log}")
+            results[perspective] = _eval_log_to_result(eval_result[0], sub_df)
             logger.info(f"観点: {perspective} の評価が完了しました。")
         except Exception as e:
             logger.error(f"観点: {perspective} の評価中にエラーが発生しました: {e}")
@@ -146,6 +250,53 @@ def new_eval_by_ten_perspective(df: pd.DataFrame, target_model_name: str, scorer
     return results
 
 
+def new_eval_by_scorer_groups(groups: list[tuple[pd.DataFrame, Scorer, str]], target_model_name: str | Model, concurrent: bool | None = None, max_tasks: int | None = None):
+    """
+    Evaluate several scorer groups and merge their results into {perspective: eval log JSON string}
+
+    inspect_ai does not allow concurrent eval() calls in one process, so in concurrent mode the
+    perspective tasks of every group are submitted together in a single eval() call instead of
+    running one eval() per group.
+
+    :param groups: List of (scorer_df, scorer, eval_type) in merge order.
+        If the same perspective is evaluated by several groups, the later group wins.
+    :param concurrent: Defaults to EVAL_CONCURRENT_PERSPECTIVES. If False, groups are evaluated one after another.
+    :param max_tasks: Maximum number of tasks run in parallel for this run. Defaults to EVAL_MAX_TASKS.
+    """
+    logger.info(f"new_eval_by_scorer_groups: {len(groups)}件のスコアラーグループの評価を開始します。")
+    if concurrent is None:
+        concurrent = EVAL_CONCURRENT_PERSPECTIVES
+
+    results = {}
+    if not concurrent:
+        for scorer_df, scorer, eval_type in groups:
+            scorer_results = new_eval_by_ten_perspective(
+                scorer_df, target_model_name=target_model_name, scorer=scorer, eval_type=eval_type, concurrent=False)
+            # Merge results (overwrite if same perspective exists)
+            for perspective, result in scorer_results.items():
+                results[perspective] = result
+        return results
+
+    entries = []
+    for group_idx, (scorer_df, scorer, eval_type) in enumerate(groups):
+        scorer_df = _drop_nan_rows(scorer_df)
+        for idx, (perspective, sub_df) in enumerate(_split_by_perspective(scorer_df)):
+            try:
+                task = _build_perspective_task(
+                    sub_df, scorer, eval_type, perspective, task_name=f"scorer_{group_idx}_ten_perspective_{idx}")
+                entries.append((perspective, sub_df, task))
+            except Exception as e:
+                logger.error(f"観点: {perspective} のタスク作成中にエラーが発生しました: {e}")
+    try:
+        # NOTE: run_perspective_tasks keeps the order of entries, so later groups deterministically overwrite earlier ones
+        for perspective, result in run_perspective_tasks(entries, target_model_name, max_tasks=max_tasks):
+            results[perspective] = result
+    except Exception as e:
+        logger.error(f"new_eval_by_scorer_groups: 同時評価中にエラーが発生しました: {e}")
+    logger.info("new_eval_by_scorer_groups: 全スコアラーグループの評価が完了しました。")
+    return results
+
+
 def extract_scores_from_log(log: EvalLog):
     logger.info("extract_scores_from_log: スコア抽出を開始します。")
     try:
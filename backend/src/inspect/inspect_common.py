@@ -1,11 +1,19 @@
+import hashlib
+import threading
+import time
+from openai import RateLimitError
 from inspect_ai.model import get_model, modelapi, GenerateConfig
+from inspect_ai.model._model import _models
 from inspect_ai.model._providers.openai_compatible import OpenAICompatibleAPI
+from src.inspect.rate_limiter import AdaptiveRateLimiter, rate_limiter_registry
 from src.utils.logger import logger
 
 class AICustomAPI(OpenAICompatibleAPI):
-    def __init__(self, model_name, base_url, api_key, config=GenerateConfig(), service_name=None, **model_args):
+    def __init__(self, model_name, base_url, api_key, config=GenerateConfig(), service_name=None,
+                 rate_limiter_key: str | None = None, **model_args):
         if service_name is None:
             service_name = "Custom"
+        self.rate_limiter_key = rate_limiter_key
         super().__init__(
             model_name=model_name,
             base_url=base_url,
@@ -16,34 +24,158 @@ class AICustomAPI(OpenAICompatibleAPI):
             **model_args
         )
 
-def register_in_inspect_ai(model_name: str, api_url: str, api_key: str):
+    @property
+    def rate_limiter(self) -> AdaptiveRateLimiter | None:
+        # NOTE: Looked up per call so that limits configured after the first registration apply
+        if self.rate_limiter_key is None:
+            return None
+        return rate_limiter_registry.get(self.rate_limiter_key)
+
+    def max_connections(self) -> int:
+        # NOTE: The rate limiter decides the actual concurrency; let inspect_ai go up to its maximum
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            return rate_limiter.max_concurrency
+        return super().max_connections()
+
+    async def generate(self, input, tools, tool_choice, config):
+        rate_limiter = self.rate_limiter
+        if rate_limiter is None:
+            return await super().generate(input, tools, tool_choice, config)
+        # NOTE: ~4 characters per token; corrected with the reported usage after the call
+        estimated_tokens = sum(len(message.text) for message in input) // 4
+        async with rate_limiter.acquire(estimated_tokens) as limiter:
+            start = time.perf_counter()
+            try:
+                result = await super().generate(input, tools, tool_choice, config)
+            except Exception as e:
+                if isinstance(e, RateLimitError) or getattr(e, "status_code", None) == 429:
+                    limiter.on_throttle()
+                raise
+            output = result[0] if isinstance(result, tuple) else result
+            usage = getattr(output, "usage", None)
+            limiter.on_success(time.perf_counter() - start, estimated_tokens,
+                               usage.total_tokens if usage is not None else None)
+            return result
+
+
+class ModelProviderRegistry:
     """
-    Register models in inspect_ai with unique alias.
+    inspect_ai model providers (@modelapi) registered once per (model_name, url, api_key hash).
+
+    The alias contains a hash of the key, so get_model() (memoized by model string in inspect_ai) returns
+    the same Model for every run against the same endpoint: one AICustomAPI and one keep-alive HTTP client
+    per provider and process. Changing the URL or API key of an AIModel yields a new alias, and
+    invalidate() forgets the provider of the old row and evicts its Model from the get_model cache.
     """
-    if '/' in model_name:
-        model_name_str = model_name.rsplit('/', 1)
-        alias = f"custom-model-{model_name_str[1]}"
-    else:
-        alias = f"custom-model-{model_name}"
-
-    @modelapi(name=alias)
-    def _factory():
-        def wrapper(model_name, config=GenerateConfig(), **model_args):
-            model_args.pop("base_url", None)
-            model_args.pop("api_key", None)
-            _api_key = api_key
-            if _api_key == "":
-                logger.warning(
-                    "API_KEY is empty."
-                )
-                _api_key = None
-            return AICustomAPI(
-                model_name=model_name,
-                base_url=api_url,
-                api_key=_api_key,
-                config=config,
-                **model_args
-            )
-        return wrapper
-    return alias
 
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aliases: dict[tuple[str, str, str], str] = {}
+
+    @staticmethod
+    def _key(model_name: str, api_url: str, api_key: str) -> tuple[str, str, str]:
+        return (model_name, api_url or "", hashlib.sha256((api_key or "").encode("utf-8")).hexdigest())
+
+    @staticmethod
+    def _alias(key: tuple[str, str, str]) -> str:
+        model_name = key[0]
+        if '/' in model_name:
+            model_name = model_name.rsplit('/', 1)[1]
+        digest = hashlib.sha256("|".join(key).encode("utf-8")).hexdigest()[:10]
+        return f"custom-model-{model_name}-{digest}"
+
+    def register(self, model_name: str, api_url: str, api_key: str, rate_limits: dict | None = None) -> str:
+        """
+        Register the provider if needed and return its alias
+        :param rate_limits: dict (name, rpm_limit, tpm_limit, max_concurrency) of the AIModel.
+            The settings are applied to the limiter of the provider. Without any limit set, the
+            provider has no limiter and its calls are not limited
+        """
+        key = self._key(model_name, api_url, api_key)
+        with self._lock:
+            alias = self._aliases.get(key) or self._alias(key)
+            if rate_limits is not None:
+                if any(rate_limits.get(field) for field in ("rpm_limit", "tpm_limit", "max_concurrency")):
+                    rate_limiter_registry.configure(
+                        alias, rate_limits.get("name") or model_name, rate_limits.get("rpm_limit"),
+                        rate_limits.get("tpm_limit"), rate_limits.get("max_concurrency"))
+                else:
+                    rate_limiter_registry.remove(alias)
+            if key in self._aliases:
+                return alias
+
+            @modelapi(name=alias)
+            def _factory():
+                def wrapper(model_name, config=GenerateConfig(), **model_args):
+                    model_args.pop("base_url", None)
+                    model_args.pop("api_key", None)
+                    # NOTE: inspect_ai retries 429 itself (should_retry); retries inside the SDK would
+                    # hide them from the rate limiter and count the backoff as latency
+                    model_args.setdefault("max_retries", 0)
+                    _api_key = api_key
+                    if _api_key == "":
+                        logger.warning(
+                            "API_KEY is empty."
+                        )
+                        _api_key = None
+                    api = AICustomAPI(
+                        model_name=model_name,
+                        base_url=api_url,
+                        api_key=_api_key,
+                        config=config,
+                        rate_limiter_key=alias,
+                        **model_args
+                    )
+                    return api
+                return wrapper
+
+            self._aliases[key] = alias
+            logger.info(f"ModelProviderRegistry: {alias} を登録しました。")
+            return alias
+
+    def invalidate(self, model_name: str, api_url: str, api_key: str) -> bool:
+        """
+        Forget the provider of a (model_name, url, api_key), remove its rate limiter and evict its
+        Models from the get_model cache so that they (and their HTTP clients) can be released
+        :return: True if the provider was registered
+        """
+        key = self._key(model_name, api_url, api_key)
+        with self._lock:
+            alias = self._aliases.pop(key, None)
+            if alias:
+                rate_limiter_registry.remove(alias)
+                _evict_cached_models(alias)
+        if alias:
+            logger.info(f"ModelProviderRegistry: {alias} を無効化しました。")
+        return alias is not None
+
+
+def _evict_cached_models(alias: str):
+    # NOTE: The HTTP clients are not closed: they were created in the event loop of an eval() call
+    # that has already exited. Dropping the Models releases them with their connections
+    prefix = f"{alias}/"
+    for cache_key in [cache_key for cache_key in _models if cache_key.startswith(prefix)]:
+        _models.pop(cache_key, None)
+
+
+model_provider_registry = ModelProviderRegistry()
+
+
+def model_rate_limits(model) -> dict:
+    """
+    rate_limits of register_in_inspect_ai from an AIModel row
+    """
+    return {
+        "name": model.name,
+        "rpm_limit": model.rpm_limit,
+        "tpm_limit": model.tpm_limit,
+        "max_concurrency": model.max_concurrency,
+    }
+
+
+def register_in_inspect_ai(model_name: str, api_url: str, api_key: str, rate_limits: dict | None = None):
+    """
+    Register models in inspect_ai with unique alias (registered once per model_name, url and api_key).
+    """
+    return model_provider_registry.register(model_name, api_url, api_key, rate_limits)
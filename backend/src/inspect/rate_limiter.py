@@ -0,0 +1,216 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from src.constants.config import (
+    RATE_LIMIT_DEFAULT_CONCURRENCY, RATE_LIMIT_MIN_CONCURRENCY, RATE_LIMIT_DECREASE_FACTOR,
+    RATE_LIMIT_COOLDOWN
+)
+from src.utils.logger import logger
+
+"""
+Per-endpoint rate limiting of the model calls made through inspect_ai (see AICustomAPI.generate).
+
+Each model provider with rpm_limit, tpm_limit or max_concurrency set has one AdaptiveRateLimiter in
+the process, shared by every task, scorer and evaluation job that calls it:
+- requests/min and tokens/min are enforced with token buckets (tokens are estimated from the input
+  before the call and corrected with the reported usage afterwards)
+- the number of calls in flight follows AIMD: +1/limit per successful call up to max_concurrency,
+  multiplied by RATE_LIMIT_DECREASE_FACTOR on 429 (at most once per RATE_LIMIT_COOLDOWN seconds).
+  Latency is only reported: it grows with the output length, so it does not tell an overloaded
+  endpoint from a long answer
+
+The state is guarded by a threading lock and waiting is done with asyncio.sleep, so a limiter can be
+used from the event loops of successive eval() calls.
+"""
+
+# Seconds between checks of a waiting call
+_POLL_INTERVAL = 0.05
+# Weight of the newest sample in the latency moving average
+_LATENCY_ALPHA = 0.2
+
+
+class _TokenBucket:
+    """
+    Bucket of `per_minute` units refilled continuously. The level can go negative (debt) when the
+    actual usage exceeds the estimate.
+    """
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(float(self.per_minute),
+                         self.level + (now - self.updated) * self.per_minute / 60.0)
+        self.updated = now
+
+    def wait_seconds(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # NOTE: A request larger than the bucket only waits for a full bucket
+        needed = min(amount, float(self.per_minute)) - self.level
+        return max(needed, 0.0) * 60.0 / self.per_minute
+
+    def take(self, amount: float):
+        self.level -= amount
+
+
+class AdaptiveRateLimiter:
+    """
+    Rate limiter and AIMD concurrency controller of one model endpoint
+    """
+
+    def __init__(self, name: str, rpm_limit: int | None = None, tpm_limit: int | None = None,
+                 max_concurrency: int | None = None):
+        self.name = name
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.throttled = 0
+        self.latency_avg = None
+        self._last_decrease = 0.0
+        self.configure(rpm_limit, tpm_limit, max_concurrency)
+
+    def configure(self, rpm_limit: int | None, tpm_limit: int | None, max_concurrency: int | None):
+        """
+        Apply the settings of the AIModel row (None: no limit / RATE_LIMIT_DEFAULT_CONCURRENCY)
+        """
+        with self._lock:
+            self.rpm_limit = rpm_limit or None
+            self.tpm_limit = tpm_limit or None
+            self.max_concurrency = max(max_concurrency or RATE_LIMIT_DEFAULT_CONCURRENCY,
+                                       RATE_LIMIT_MIN_CONCURRENCY)
+            self._requests_bucket = _TokenBucket(self.rpm_limit) if self.rpm_limit else None
+            self._tokens_bucket = _TokenBucket(self.tpm_limit) if self.tpm_limit else None
+            self.limit = float(self.max_concurrency)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """
+        Take a slot if possible
+        :return: 0 when acquired, otherwise seconds to wait before trying again
+        """
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return _POLL_INTERVAL
+            now = time.monotonic()
+            wait = 0.0
+            if self._requests_bucket is not None:
+                wait = max(wait, self._requests_bucket.wait_seconds(1, now))
+            if self._tokens_bucket is not None:
+                wait = max(wait, self._tokens_bucket.wait_seconds(tokens, now))
+            if wait > 0:
+                return wait
+            if self._requests_bucket is not None:
+                self._requests_bucket.take(1)
+            if self._tokens_bucket is not None:
+                self._tokens_bucket.take(tokens)
+            self.in_flight += 1
+            self.requests += 1
+            return 0.0
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int = 0):
+        """
+        Wait for a slot. Report the outcome with on_success / on_throttle before leaving the block.
+        """
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                wait = self._try_acquire(estimated_tokens)
+                if wait == 0:
+                    break
+                await asyncio.sleep(min(wait, 1.0))
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        if now - self._last_decrease < RATE_LIMIT_COOLDOWN:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(float(RATE_LIMIT_MIN_CONCURRENCY),
+                         self.limit * RATE_LIMIT_DECREASE_FACTOR)
+        logger.warning(
+            f"AdaptiveRateLimiter: {self.name} の同時実行数を{int(previous)}から{int(self.limit)}に下げました。({reason})")
+
+    def on_success(self, latency: float, estimated_tokens: int = 0, used_tokens: int | None = None):
+        with self._lock:
+            if self._tokens_bucket is not None and used_tokens is not None:
+                self._tokens_bucket.take(used_tokens - estimated_tokens)
+            self.latency_avg = latency if self.latency_avg is None else (
+                _LATENCY_ALPHA * latency + (1 - _LATENCY_ALPHA) * self.latency_avg)
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def on_throttle(self):
+        with self._lock:
+            self.throttled += 1
+            self._decrease("429")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "rpm_limit": self.rpm_limit,
+                "tpm_limit": self.tpm_limit,
+                "max_concurrency": self.max_concurrency,
+                "current_concurrency": int(self.limit),
+                "in_flight": self.in_flight,
+                "queue_depth": self.waiting,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "latency_avg": round(self.latency_avg, 3) if self.latency_avg is not None else None,
+            }
+
+
+class RateLimiterRegistry:
+    """
+    Process-wide AdaptiveRateLimiter per model provider (keyed by the inspect_ai alias)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiters: dict[str, AdaptiveRateLimiter] = {}
+
+    def configure(self, key: str, name: str, rpm_limit: int | None = None, tpm_limit: int | None = None,
+                  max_concurrency: int | None = None) -> AdaptiveRateLimiter:
+        """
+        Get the limiter of a provider, creating it or applying changed settings
+        """
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = AdaptiveRateLimiter(name, rpm_limit, tpm_limit, max_concurrency)
+                self._limiters[key] = limiter
+                return limiter
+        settings = (rpm_limit or None, tpm_limit or None,
+                    max(max_concurrency or RATE_LIMIT_DEFAULT_CONCURRENCY, RATE_LIMIT_MIN_CONCURRENCY))
+        if settings != (limiter.rpm_limit, limiter.tpm_limit, limiter.max_concurrency):
+            limiter.configure(rpm_limit, tpm_limit, max_concurrency)
+        limiter.name = name
+        return limiter
+
+    def get(self, key: str) -> AdaptiveRateLimiter | None:
+        with self._lock:
+            return self._limiters.get(key)
+
+    def remove(self, key: str):
+        with self._lock:
+            self._limiters.pop(key, None)
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            limiters = list(self._limiters.items())
+        return [{"key": key, **limiter.snapshot()} for key, limiter in limiters]
+
+
+rate_limiter_registry = RateLimiterRegistry()
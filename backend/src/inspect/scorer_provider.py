@@ -1,4 +1,5 @@
 from inspect_ai.scorer import model_graded_qa, choice, Scorer, exact
+from inspect_ai.model import Model
 from src.utils.logger import logger
 
 
@@ -21,7 +22,7 @@ class ScorerProvider():
             logger.error(f"get_exact_match_scorer: スコアラー取得中にエラー: {e}")
             return None
 
-    def get_graded_qa_scorer(self, model: str = "openai/gpt-4o", prompt: str | None = None, grade_pattern: str | None = None) -> Scorer:
+    def get_graded_qa_scorer(self, model: str | Model = "openai/gpt-4o", prompt: str | None = None, grade_pattern: str | None = None) -> Scorer:
         """
         Get a scorer for graded QA evaluation
         Default prompt for model_graded_qa is used if prompt is None.
@@ -61,7 +62,7 @@ Does the submission meet the criterion?
             logger.error(f"get_graded_qa_scorer: スコアラー取得中にエラー: {e}")
             return None
 
-    def get_requirement_scorer(self, model: str = "openai/gpt-4o", prompt: str | None = None, grade_pattern: str | None = None) -> Scorer:
+    def get_requirement_scorer(self, model: str | Model = "openai/gpt-4o", prompt: str | None = None, grade_pattern: str | None = None) -> Scorer:
         """
         Get a scorer for evaluating whether requirements are met
 
@@ -7,15 +7,31 @@ class AIModelManager:
     A class that consolidates database operations related to AI models
     """
 
+    RATE_LIMIT_FIELDS = ("rpm_limit", "tpm_limit", "max_concurrency")
+
+    @staticmethod
+    def _validate_rate_limits(data: dict):
+        """
+        Rate limits must be positive integers or None (no limit)
+        """
+        for field in AIModelManager.RATE_LIMIT_FIELDS:
+            value = data.get(field)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                logger.error(f"_validate_rate_limits: {field}が不正です: {value}")
+                raise ValueError(f"{field} must be a positive integer or null")
+
     @staticmethod
     def add_model(db: Session, data: dict):
         """
         Add an AI model
         :param db: SQLAlchemy Session
-        :param data: dict (name, url, api_key, api_request_format, type)
+        :param data: dict (name, url, api_key, api_request_format, type, rpm_limit, tpm_limit, max_concurrency)
         :return: AIModel
         """
         logger.info("add_model: AIモデル追加処理を開始します。")
+        AIModelManager._validate_rate_limits(data)
         allowed_types = {"target", "eval", "both"}
         model_type = data.get("type")
         if model_type is None:
@@ -30,7 +46,10 @@ class AIModelManager:
                 url=data.get("url"),
                 api_key=data.get("api_key"),
                 api_request_format=data.get("api_request_format"),
-                type=model_type
+                type=model_type,
+                rpm_limit=data.get("rpm_limit"),
+                tpm_limit=data.get("tpm_limit"),
+                max_concurrency=data.get("max_concurrency")
             )
             db.add(model)
             db.commit()
@@ -78,6 +97,17 @@ class AIModelManager:
             logger.error(f"get_all_models: 取得処理中にエラーが発生しました: {e}")
             return []
 
+    @staticmethod
+    def _invalidate_provider(model_name: str, url: str, api_key: str):
+        """
+        Release the inspect_ai provider registered for the previous values of a model
+        """
+        from src.inspect.inspect_common import model_provider_registry
+        try:
+            model_provider_registry.invalidate(model_name, url, api_key)
+        except Exception as e:
+            logger.error(f"_invalidate_provider: プロバイダーの無効化に失敗しました: {e}")
+
     @staticmethod
     def update_model(db: Session, model_id: int, data: dict):
         """
@@ -88,16 +118,20 @@ class AIModelManager:
         :return: AIModel or None
         """
         logger.info(f"update_model: ID={model_id} のAIモデル更新を開始します。")
+        AIModelManager._validate_rate_limits(data)
         try:
             model = db.query(AIModel).filter(AIModel.id == model_id).first()
             if not model:
                 logger.info(f"update_model: ID={model_id} のAIモデルは見つかりませんでした。")
                 return None
+            previous = (model.model_name, model.url, model.api_key)
             for key, value in data.items():
                 if hasattr(model, key):
                     setattr(model, key, value)
             db.commit()
             db.refresh(model)
+            if previous != (model.model_name, model.url, model.api_key):
+                AIModelManager._invalidate_provider(*previous)
             logger.info(f"update_model: AIモデル {model.name} の更新が完了しました。")
             return model
         except Exception as e:
@@ -119,8 +153,10 @@ class AIModelManager:
             if not model:
                 logger.info(f"delete_model: ID={model_id} のAIモデルは見つかりませんでした。")
                 return False
+            previous = (model.model_name, model.url, model.api_key)
             db.delete(model)
             db.commit()
+            AIModelManager._invalidate_provider(*previous)
             logger.info(f"delete_model: AIモデル {model.name} の削除が完了しました。")
             return True
         except Exception as e:
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
+import pandas as pd
 from src.db.define_tables import Dataset, EvaluationPerspective
-import pickle
+from src.db.dataset_content import build_content_columns, decode_content, content_to_records
 from src.utils.logger import logger
 from src.constants.perspectives import to_japanese_perspective
 
@@ -33,10 +34,9 @@ class DatasetManager:
             else:
                 logger.error("register_dataset: dataがCSV形式のstrではありません。")
                 raise ValueError("data must be a CSV string")
-            binary_content = pickle.dumps(df)
             dataset = Dataset(
                 name=name,
-                data_content=binary_content,
+                **build_content_columns(df),
                 type="quantitative"
             )
             db.add(dataset)
@@ -49,6 +49,54 @@ class DatasetManager:
             db.rollback()
             raise
 
+    @staticmethod
+    def bulk_register(db: Session, datasets: list[dict], commit: bool = True) -> int:
+        """
+        Register many datasets with a single multi-row INSERT
+        Perspectives are resolved with one query and contents are serialized before the INSERT.
+        :param db: SQLAlchemy Session
+        :param datasets: List of dataset dicts (name, type, contents, criterion, score_rate, second_goal, gsn_leaf)
+                         contents must already be in the stored shape (see to_qualitative_contents)
+        :param commit: Commit after the INSERT. Pass False to include it in the caller's transaction
+        :return: Number of registered datasets
+        """
+        logger.info(f"bulk_register: {len(datasets)}件のデータセット一括登録を開始します。")
+        if not datasets:
+            return 0
+        try:
+            perspective_ids = {
+                p.perspective_name: p.id for p in db.query(EvaluationPerspective).all()}
+            mappings = []
+            for data in datasets:
+                criterion_name = to_japanese_perspective(data.get("criterion"))
+                perspective_id = perspective_ids.get(criterion_name)
+                if perspective_id is None and not data.get("gsn_leaf"):
+                    logger.error(
+                        f"bulk_register: EvaluationPerspectiveが見つかりません: {criterion_name}")
+                    raise ValueError(
+                        f"EvaluationPerspective with name {criterion_name} not found"
+                    )
+                mappings.append({
+                    "name": f"{data.get('name', '')}",
+                    **build_content_columns(data.get("contents", [])),
+                    "evaluation_perspective_id": perspective_id,
+                    "type": data["type"],
+                    "score_rate": data.get("score_rate", 1.0),
+                    "second_goal": data.get("second_goal", ""),
+                    "gsn_leaf": data.get("gsn_leaf", ""),
+                })
+            db.bulk_insert_mappings(Dataset, mappings)
+            if commit:
+                db.commit()
+            else:
+                db.flush()
+            logger.info(f"bulk_register: {len(mappings)}件のデータセットを登録しました。")
+            return len(mappings)
+        except Exception as e:
+            logger.error(f"bulk_register: 一括登録処理中にエラーが発生しました: {e}")
+            db.rollback()
+            raise
+
     @staticmethod
     def get_by_ids(db: Session, ids: list[int]):
         """
@@ -90,3 +138,74 @@ class DatasetManager:
         except Exception as e:
             logger.error(f"get_by_ids_and_type: 取得処理中にエラーが発生しました: {e}")
             return []
+
+    @staticmethod
+    def get_summaries(db: Session, type: str | None = None, include_gsn: bool = False):
+        """
+        Get dataset summaries from the metadata columns without reading data_content
+        :param db: SQLAlchemy Session
+        :param type: Dataset type (quantitative/qualitative). None returns both
+        :param include_gsn: Include datasets generated from GSN (name starts with GSN_)
+        :return: List of dicts (id, name, type, perspective, row_count, column_names, byte_size, content_hash)
+        """
+        logger.info(f"get_summaries: type={type} のデータセット概要取得を開始します。")
+        query = (
+            db.query(
+                Dataset.id,
+                Dataset.name,
+                Dataset.type,
+                EvaluationPerspective.perspective_name,
+                Dataset.row_count,
+                Dataset.column_names,
+                Dataset.byte_size,
+                Dataset.content_hash
+            )
+            .join(EvaluationPerspective, Dataset.evaluation_perspective_id == EvaluationPerspective.id, isouter=True)
+        )
+        if type is not None:
+            query = query.filter(Dataset.type == type)
+        if not include_gsn:
+            query = query.filter(~Dataset.name.startswith("GSN_"))
+        summaries = [
+            {
+                "id": r.id,
+                "name": r.name,
+                "type": r.type,
+                "perspective": r.perspective_name,
+                "row_count": r.row_count,
+                "column_names": r.column_names,
+                "byte_size": r.byte_size,
+                "content_hash": r.content_hash,
+            }
+            for r in query.order_by(Dataset.id).all()
+        ]
+        logger.info(f"get_summaries: {len(summaries)}件のデータセット概要を取得しました。")
+        return summaries
+
+    @staticmethod
+    def get_contents_page(db: Session, dataset_id: int, offset: int = 0, limit: int = 100):
+        """
+        Get a page of rows of a single dataset
+        :param db: SQLAlchemy Session
+        :param dataset_id: Dataset ID
+        :param offset: Index of the first row
+        :param limit: Maximum number of rows
+        :return: dict (id, name, total, offset, limit, contents) or None if not found
+        """
+        logger.info(
+            f"get_contents_page: ID={dataset_id} のデータセット内容取得を開始します。(offset={offset}, limit={limit})")
+        dataset = db.query(Dataset).filter_by(id=dataset_id).first()
+        if dataset is None:
+            logger.info(f"get_contents_page: ID={dataset_id} のデータセットは見つかりませんでした。")
+            return None
+        content = decode_content(dataset.data_content, dataset.content_format)
+        page = content.iloc[offset:offset + limit] if isinstance(
+            content, pd.DataFrame) else content[offset:offset + limit]
+        return {
+            "id": dataset.id,
+            "name": dataset.name,
+            "total": len(content),
+            "offset": offset,
+            "limit": limit,
+            "contents": content_to_records(page),
+        }
@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from src.db.define_tables import EvaluationJob, EvaluationResult
+from src.constants.config import EVAL_JOB_STALE_AFTER, EVAL_JOB_MAX_ATTEMPTS
+from src.utils.logger import logger
+
+
+# Mapping of job status to the legacy EvaluationResult.quantitative_eval_state string
+JOB_STATUS_TO_EVAL_STATE = {
+    "queued": "running",
+    "running": "running",
+    "done": "done",
+    "failed": "failed",
+}
+
+
+class EvaluationJobManager:
+    """
+    A class that consolidates database operations for the quantitative evaluation job queue
+    """
+    @staticmethod
+    def enqueue(db: Session, eval_result_id: int, payload: dict) -> EvaluationJob:
+        """
+        Add a quantitative evaluation job to the queue
+        :param db: SQLAlchemy Session
+        :param eval_result_id: ID of the EvaluationResult to register results to
+        :param payload: dict (evaluation_id, dataset_ids, target_ai_model_id, evaluator_ai_model_id, max_concurrency, use_cache)
+        :return: Registered EvaluationJob instance
+        """
+        logger.info(f"enqueue: ID={eval_result_id} の定量評価ジョブ登録を開始します。")
+        eval_result = db.query(EvaluationResult).filter_by(
+            id=eval_result_id).first()
+        if eval_result is None:
+            logger.error("enqueue: EvaluationResultが見つかりません。")
+            raise ValueError("EvaluationResult not found")
+        try:
+            job = EvaluationJob(
+                evaluation_result_id=eval_result_id,
+                payload=payload,
+                status="queued",
+                progress=0.0,
+                progress_message="queued",
+                attempts=0,
+                created_date=datetime.now()
+            )
+            db.add(job)
+            eval_result.quantitative_eval_state = "running"
+            db.commit()
+            db.refresh(job)
+            logger.info(f"enqueue: ジョブ(ID={job.id}) を登録しました。")
+            return job
+        except Exception as e:
+            logger.error(f"enqueue: 登録処理中にエラーが発生しました: {e}")
+            db.rollback()
+            raise
+
+    @staticmethod
+    def claim_next(db: Session, worker_id: str, stale_after: float = EVAL_JOB_STALE_AFTER, max_attempts: int = EVAL_JOB_MAX_ATTEMPTS) -> EvaluationJob | None:
+        """
+        Lock and take the oldest runnable job (SELECT ... FOR UPDATE SKIP LOCKED).
+        Running jobs whose heartbeat is older than stale_after seconds are taken over again.
+        :return: Claimed EvaluationJob or None if the queue is empty
+        """
+        while True:
+            stale_before = datetime.now() - timedelta(seconds=stale_after)
+            try:
+                job = db.query(EvaluationJob).filter(
+                    or_(
+                        EvaluationJob.status == "queued",
+                        and_(EvaluationJob.status == "running",
+                             EvaluationJob.heartbeat_date < stale_before)
+                    )
+                ).order_by(EvaluationJob.id).with_for_update(skip_locked=True).first()
+                if job is None:
+                    db.commit()
+                    return None
+
+                if job.status == "running" and (job.attempts or 0) >= max_attempts:
+                    logger.warning(
+                        f"claim_next: ジョブ(ID={job.id}) はハートビートが途絶え、試行回数の上限に達したため失敗扱いにします。")
+                    EvaluationJobManager._finish(
+                        db, job, "failed", error="heartbeat timeout")
+                    db.commit()
+                    continue
+
+                if job.status == "running":
+                    logger.warning(
+                        f"claim_next: ジョブ(ID={job.id}) のハートビートが途絶えたため再実行します。(前回worker={job.worker_id})")
+                now = datetime.now()
+                job.status = "running"
+                job.worker_id = worker_id
+                job.attempts = (job.attempts or 0) + 1
+                job.started_date = now
+                job.heartbeat_date = now
+                job.progress = 0.0
+                job.progress_message = "started"
+                job.error = None
+                db.commit()
+                db.refresh(job)
+                logger.info(
+                    f"claim_next: worker={worker_id} がジョブ(ID={job.id}) を取得しました。")
+                return job
+            except Exception as e:
+                logger.error(f"claim_next: ジョブ取得中にエラーが発生しました: {e}")
+                db.rollback()
+                raise
+
+    @staticmethod
+    def heartbeat(db: Session, job_id: int, progress: float | None = None, message: str | None = None,
+                  rate_limits: list[dict] | None = None) -> None:
+        """
+        Update heartbeat (and optionally progress and the rate limiter snapshot) of a running job
+        """
+        try:
+            job = db.query(EvaluationJob).filter_by(id=job_id).first()
+            if job is None or job.status != "running":
+                db.rollback()
+                return
+            job.heartbeat_date = datetime.now()
+            if progress is not None:
+                job.progress = progress
+            if message is not None:
+                job.progress_message = message
+            if rate_limits is not None:
+                job.rate_limits = rate_limits
+            db.commit()
+        except Exception as e:
+            logger.error(f"heartbeat: ジョブ(ID={job_id}) の更新中にエラーが発生しました: {e}")
+            db.rollback()
+
+    @staticmethod
+    def complete(db: Session, job_id: int) -> None:
+        """
+        Mark a job as done
+        """
+        logger.info(f"complete: ジョブ(ID={job_id}) を完了にします。")
+        try:
+            job = db.query(EvaluationJob).filter_by(id=job_id).first()
+            if job is None:
+                raise ValueError("EvaluationJob not found")
+            EvaluationJobManager._finish(db, job, "done")
+            db.commit()
+        except Exception as e:
+            logger.error(f"complete: 更新処理中にエラーが発生しました: {e}")
+            db.rollback()
+            raise
+
+    @staticmethod
+    def fail(db: Session, job_id: int, error: str) -> None:
+        """
+        Mark a job as failed
+        """
+        logger.info(f"fail: ジョブ(ID={job_id}) を失敗にします。")
+        try:
+            job = db.query(EvaluationJob).filter_by(id=job_id).first()
+            if job is None:
+                raise ValueError("EvaluationJob not found")
+            EvaluationJobManager._finish(db, job, "failed", error=error)
+            db.commit()
+        except Exception as e:
+            logger.error(f"fail: 更新処理中にエラーが発生しました: {e}")
+            db.rollback()
+            raise
+
+    @staticmethod
+    def _finish(db: Session, job: EvaluationJob, status: str, error: str | None = None) -> None:
+        now = datetime.now()
+        job.status = status
+        job.error = error
+        job.heartbeat_date = now
+        job.finished_date = now
+        if status == "done":
+            job.progress = 1.0
+        job.progress_message = status
+        eval_result = db.query(EvaluationResult).filter_by(
+            id=job.evaluation_result_id).first()
+        if eval_result is not None:
+            eval_result.quantitative_eval_state = JOB_STATUS_TO_EVAL_STATE[status]
+
+    @staticmethod
+    def get_latest_by_result_id(db: Session, eval_result_id: int) -> EvaluationJob | None:
+        """
+        Get the latest job of the specified EvaluationResult
+        """
+        return db.query(EvaluationJob).filter_by(
+            evaluation_result_id=eval_result_id).order_by(EvaluationJob.id.desc()).first()
+
+    @staticmethod
+    def get_running_rate_limits(db: Session) -> list[dict]:
+        """
+        Rate limiter snapshots reported by the workers of the running jobs
+        """
+        jobs = db.query(EvaluationJob).filter_by(
+            status="running").order_by(EvaluationJob.id).all()
+        return [
+            {
+                "job_id": job.id,
+                "worker_id": job.worker_id,
+                "heartbeat_date": job.heartbeat_date,
+                "limiters": job.rate_limits or [],
+            }
+            for job in jobs
+        ]
+
+    @staticmethod
+    def to_dict(job: EvaluationJob) -> dict:
+        return {
+            "id": job.id,
+            "evaluation_result_id": job.evaluation_result_id,
+            "status": job.status,
+            "progress": job.progress,
+            "progress_message": job.progress_message,
+            "attempts": job.attempts,
+            "worker_id": job.worker_id,
+            "error": job.error,
+            "created_date": job.created_date,
+            "started_date": job.started_date,
+            "heartbeat_date": job.heartbeat_date,
+            "finished_date": job.finished_date,
+        }
@@ -199,33 +199,40 @@ class EvaluationManager:
                 logger.info(f"get_all: {len(evals)}件のEvaluationを取得しました。")
             logger.debug(f"get_all: 取得したEvaluationデータ: {evals}")
 
-            # DatasetCustomMappingテーブルを経由してDatasetを取得
-            used_dataset_names = []
-            for ev in evals:
-                dataset_names = db.query(Dataset.name).join(
-                    DatasetCustomMapping, Dataset.id == DatasetCustomMapping.dataset_id
+            # DatasetCustomMappingテーブルを経由してDatasetを取得(全Evaluation分を1クエリで取得)
+            custom_datasets_ids = {ev.custom_datasets_id for ev in evals}
+            names_by_custom_datasets_id = {}
+            if custom_datasets_ids:
+                rows = db.query(DatasetCustomMapping.custom_datasets_id, Dataset.name).join(
+                    Dataset, Dataset.id == DatasetCustomMapping.dataset_id
                 ).filter(
-                    DatasetCustomMapping.custom_datasets_id == ev.custom_datasets_id if ev else None
+                    DatasetCustomMapping.custom_datasets_id.in_(custom_datasets_ids)
                 ).all()
-                # タプルのリストから名前のリストに変換
-                names = [name[0] for name in dataset_names]
+                for custom_datasets_id, name in rows:
+                    names_by_custom_datasets_id.setdefault(
+                        custom_datasets_id, []).append(name)
+
+            # namesにGSN_から始まるものがあれば、代わりにAISIpresetを追加してGSN_から始まるものを除外
+            perspective_map = {
+                "G1": "有害情報の出力制御",
+                "G2": "偽誤情報の出力・誘導の防止",
+                "G3": "公平性と包摂性",
+                "G4": "ハイリスク利用・目的外利用への対処",
+                "G5": "プライバシー保護",
+                "G6": "セキュリティ確保",
+                "G7": "説明可能性",
+                "G8": "ロバスト性",
+                "G9": "データ品質",
+                "G10": "検証可能性"
+            }
+            GSN_tags = ["G1", "G2", "G3", "G4",
+                        "G5", "G6", "G7", "G8", "G9", "G10"]
+            used_dataset_names = []
+            for ev in evals:
+                names = list(names_by_custom_datasets_id.get(
+                    ev.custom_datasets_id, []))
                 logger.debug(f"get_all: 取得したDataset名: {names}")
 
-                # namesにGSN_から始まるものがあれば、代わりにAISIpresetを追加してGSN_から始まるものを除外
-                perspective_map = {
-                    "G1": "有害情報の出力制御",
-                    "G2": "偽誤情報の出力・誘導の防止",
-                    "G3": "公平性と包摂性",
-                    "G4": "ハイリスク利用・目的外利用への対処",
-                    "G5": "プライバシー保護",
-                    "G6": "セキュリティ確保",
-                    "G7": "説明可能性",
-                    "G8": "ロバスト性",
-                    "G9": "データ品質",
-                    "G10": "検証可能性"
-                }
-                GSN_tags = ["G1", "G2", "G3", "G4",
-                            "G5", "G6", "G7", "G8", "G9", "G10"]
                 for tag in GSN_tags:
                     if any(name.startswith(f"GSN_{tag}") for name in names):
                         names.append(f"Preset Data({perspective_map[tag]})")
@@ -1,4 +1,5 @@
 from datetime import date, datetime
+from typing import Callable
 import importlib.util
 from pathlib import Path
 from src.db.define_tables import EvaluationResult, Dataset, AIModel, Evaluation, AIModel, UseGSN
@@ -7,9 +8,19 @@ from src.utils.logger import logger
 from src.gsn.register_dataset_for_gsn import RegisterDatasetForGSN
 from src.manager.quantitative_dataset_manager import QuantitativeDatasetService
 from src.manager.dataset_manager import DatasetManager
+from src.manager.evaluation_sample_result_manager import EvaluationSampleResultManager
+from src.manager.evaluation_score_cache_manager import EvaluationScoreCacheManager
+from src.manager.scoring_context import ScoringContext
 import pandas as pd
 
 
+# Columns returned by the evaluation result list (header columns are cheap, result columns hold whole inspect_ai logs)
+EVALUATION_RESULT_HEADER_FIELDS = ["id", "name", "created_date", "evaluation_name",
+                                   "target_ai_model_name", "evaluator_ai_model_name", "quantitative_eval_state"]
+EVALUATION_RESULT_FIELDS = EVALUATION_RESULT_HEADER_FIELDS + \
+    ["quantitative_results", "qualitative_results"]
+
+
 class EvaluationResultsManager:
     @staticmethod
     def get_all_evaluation_results(db: Session) -> list[EvaluationResult]:
@@ -19,28 +30,9 @@ class EvaluationResultsManager:
         evaluator_, target_ai_model_id -> Join with AIModel to get model names
         """
         logger.info("get_all_evaluation_results: 全てのEvaluationResult取得を開始します。")
-        from sqlalchemy.orm import aliased
-        from src.db.define_tables import AIModel, EvaluationResult
-        TargetAIModel = aliased(AIModel)
-        EvaluatorAIModel = aliased(AIModel)
         try:
-            evaluation_results = db.query(EvaluationResult).\
-                join(EvaluationResult.evaluation).\
-                join(TargetAIModel, TargetAIModel.id == EvaluationResult.target_ai_model_id).\
-                join(EvaluatorAIModel, EvaluatorAIModel.id ==
-                     EvaluationResult.evaluator_ai_model_id).all()
-
-            required_response = [{
-                "id": result.id,
-                "name": result.name,
-                "created_date": result.created_date,
-                "evaluation_name": result.evaluation.name,
-                "target_ai_model_name": result.target_ai_model.name,
-                "evaluator_ai_model_name": result.evaluator_ai_model.name,
-                "quantitative_results": result.quantitative_results,
-                "qualitative_results": result.qualitative_results,
-                "quantitative_eval_state": result.quantitative_eval_state
-            } for result in evaluation_results]
+            required_response, _ = EvaluationResultsManager.get_evaluation_results_page(
+                db, fields=EVALUATION_RESULT_FIELDS)
             logger.info(
                 f"get_all_evaluation_results: {len(required_response)}件のEvaluationResultを取得しました。")
             return required_response
@@ -48,6 +40,58 @@ class EvaluationResultsManager:
             logger.error(f"get_all_evaluation_results: 取得処理中にエラーが発生しました: {e}")
             return []
 
+    @staticmethod
+    def get_evaluation_results_page(db: Session, limit: int | None = None, cursor: int | None = None, fields: list[str] | None = None) -> tuple[list[dict], int | None]:
+        """
+        Get EvaluationResults ordered by id, selecting only the requested columns
+        (names are resolved by joins in the same query, result JSON columns are read only when requested)
+        limit: Maximum number of rows (None: all rows)
+        cursor: Return rows with id greater than this value (next_cursor of the previous page)
+        fields: Subset of EVALUATION_RESULT_FIELDS (default: EVALUATION_RESULT_HEADER_FIELDS). "id" is always returned
+        return: (rows, next_cursor). next_cursor is None on the last page
+        """
+        from sqlalchemy.orm import aliased
+        from src.db.define_tables import AIModel, EvaluationResult
+        fields = fields or EVALUATION_RESULT_HEADER_FIELDS
+        unknown = [f for f in fields if f not in EVALUATION_RESULT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {unknown}")
+        if "id" not in fields:
+            fields = ["id"] + list(fields)
+
+        TargetAIModel = aliased(AIModel)
+        EvaluatorAIModel = aliased(AIModel)
+        columns = {
+            "id": EvaluationResult.id,
+            "name": EvaluationResult.name,
+            "created_date": EvaluationResult.created_date,
+            "evaluation_name": Evaluation.name,
+            "target_ai_model_name": TargetAIModel.name,
+            "evaluator_ai_model_name": EvaluatorAIModel.name,
+            "quantitative_eval_state": EvaluationResult.quantitative_eval_state,
+            "quantitative_results": EvaluationResult.quantitative_results,
+            "qualitative_results": EvaluationResult.qualitative_results,
+        }
+        query = db.query(*[columns[f].label(f) for f in fields]).\
+            select_from(EvaluationResult).\
+            join(Evaluation, Evaluation.id == EvaluationResult.evaluation_id).\
+            join(TargetAIModel, TargetAIModel.id == EvaluationResult.target_ai_model_id).\
+            join(EvaluatorAIModel, EvaluatorAIModel.id ==
+                 EvaluationResult.evaluator_ai_model_id)
+        if cursor is not None:
+            query = query.filter(EvaluationResult.id > cursor)
+        query = query.order_by(EvaluationResult.id)
+        if limit is not None:
+            # NOTE: Fetch one extra row to know whether a next page exists
+            query = query.limit(limit + 1)
+        rows = [dict(r._mapping) for r in query.all()]
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1]["id"]
+        return rows, next_cursor
+
     @staticmethod
     def create_evaluation_result(db: Session, eval_result: EvaluationResult) -> int:
         """
@@ -92,6 +136,7 @@ class EvaluationResultsManager:
         try:
             eval_result.qualitative_results = {
                 "results": qualitative_result.get("results", [])}
+            EvaluationScoreCacheManager.invalidate(db, eval_result_id)
             logger.info(
                 f"eval_result.qualitative_results: {eval_result.qualitative_results}")
             db.commit()
@@ -128,13 +173,20 @@ class EvaluationResultsManager:
     def get_eval_status(db: Session, eval_result_id: int) -> str:
         """
         Get the status of quantitative evaluation
+        The latest EvaluationJob is used if exists, otherwise quantitative_eval_state
         """
+        from src.manager.evaluation_job_manager import EvaluationJobManager, JOB_STATUS_TO_EVAL_STATE
         logger.info(f"get_eval_status: ID={eval_result_id} のステータス取得を開始します。")
         eval_result = db.query(EvaluationResult).filter_by(
             id=eval_result_id).first()
         if eval_result is None:
             logger.error("get_eval_status: EvaluationResultが見つかりません。")
             raise ValueError("EvaluationResult not found")
+        job = EvaluationJobManager.get_latest_by_result_id(db, eval_result_id)
+        if job is not None:
+            logger.info(
+                f"get_eval_status: ジョブ(ID={job.id}) のステータスは '{job.status}' です。")
+            return JOB_STATUS_TO_EVAL_STATE.get(job.status, job.status)
         logger.info(
             f"get_eval_status: ステータスは '{eval_result.quantitative_eval_state}' です。")
         return eval_result.quantitative_eval_state
@@ -174,21 +226,29 @@ class EvaluationResultsManager:
             return scorer_provider.get_graded_qa_scorer(model=model, prompt=prompt, grade_pattern=grade_pattern)
 
     @staticmethod
-    def register_quantitative_result(db: Session, eval_result_id: int, dataset_ids: list[int], target_model_id: int, eval_model_id: int, use_gsn: UseGSN | None = None) -> int:
+    def register_quantitative_result(db: Session, eval_result_id: int, dataset_ids: list[int], target_model_id: int, eval_model_id: int, use_gsn: UseGSN | None = None, max_concurrency: int | None = None, progress_callback: Callable[[float, str], None] | None = None, use_cache: bool | None = None) -> int:
         """
         Execute quantitative evaluation by specifying dataset ID and model ID, and register the results to evaluation_result
+        max_concurrency: Maximum number of inspect_ai tasks run in parallel for this run (default: EVAL_MAX_TASKS)
+        use_cache: Reuse cached model responses (see src/inspect/eval_cache.py). False bypasses the cache (default: EVAL_CACHE_ENABLED)
+        progress_callback: Called with (progress 0.0-1.0, stage name) as the evaluation advances
         """
         logger.info(
             f"register_quantitative_result: ID={eval_result_id} の定量評価登録を開始します。")
-        from src.inspect.eval_datasets import new_eval_by_ten_perspective
-        from src.inspect.inspect_common import register_in_inspect_ai
-        import pickle
+        from src.inspect.eval_datasets import new_eval_by_ten_perspective, new_eval_by_scorer_groups
+        from src.inspect.inspect_common import register_in_inspect_ai, model_rate_limits
+        from src.inspect.eval_cache import eval_cache_policy, with_cache, prune_eval_cache
         from inspect_ai.scorer import model_graded_qa
+        from src.db.dataset_content import decode_content, EVAL_DATASET_COLUMNS, EVAL_DATASET_COLUMNS_LIKE
         from src.manager.dataset_manager import DatasetManager
         from src.db.define_tables import AIModel, EvaluationResult, DatasetCustomMapping
 
         logger.info("Call: register_quantitative_result")
 
+        def report_progress(progress: float, message: str):
+            if progress_callback is not None:
+                progress_callback(progress, message)
+
         eval_result = db.query(EvaluationResult).filter_by(
             id=eval_result_id).first()
         if not eval_result:
@@ -219,6 +279,7 @@ class EvaluationResultsManager:
             raise ValueError("EvaluationResult not found")
 
         logger.info(f"dataset_ids: {dataset_ids}")
+        report_progress(0.05, "loading_datasets")
 
         datasets = DatasetManager.get_by_ids_and_type(
             db, dataset_ids, "quantitative")
@@ -242,12 +303,13 @@ class EvaluationResultsManager:
                 "register_quantitative_result: Evaluation AIModelが見つかりません。")
             raise ValueError("Evaluation AIModel not found")
 
-        # Dataset data_content is binary serialized with pickle, so load it to get DataFrame
+        # Load data_content as DataFrame, reading only the columns used by the evaluation
         # TODO: Currently only df with text is allowed, but multimodal support is planned for the future
         dfs = []
         for dataset in datasets:
             try:
-                df = pickle.loads(dataset.data_content)
+                df = decode_content(dataset.data_content, dataset.content_format,
+                                    columns=EVAL_DATASET_COLUMNS, columns_like=EVAL_DATASET_COLUMNS_LIKE)
                 dfs.append(df)
             except Exception as e:
                 logger.error(
@@ -264,30 +326,41 @@ class EvaluationResultsManager:
         # NOTE: Scorer columns are fillna with model_graded_qa
         df.fillna({"scorer": "model_graded_qa"}, inplace=True)
 
+        report_progress(0.1, "registering_models")
         # add model to inspect_ai.
         # NOTE: target_model is for answer generation, eval_model is for scoring
         target_model_alias = register_in_inspect_ai(
             model_name=target_model.model_name,
             api_url=target_model.url,
-            api_key=target_model.api_key
+            api_key=target_model.api_key,
+            rate_limits=model_rate_limits(target_model)
         )
         target_model_name = f"{target_model_alias}/{target_model.model_name}"
 
         eval_model_alias = register_in_inspect_ai(
             model_name=eval_model.model_name,
             api_url=eval_model.url,
-            api_key=eval_model.api_key
+            api_key=eval_model.api_key,
+            rate_limits=model_rate_limits(eval_model)
         )
         eval_model_name = f"{eval_model_alias}/{eval_model.model_name}"
 
         logger.info(f"Target model: {target_model_name}")
         logger.info(f"Evaluation model: {eval_model_name}")
 
+        # NOTE: Answers and grader verdicts are reused from the response cache unless use_cache is False
+        cache_policy = eval_cache_policy(use_cache)
+        logger.info(f"register_quantitative_result: cache={'on' if cache_policy else 'off'}")
+        target_model_name = with_cache(target_model_name, cache_policy)
+        eval_model_name = with_cache(eval_model_name, cache_policy)
+
         # Check for scorer column presence and evaluate by splitting by scorer
         results = {}
         try:
+            report_progress(0.15, "evaluating")
             if 'scorer' in df.columns:
                 # If scorer column exists, split by scorer
+                groups = []
                 for scorer_name in df['scorer'].dropna().unique():
                     scorer_df = df[df['scorer'] == scorer_name]
                     if scorer_df.empty:
@@ -303,19 +376,27 @@ class EvaluationResultsManager:
                         eval_type = "requirement_eval"
                     else:
                         eval_type = "default"
+                    groups.append((scorer_df, scorer, eval_type))
 
-                    scorer_results = new_eval_by_ten_perspective(
-                        scorer_df, target_model_name=target_model_name, scorer=scorer, eval_type=eval_type)
-                    # Merge results (overwrite if same perspective exists)
-                    for perspective, result in scorer_results.items():
-                        results[perspective] = result
+                # NOTE: All scorer groups run concurrently; results are merged in group order (overwrite if same perspective exists)
+                results = new_eval_by_scorer_groups(
+                    groups, target_model_name=target_model_name, max_tasks=max_concurrency)
             else:
                 # If no scorer column, use default scorer
                 scorer = EvaluationResultsManager.get_scorer(
                     "model_graded_qa", model=eval_model_name, prompt=prompt)
                 results = new_eval_by_ten_perspective(
-                    df, target_model_name=target_model_name, scorer=scorer, eval_type="default")
-            eval_result.quantitative_results = results
+                    df, target_model_name=target_model_name, scorer=scorer, eval_type="default", max_tasks=max_concurrency)
+            report_progress(0.9, "saving_results")
+            if cache_policy is not None:
+                try:
+                    prune_eval_cache()
+                except Exception as e:
+                    logger.error(f"register_quantitative_result: キャッシュの整理に失敗しました: {e}")
+            # NOTE: Logs and per-sample scores are stored out of row; quantitative_results only keeps references
+            eval_result.quantitative_results = EvaluationSampleResultManager.store_results(
+                db, eval_result.id, results)
+            EvaluationScoreCacheManager.invalidate(db, eval_result.id)
             db.commit()
 
             # Update status
@@ -413,16 +494,16 @@ class EvaluationResultsManager:
         qual_results = eval_result.qualitative_results
 
 
-        import json
         # Dictionary to group by perspective
         perspective_map = {}
         # Quantitative evaluation (quantitative_results)
         if quant_results:
-            for perspective, json_str in quant_results.items():
-                if not json_str:
-                    continue
+            for perspective in quant_results.keys():
                 try:
-                    data = json.loads(json_str)
+                    data = EvaluationSampleResultManager.load_log(
+                        db, quant_results, perspective)
+                    if not data:
+                        continue
                 except Exception as e:
                     logger.error(
                         f"get_result_detail: quantitative_resultsのパースに失敗: {e}")
@@ -553,28 +634,37 @@ class EvaluationResultsManager:
         dataset_mappings = custom_datasets.custom_mappings
         dataset_ids = [mapping.dataset_id for mapping in dataset_mappings]
 
-        # 5. Get Dataset list
-        datasets = db.query(Dataset).filter(Dataset.id.in_(dataset_ids)).all()
+        # 5. Get Dataset list (data_content is not needed for scoring)
+        from sqlalchemy.orm import defer
+        datasets = db.query(Dataset).options(defer(Dataset.data_content)).filter(
+            Dataset.id.in_(dataset_ids)).all()
         return datasets
 
     @staticmethod
-    def gsn_qual_scoring(db: Session, eval_result_id: int, qual_results: dict | None, perspective: str):
+    def create_scoring_context(db: Session, eval_result_id: int) -> ScoringContext:
+        """
+        Scoring context for callers of the GSN scoring helpers that do not share one
+        """
+        eval_result = db.query(EvaluationResult).filter_by(
+            id=eval_result_id).first()
+        if eval_result is None:
+            raise ValueError("EvaluationResult not found")
+        return ScoringContext(db, eval_result)
+
+    @staticmethod
+    def gsn_qual_scoring(db: Session, eval_result_id: int, qual_results: dict | None, perspective: str, context: ScoringContext | None = None):
         if qual_results is None or qual_results['results']==[]:
             logger.warning(
                 f"qual_results is None for eval_result_id: {eval_result_id}, perspective: {perspective}")
             return 0.0
 
         # get gsn score rates
-        datasets = EvaluationResultsManager.get_datasets_by_evaluation_result_id(
+        context = context or EvaluationResultsManager.create_scoring_context(
             db, eval_result_id)
-
-        datasets_name_type_df = pd.DataFrame(
-            [[d.name, d.type] for d in datasets], columns=["name", "type"])
-        datasets_name_type_df = datasets_name_type_df.drop_duplicates(
-            subset='name')
+        datasets_name_type_df = context.datasets_name_type_df
 
         # Create a mapping of dataset name to score rate
-        dataset_name_to_score_rate = {d.name: d.score_rate for d in datasets}
+        dataset_name_to_score_rate = context.dataset_name_to_score_rate
         result = []
         if qual_results and isinstance(qual_results, dict):
             for item in qual_results.get("results", []):
@@ -642,21 +732,17 @@ class EvaluationResultsManager:
         return final_score
 
     @staticmethod
-    def get_gsn_normalization_factor(db: Session, eval_result_id: int, qual_results: dict | None, quant_results: dict | None, perspective: str):
+    def get_gsn_normalization_factor(db: Session, eval_result_id: int, qual_results: dict | None, quant_results: dict | None, perspective: str, context: ScoringContext | None = None):
         """
         Calculate normalization factor for GSN perspectives:
         (sum of original score rates of all the gsn perspectives) / (sum of score rates without those of not applicable gsn perspectives)
         """
         # Get all datasets for this evaluation result
-        datasets = EvaluationResultsManager.get_datasets_by_evaluation_result_id(
+        context = context or EvaluationResultsManager.create_scoring_context(
             db, eval_result_id)
 
-        datasets_name_type_df = pd.DataFrame(
-            [[d.name, d.type] for d in datasets], columns=["name", "type"])
-        datasets_name_type_df = datasets_name_type_df.drop_duplicates(subset='name')
-        
         # Create a mapping of dataset name to score rate
-        dataset_name_to_score_rate = {d.name: d.score_rate for d in datasets}
+        dataset_name_to_score_rate = context.dataset_name_to_score_rate
         
         # Calculate total original score rate for both qualitative and quantitative
         qual_score_rates = []
@@ -680,19 +766,9 @@ class EvaluationResultsManager:
         
         # Process quantitative results (get GSN perspectives from quant_results for this perspective)
         if quant_results:
-            import json
-            results_json_str = quant_results.get(perspective, "{}")
             try:
-                results_json = json.loads(results_json_str)
-                
                 # Extract GSN perspectives from quantitative results
-                gsn_perspectives_in_quant = set()
-                for sample in results_json.get("samples", []):
-                    gsn_perspective = sample.get("gsn_perspective", [])
-                    if isinstance(gsn_perspective, list):
-                        gsn_perspectives_in_quant.update(gsn_perspective)
-                    elif isinstance(gsn_perspective, str):
-                        gsn_perspectives_in_quant.add(gsn_perspective)
+                gsn_perspectives_in_quant = context.gsn_perspectives(perspective)
                 
                 # Add score rates for quantitative GSN datasets used in this perspective
                 for gsn_id in gsn_perspectives_in_quant:
@@ -728,7 +804,7 @@ class EvaluationResultsManager:
         return normalization_factor
 
     @staticmethod
-    def gsn_quant_scoring(db: Session, eval_result_id: int, quant_results: dict | None, perspective: str = ""):
+    def gsn_quant_scoring(db: Session, eval_result_id: int, quant_results: dict | None, perspective: str = "", context: ScoringContext | None = None):
         """
         GSN quantitative scoring
         """
@@ -738,90 +814,18 @@ class EvaluationResultsManager:
             return 0.0
 
         # get gsn score rates
-        datasets = EvaluationResultsManager.get_datasets_by_evaluation_result_id(
+        context = context or EvaluationResultsManager.create_scoring_context(
             db, eval_result_id)
+        datasets = context.datasets
+        datasets_name_type_df = context.datasets_name_type_df
 
-        datasets_name_type_df = pd.DataFrame(
-            [[d.name, d.type] for d in datasets], columns=["name", "type"])
-        # drop duplicated name
-        datasets_name_type_df = datasets_name_type_df.drop_duplicates(
-            subset='name')
-
-        import json
-        results_json_str = quant_results.get(perspective, "{}")
-        results_json = json.loads(results_json_str)
-
-        def extract_gsn_perspectives_from_json(results_json: dict) -> list[str]:
-            """
-            results_jsonからgsn_perspectiveを抜き出す
-            """
-            gsn_perspectives = []
-            for sample in results_json.get("samples", []):
-                gsn_perspective = sample.get("gsn_perspective", [])
-                if isinstance(gsn_perspective, list):
-                    gsn_perspectives.extend(gsn_perspective)
-                elif isinstance(gsn_perspective, str):
-                    gsn_perspectives.append(gsn_perspective)
-            return gsn_perspectives
-        gsn_perspectives = extract_gsn_perspectives_from_json(results_json)
-
-        def extract_gsn_perspectives_and_accuracy(results_json: dict) -> list[dict]:
-            """
-            results_jsonからgsn_perspectiveとその個別accuracyを計算して返す
-            各GSN perspectiveごとに、そのperspectiveに属するsampleのscoreの平均を計算
-            [
-                {"gsn_perspective": "G2-8", "accuracy": 0.75},
-                ...
-            ]
-            """
-            # Extract individual sample scores from reductions
-            sample_scores = {}
-            for reduction in results_json.get("reductions", []):
-                for sample_data in reduction.get("samples", []):
-                    sample_id = sample_data.get("sample_id")
-                    sample_value = sample_data.get("value", 0.0)
-                    if sample_id is not None:
-                        sample_scores[sample_id] = sample_value
-            
-            # Extract gsn_perspective and map to sample scores
-            perspective_scores = {}
-            for sample in results_json.get("samples", []):
-                sample_id = sample.get("id")
-                gsn_perspective = sample.get("gsn_perspective", [])
-                sample_score = sample_scores.get(sample_id, 0.0)
-                
-                if isinstance(gsn_perspective, list):
-                    for g in gsn_perspective:
-                        if g not in perspective_scores:
-                            perspective_scores[g] = []
-                        perspective_scores[g].append(sample_score)
-                elif isinstance(gsn_perspective, str):
-                    if gsn_perspective not in perspective_scores:
-                        perspective_scores[gsn_perspective] = []
-                    perspective_scores[gsn_perspective].append(sample_score)
-            
-            # Calculate accuracy for each perspective
-            result = []
-            for perspective, scores in perspective_scores.items():
-                if len(scores) == 0:
-                    logger.warning(
-                        f"GSN perspective {perspective} has no scores, skipping.")
-                    accuracy = 0.0
-                else:
-                    accuracy = sum(scores) / len(scores) if scores else 0.0
-                result.append({"gsn_perspective": perspective, "accuracy": accuracy})
-                logger.debug(f"GSN perspective {perspective}: scores={scores}, accuracy={accuracy}")
-            
-            return result
-
-        if results_json == {}:
+        # Mean sample score for each GSN perspective (aggregated in SQL for results stored per sample)
+        gsn_perspective_accuracy = context.gsn_accuracies(perspective)
+        if not gsn_perspective_accuracy:
             logger.warning(
                 f"calculate_10perspective_scores: No results found for eval_result_id: {eval_result_id}, perspective: {perspective}")
             return 0.0
 
-        gsn_perspective_accuracy = extract_gsn_perspectives_and_accuracy(
-            results_json)
-
         df_perspective_accuracy = pd.DataFrame(gsn_perspective_accuracy)
         # 同じgsn_perspectiveが複数ある場合は、accuracyの平均を取る
         df_perspective_accuracy = df_perspective_accuracy.groupby(
@@ -852,7 +856,57 @@ class EvaluationResultsManager:
         return total_score
 
     @staticmethod
-    def calculate_10perspective_scores(db: Session, eval_result_id: int):
+    def calculate_10perspective_scores(db: Session, eval_result_id: int, use_cache: bool = True) -> dict:
+        """
+        10-perspective scores of a result.
+        Once the quantitative evaluation is done, scores are served from EvaluationScoreCache
+        as long as the fingerprint of the scoring inputs is unchanged (see compute_10perspective_scores).
+        """
+        scores, _ = EvaluationResultsManager.get_10perspective_scores_with_breakdown(
+            db, eval_result_id, use_cache=use_cache)
+        return scores
+
+    @staticmethod
+    def get_10perspective_scores_with_breakdown(db: Session, eval_result_id: int, use_cache: bool = True) -> tuple[dict, dict]:
+        """
+        Same as calculate_10perspective_scores, and also return the GSN breakdown
+        {perspective: {"qual_score", "quant_score", "normalization_factor"}}
+        """
+        eval_result = db.query(EvaluationResult).filter_by(
+            id=eval_result_id).first()
+        if eval_result is None:
+            logger.error(
+                f"get_10perspective_scores_with_breakdown: ID {eval_result_id}: EvaluationResult not found")
+            raise ValueError(
+                f"ID {eval_result_id}: EvaluationResult not found")
+
+        # NOTE: Results can still change while the evaluation is running, so cache only finished results
+        if not use_cache or eval_result.quantitative_eval_state != "done":
+            gsn_breakdown = {}
+            scores = EvaluationResultsManager.compute_10perspective_scores(
+                db, eval_result_id, gsn_breakdown=gsn_breakdown)
+            return scores, gsn_breakdown
+
+        fingerprint = EvaluationScoreCacheManager.compute_fingerprint(
+            db, eval_result)
+        cache = EvaluationScoreCacheManager.get(
+            db, eval_result_id, fingerprint)
+        if cache is not None:
+            logger.info(
+                f"get_10perspective_scores_with_breakdown: ID={eval_result_id} のスコアをキャッシュから返します。")
+            return cache.scores, cache.gsn_breakdown or {}
+
+        gsn_breakdown = {}
+        scores = EvaluationResultsManager.compute_10perspective_scores(
+            db, eval_result_id, gsn_breakdown=gsn_breakdown)
+        # NOTE: pandas sums are numpy scalars; convert so that they can be stored as JSON
+        scores = {k: float(v) for k, v in scores.items()}
+        EvaluationScoreCacheManager.put(
+            db, eval_result_id, fingerprint, scores, gsn_breakdown)
+        return scores, gsn_breakdown
+
+    @staticmethod
+    def compute_10perspective_scores(db: Session, eval_result_id: int, gsn_breakdown: dict | None = None) -> dict:
         """
         Get results → Calculate 10-perspective scores by combining quantitative and qualitative results
 
@@ -890,6 +944,16 @@ class EvaluationResultsManager:
             raise ValueError(
                 f"ID {eval_result_id}: EvaluationResult not found")
 
+        with ScoringContext(db, eval_result) as context:
+            return EvaluationResultsManager._combine_10perspective_scores(
+                db, eval_result, perspectives, context, gsn_breakdown)
+
+    @staticmethod
+    def _combine_10perspective_scores(db: Session, eval_result: EvaluationResult, perspectives: list[str], context: ScoringContext, gsn_breakdown: dict | None) -> dict:
+        """
+        Body of compute_10perspective_scores. All scoring helpers share the same ScoringContext.
+        """
+        eval_result_id = eval_result.id
         # Check if GSN is being used
         use_gsn = db.query(UseGSN).filter_by(
             evaluation_id=eval_result.evaluation_id).all()
@@ -923,7 +987,7 @@ class EvaluationResultsManager:
             qual_results)
 
         quant_scores = EvaluationResultsManager.convert_quantitative_results_to_scores(
-            quant_results)
+            quant_results, context=context)
 
         # pickup perspective_id from use_gsn
         gsn_used_perspectives = [x.evaluation_perspective_id for x in use_gsn]
@@ -942,25 +1006,31 @@ class EvaluationResultsManager:
                 # Qualitative score
                 logger.info("Qualitative scoring")
                 qual_score = EvaluationResultsManager.gsn_qual_scoring(
-                    db, eval_result_id, qual_results, perspective)
+                    db, eval_result_id, qual_results, perspective, context=context)
                 logger.debug(
                     f"id: {eval_result_id}, qual_score: {qual_score} for perspective: {perspective} (GSN)")
 
                 # Quantitative score
                 logger.info("Quantitative scoring")
                 quant_score = EvaluationResultsManager.gsn_quant_scoring(
-                    db, eval_result_id, quant_results, perspective)
+                    db, eval_result_id, quant_results, perspective, context=context)
                 logger.debug(
                     f"id: {eval_result_id}, quant_score: {quant_score} for perspective: {perspective} (GSN)")
                 
                 # Calculate normalization factor
                 normalization_factor = EvaluationResultsManager.get_gsn_normalization_factor(
-                    db, eval_result_id, qual_results, quant_results, perspective)
+                    db, eval_result_id, qual_results, quant_results, perspective, context=context)
                 logger.debug(
                     f"id: {eval_result_id}, normalization_factor: {normalization_factor} for perspective: {perspective} (GSN)")
                 
                 # Apply normalization to the combined score
                 scores[perspective] = (qual_score + quant_score) * normalization_factor
+                if gsn_breakdown is not None:
+                    gsn_breakdown[perspective] = {
+                        "qual_score": float(qual_score),
+                        "quant_score": float(quant_score),
+                        "normalization_factor": float(normalization_factor),
+                    }
                 continue
 
             quant_score = quant_scores.get(perspective, 0.0)
@@ -1064,14 +1134,14 @@ class EvaluationResultsManager:
         return scores
 
     @staticmethod
-    def convert_quantitative_results_to_scores(quant_results: dict | None) -> dict:
+    def convert_quantitative_results_to_scores(quant_results: dict | None, context: ScoringContext | None = None) -> dict:
         """
         Convert quantitative evaluation results (quant_results) to 10-perspective score dictionary
         Extract accuracy value for each perspective, return 0.0 if not available
+        context: When given, legacy logs parsed here are shared with the GSN scoring
         """
         logger.info(
             "convert_quantitative_results_to_scores: 定量評価結果のスコア変換を開始します。")
-        import json
         scores = {}
         perspectives = [
             "有害情報の出力制御",
@@ -1091,20 +1161,12 @@ class EvaluationResultsManager:
             return {perspective: 0.0 for perspective in perspectives}
 
         for key in perspectives:
-            json_str = quant_results.get(key)
-            if json_str is None:
+            if quant_results.get(key) is None:
                 scores[key] = 0.0
                 continue
             try:
-                import json
-                data = json.loads(json_str)
-                accuracy = (
-                    data.get("results", {})
-                    .get("scores", [{}])[0]
-                    .get("metrics", {})
-                    .get("accuracy", {})
-                    .get("value", 0.0)
-                )
+                accuracy = context.accuracy(key) if context else EvaluationSampleResultManager.get_accuracy(
+                    quant_results, key)
                 logger.debug(
                     f"convert_quantitative_results_to_scores: {key} の精度: {accuracy}")
             except Exception as e:
@@ -0,0 +1,221 @@
+import json
+import zlib
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.db.define_tables import EvaluationLogBlob, EvaluationSampleResult, EvaluationSampleGSN
+from src.utils.logger import logger
+
+LOG_ENCODING_ZLIB_JSON = "zlib-json"
+
+
+def _as_gsn_list(gsn_perspective) -> list[str]:
+    if isinstance(gsn_perspective, list):
+        return [str(g) for g in gsn_perspective if g]
+    if isinstance(gsn_perspective, str) and gsn_perspective:
+        return [gsn_perspective]
+    return []
+
+
+def log_accuracy(eval_log: dict) -> float:
+    return (
+        eval_log.get("results", {})
+        .get("scores", [{}])[0]
+        .get("metrics", {})
+        .get("accuracy", {})
+        .get("value", 0.0)
+    )
+
+
+def _reduced_sample_scores(eval_log: dict) -> dict:
+    """
+    Map sample_id -> reduced score value (same source as the legacy GSN scoring)
+    """
+    sample_scores = {}
+    for reduction in eval_log.get("reductions", []):
+        for sample_data in reduction.get("samples", []):
+            sample_id = sample_data.get("sample_id")
+            if sample_id is not None:
+                sample_scores[sample_id] = sample_data.get("value", 0.0)
+    return sample_scores
+
+
+def gsn_accuracies_from_log(eval_log: dict) -> list[dict]:
+    """
+    Mean sample score per GSN perspective computed from a log (legacy rows)
+    """
+    sample_scores = _reduced_sample_scores(eval_log)
+    perspective_scores = {}
+    for sample in eval_log.get("samples", []):
+        sample_score = sample_scores.get(sample.get("id"), 0.0)
+        for g in _as_gsn_list(sample.get("gsn_perspective")):
+            perspective_scores.setdefault(g, []).append(sample_score)
+    return [{"gsn_perspective": g, "accuracy": sum(scores) / len(scores)}
+            for g, scores in perspective_scores.items() if scores]
+
+
+def gsn_perspectives_from_log(eval_log: dict) -> set[str]:
+    return {g for sample in eval_log.get("samples", [])
+            for g in _as_gsn_list(sample.get("gsn_perspective"))}
+
+
+def is_log_ref(value) -> bool:
+    """
+    True if a quantitative_results value is a reference to EvaluationLogBlob
+    (legacy rows hold the whole log as a JSON string)
+    """
+    return isinstance(value, dict) and "log_blob_id" in value
+
+
+class EvaluationSampleResultManager:
+    """
+    A class that consolidates database operations for per-sample quantitative results and their inspect_ai logs.
+
+    EvaluationResult.quantitative_results holds {perspective: {"log_blob_id", "accuracy", "sample_count"}}.
+    Rows written before this table existed hold {perspective: log JSON string}; every reader accepts both.
+    """
+    @staticmethod
+    def store_results(db: Session, eval_result_id: int, results: dict) -> dict:
+        """
+        Store per-perspective inspect_ai logs as compressed blobs and their samples as rows.
+        Existing rows of the result are replaced. The caller commits.
+        :param results: {perspective: eval log JSON string}
+        :return: quantitative_results references {perspective: {"log_blob_id", "accuracy", "sample_count"}}
+        """
+        logger.info(
+            f"store_results: ID={eval_result_id} のサンプル単位の結果登録を開始します。")
+        EvaluationSampleResultManager.delete_by_result_id(db, eval_result_id)
+
+        refs = {}
+        for perspective, log_json in results.items():
+            if not log_json:
+                continue
+            eval_log = json.loads(log_json)
+            raw = log_json.encode("utf-8")
+            samples = eval_log.get("samples") or []
+            log_blob = EvaluationLogBlob(
+                evaluation_result_id=eval_result_id,
+                perspective=perspective,
+                encoding=LOG_ENCODING_ZLIB_JSON,
+                data=zlib.compress(raw),
+                raw_size=len(raw),
+                accuracy=log_accuracy(eval_log),
+                sample_count=len(samples)
+            )
+            db.add(log_blob)
+            db.flush()
+
+            sample_scores = _reduced_sample_scores(eval_log)
+            for sample_index, sample in enumerate(samples):
+                sample_id = sample.get("id")
+                try:
+                    score = float(sample_scores.get(sample_id, 0.0))
+                except (TypeError, ValueError):
+                    score = 0.0
+                sample_result = EvaluationSampleResult(
+                    evaluation_result_id=eval_result_id,
+                    log_blob_id=log_blob.id,
+                    perspective=perspective,
+                    sample_index=sample_index,
+                    sample_id=str(sample_id),
+                    score=score,
+                    answered=bool(sample.get("output", {}).get("choices"))
+                )
+                sample_result.gsn_links = [
+                    EvaluationSampleGSN(
+                        gsn_perspective=g,
+                        evaluation_result_id=eval_result_id,
+                        perspective=perspective)
+                    for g in dict.fromkeys(_as_gsn_list(sample.get("gsn_perspective")))
+                ]
+                db.add(sample_result)
+
+            refs[perspective] = {
+                "log_blob_id": log_blob.id,
+                "accuracy": log_blob.accuracy,
+                "sample_count": log_blob.sample_count,
+            }
+            logger.info(
+                f"store_results: 観点 {perspective} のログ({len(raw)} bytes -> {len(log_blob.data)} bytes)と{len(samples)}件のサンプルを登録しました。")
+        db.flush()
+        return refs
+
+    @staticmethod
+    def delete_by_result_id(db: Session, eval_result_id: int) -> None:
+        db.query(EvaluationSampleGSN).filter_by(
+            evaluation_result_id=eval_result_id).delete(synchronize_session=False)
+        db.query(EvaluationSampleResult).filter_by(
+            evaluation_result_id=eval_result_id).delete(synchronize_session=False)
+        db.query(EvaluationLogBlob).filter_by(
+            evaluation_result_id=eval_result_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def load_log(db: Session, quant_results: dict | None, perspective: str) -> dict | None:
+        """
+        Get the inspect_ai log (dict) of a perspective from quantitative_results (reference or legacy JSON string)
+        """
+        if not quant_results:
+            return None
+        value = quant_results.get(perspective)
+        if not value:
+            return None
+        if is_log_ref(value):
+            log_blob = db.query(EvaluationLogBlob).filter_by(
+                id=value["log_blob_id"]).first()
+            if log_blob is None:
+                logger.error(
+                    f"load_log: EvaluationLogBlob(ID={value['log_blob_id']}) が見つかりません。")
+                return None
+            return json.loads(zlib.decompress(log_blob.data).decode("utf-8"))
+        return json.loads(value)
+
+    @staticmethod
+    def get_accuracy(quant_results: dict | None, perspective: str) -> float | None:
+        """
+        Accuracy of a perspective (None if the perspective was not evaluated)
+        """
+        if not quant_results:
+            return None
+        value = quant_results.get(perspective)
+        if value is None:
+            return None
+        if is_log_ref(value):
+            return value.get("accuracy") or 0.0
+        return log_accuracy(json.loads(value))
+
+    @staticmethod
+    def get_gsn_accuracies(db: Session, eval_result_id: int, quant_results: dict | None, perspective: str) -> list[dict]:
+        """
+        Mean sample score per GSN perspective of a perspective
+        :return: [{"gsn_perspective": "G2-8", "accuracy": 0.75}, ...]
+        """
+        if not quant_results or perspective not in quant_results:
+            return []
+        if is_log_ref(quant_results[perspective]):
+            rows = db.query(
+                EvaluationSampleGSN.gsn_perspective,
+                func.avg(EvaluationSampleResult.score)
+            ).join(
+                EvaluationSampleResult, EvaluationSampleResult.id == EvaluationSampleGSN.sample_result_id
+            ).filter(
+                EvaluationSampleGSN.evaluation_result_id == eval_result_id,
+                EvaluationSampleGSN.perspective == perspective
+            ).group_by(EvaluationSampleGSN.gsn_perspective).all()
+            return [{"gsn_perspective": g, "accuracy": float(a or 0.0)} for g, a in rows]
+
+        # Legacy row: compute from the log JSON
+        return gsn_accuracies_from_log(json.loads(quant_results[perspective]))
+
+    @staticmethod
+    def get_gsn_perspectives(db: Session, eval_result_id: int, quant_results: dict | None, perspective: str) -> set[str]:
+        """
+        GSN perspectives that appear in the samples of a perspective
+        """
+        if not quant_results or perspective not in quant_results:
+            return set()
+        if is_log_ref(quant_results[perspective]):
+            rows = db.query(EvaluationSampleGSN.gsn_perspective).filter(
+                EvaluationSampleGSN.evaluation_result_id == eval_result_id,
+                EvaluationSampleGSN.perspective == perspective
+            ).distinct().all()
+            return {r.gsn_perspective for r in rows}
+        return gsn_perspectives_from_log(json.loads(quant_results[perspective]))
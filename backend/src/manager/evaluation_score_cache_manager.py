@@ -0,0 +1,88 @@
+import hashlib
+import json
+from datetime import datetime
+from sqlalchemy.orm import Session
+from src.db.define_tables import EvaluationResult, EvaluationScoreCache, Evaluation, DatasetCustomMapping, Dataset, UseGSN
+from src.utils.logger import logger
+
+
+class EvaluationScoreCacheManager:
+    """
+    A class that consolidates database operations for the 10-perspective score cache
+    """
+    @staticmethod
+    def compute_fingerprint(db: Session, eval_result: EvaluationResult) -> str:
+        """
+        Hash of every input of calculate_10perspective_scores:
+        results, custom mapping percentages, GSN usage and score rates of the datasets.
+        Only small columns are read (data_content is never loaded).
+        """
+        evaluation = db.query(Evaluation).filter_by(
+            id=eval_result.evaluation_id).first()
+        mappings = []
+        datasets = []
+        if evaluation is not None:
+            mappings = db.query(
+                DatasetCustomMapping.dataset_id,
+                DatasetCustomMapping.perspective_id,
+                DatasetCustomMapping.percentage
+            ).filter_by(custom_datasets_id=evaluation.custom_datasets_id).order_by(
+                DatasetCustomMapping.dataset_id, DatasetCustomMapping.perspective_id).all()
+            datasets = db.query(
+                Dataset.id, Dataset.name, Dataset.type, Dataset.score_rate
+            ).filter(Dataset.id.in_([m.dataset_id for m in mappings])).order_by(Dataset.id).all()
+        use_gsn = db.query(UseGSN.evaluation_perspective_id).filter_by(
+            evaluation_id=eval_result.evaluation_id).order_by(UseGSN.evaluation_perspective_id).all()
+
+        inputs = {
+            "quantitative_eval_state": eval_result.quantitative_eval_state,
+            "quantitative_results": eval_result.quantitative_results,
+            "qualitative_results": eval_result.qualitative_results,
+            "mappings": [list(m) for m in mappings],
+            "datasets": [list(d) for d in datasets],
+            "use_gsn": [u.evaluation_perspective_id for u in use_gsn],
+        }
+        encoded = json.dumps(inputs, sort_keys=True,
+                             ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get(db: Session, eval_result_id: int, fingerprint: str) -> EvaluationScoreCache | None:
+        """
+        Get the cache entry of the result if it was computed from the same inputs
+        """
+        cache = db.query(EvaluationScoreCache).filter_by(
+            evaluation_result_id=eval_result_id).first()
+        if cache is None or cache.fingerprint != fingerprint:
+            return None
+        return cache
+
+    @staticmethod
+    def put(db: Session, eval_result_id: int, fingerprint: str, scores: dict, gsn_breakdown: dict) -> None:
+        """
+        Save computed scores. Failure to save does not affect the caller.
+        """
+        try:
+            cache = db.query(EvaluationScoreCache).filter_by(
+                evaluation_result_id=eval_result_id).first()
+            if cache is None:
+                cache = EvaluationScoreCache(
+                    evaluation_result_id=eval_result_id)
+                db.add(cache)
+            cache.fingerprint = fingerprint
+            cache.scores = scores
+            cache.gsn_breakdown = gsn_breakdown
+            cache.created_date = datetime.now()
+            db.commit()
+            logger.info(f"put: ID={eval_result_id} のスコアキャッシュを保存しました。")
+        except Exception as e:
+            logger.error(f"put: スコアキャッシュの保存中にエラーが発生しました: {e}")
+            db.rollback()
+
+    @staticmethod
+    def invalidate(db: Session, eval_result_id: int) -> None:
+        """
+        Delete the cache entry of the result (the caller commits)
+        """
+        db.query(EvaluationScoreCache).filter_by(
+            evaluation_result_id=eval_result_id).delete(synchronize_session=False)
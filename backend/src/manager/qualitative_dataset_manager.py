@@ -1,10 +1,21 @@
 from sqlalchemy.orm import Session
 from src.db.define_tables import Dataset, EvaluationPerspective, DatasetCustomMapping, Evaluation
-import pickle
+from src.db.dataset_content import build_content_columns, decode_content
 from src.utils.logger import logger
 from src.constants.perspectives import to_japanese_perspective
 
 
+def to_qualitative_contents(contents: list, second_goal: str = "") -> list[dict]:
+    """
+    Convert question texts to the stored form [{"id": ..., "text": ...}]
+    IDs are "GSN_<n>" for GSN data (data with second_goal), <n> otherwise
+    """
+    for i, content in enumerate(contents):
+        content_id = f"GSN_{i + 1}" if second_goal else i + 1
+        contents[i] = {"id": content_id, "text": content}
+    return contents
+
+
 class QualitativeDatasetService:
     """
     Service class: Aggregates DB operations related to qualitative datasets
@@ -21,12 +32,10 @@ class QualitativeDatasetService:
         # Data with second_goal is GSN data
         second_goal = data.get("second_goal", "")
 
-        contents = data.get("contents", [])
-        for i, content in enumerate(contents):
-            content_id = f"GSN_{i + 1}" if second_goal else i + 1
-            contents[i] = {"id": content_id, "text": content}
+        contents = to_qualitative_contents(
+            data.get("contents", []), second_goal)
 
-        binary_content = pickle.dumps(contents)
+        content_columns = build_content_columns(contents)
         criterion_name = to_japanese_perspective(data.get("criterion"))
         perspective = db.query(EvaluationPerspective).filter_by(
             perspective_name=criterion_name).first()
@@ -39,7 +48,7 @@ class QualitativeDatasetService:
         try:
             dataset = Dataset(
                 name=f"{data.get('name', '')}",
-                data_content=binary_content,
+                **content_columns,
                 evaluation_perspective_id=perspective.id if perspective else None,
                 type="qualitative",
                 score_rate=data.get("score_rate", 1.0),
@@ -61,7 +70,7 @@ class QualitativeDatasetService:
         """
         Extract only those with type "qualitative" from the Dataset table,
         and return id, name, perspective, data_content as a list of dicts.
-        If data_content is binary, decode it with pickle and return.
+        data_content is decoded according to Dataset.content_format.
         :param db: SQLAlchemy Session
         :return: List of dicts
         """
@@ -71,7 +80,8 @@ class QualitativeDatasetService:
             Dataset.id,
             Dataset.name,
             EvaluationPerspective.perspective_name,
-            Dataset.data_content
+            Dataset.data_content,
+            Dataset.content_format
             )
             .join(EvaluationPerspective, Dataset.evaluation_perspective_id == EvaluationPerspective.id, isouter=True)
             .filter(
@@ -83,7 +93,7 @@ class QualitativeDatasetService:
         datasets = []
         for r in results:
             try:
-                contents = pickle.loads(r.data_content)
+                contents = decode_content(r.data_content, r.content_format)
             except Exception as e:
                 logger.error(f"get_all: data_contentのデコードに失敗: {e}")
                 contents = r.data_content
@@ -114,7 +124,8 @@ class QualitativeDatasetService:
             logger.info(f"get_by_id: ID={dataset_id} のデータセットは見つかりませんでした。")
             return None
         try:
-            contents = pickle.loads(dataset.data_content)
+            contents = decode_content(
+                dataset.data_content, dataset.content_format)
         except Exception as e:
             logger.error(f"get_by_id: data_contentのデコードに失敗: {e}")
             contents = dataset.data_content
@@ -161,7 +172,8 @@ class QualitativeDatasetService:
         result = []
         for dataset in datasets:
             try:
-                contents = pickle.loads(dataset.data_content)
+                contents = decode_content(
+                    dataset.data_content, dataset.content_format)
             except Exception as e:
                 logger.error(
                     f"get_by_evaluation_id: data_contentのデコードに失敗: {e}")
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from src.db.define_tables import Dataset, EvaluationPerspective
-import pickle
+from src.db.dataset_content import build_content_columns, decode_content
 import math
 import json
 from src.utils.logger import logger
@@ -36,7 +36,7 @@ class QuantitativeDatasetService:
         logger.info("add_from_json: 定量データセット追加処理を開始します。")
         added_datasets = []
         try:
-            binary_content = pickle.dumps(data.get("contents", []))
+            content_columns = build_content_columns(data.get("contents", []))
             criterion_name = to_japanese_perspective(data.get("criterion"))
             perspective = db.query(EvaluationPerspective).filter_by(
                 perspective_name=criterion_name).first()
@@ -48,7 +48,7 @@ class QuantitativeDatasetService:
                 )
             dataset = Dataset(
                 name=f"{data.get('name', '')}",
-                data_content=binary_content,
+                **content_columns,
                 evaluation_perspective_id=perspective.id if perspective else None,
                 type="quantitative",
                 score_rate=data.get("score_rate", 1.0),
@@ -72,7 +72,7 @@ class QuantitativeDatasetService:
         """
         Extract only those with type "quantitative" from the Dataset table,
         and return id, name, perspective, data_content as a list of dicts.
-        If data_content is binary, decode it with pickle and return.
+        data_content is decoded according to Dataset.content_format.
         :param db: SQLAlchemy Session
         :return: List of dicts
         """
@@ -82,7 +82,8 @@ class QuantitativeDatasetService:
                 Dataset.id,
                 Dataset.name,
                 EvaluationPerspective.perspective_name,
-                Dataset.data_content
+                Dataset.data_content,
+                Dataset.content_format
             )
             .join(EvaluationPerspective, Dataset.evaluation_perspective_id == EvaluationPerspective.id, isouter=True)
             .filter(
@@ -94,7 +95,7 @@ class QuantitativeDatasetService:
         datasets = []
         for r in results:
             try:
-                contents = pickle.loads(r.data_content)
+                contents = decode_content(r.data_content, r.content_format)
                 # Convert NaN values to JSON-compatible values
                 contents = _convert_nan_to_json_compatible(contents)
             except Exception as e:
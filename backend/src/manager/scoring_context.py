@@ -0,0 +1,134 @@
+import json
+import time
+from contextvars import ContextVar
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from src.db.define_tables import EvaluationResult, Dataset
+from src.manager.evaluation_sample_result_manager import (
+    EvaluationSampleResultManager, is_log_ref, log_accuracy, gsn_accuracies_from_log
+)
+from src.utils.logger import logger
+
+# ScoringContext open in the current thread / task (statements are counted into it)
+_current_context: ContextVar["ScoringContext | None"] = ContextVar("scoring_context", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    # NOTE: Registered once for all engines; a request only counts its own statements
+    scoring_context = _current_context.get()
+    if scoring_context is not None:
+        scoring_context.db_queries += 1
+
+
+class ScoringContext:
+    """
+    Data shared by the scoring helpers of one calculate_10perspective_scores call.
+    Datasets, score rates, parsed logs and GSN aggregates are loaded once and reused by
+    gsn_qual_scoring / gsn_quant_scoring / get_gsn_normalization_factor.
+
+    Also counts the DB round-trips issued through the session and the time spent parsing logs
+    while the context is open (use as a context manager).
+    """
+
+    def __init__(self, db: Session, eval_result: EvaluationResult):
+        self.db = db
+        self.eval_result_id = eval_result.id
+        self.eval_result = eval_result
+        self.quant_results = eval_result.quantitative_results
+        self.qual_results = eval_result.qualitative_results
+        self._datasets = None
+        self._datasets_name_type_df = None
+        self._logs = {}
+        self._gsn_accuracies = {}
+        # instrumentation
+        self.db_queries = 0
+        self.parse_count = 0
+        self.parse_seconds = 0.0
+        self._started = None
+        self._token = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        self._token = _current_context.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_context.reset(self._token)
+        self._token = None
+        logger.info(f"ScoringContext: eval_result_id={self.eval_result_id} {self.stats()}")
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "db_queries": self.db_queries,
+            "parse_count": self.parse_count,
+            "parse_seconds": round(self.parse_seconds, 6),
+            "elapsed_seconds": round(time.perf_counter() - self._started, 6) if self._started else None,
+        }
+
+    @property
+    def datasets(self) -> list[Dataset]:
+        """
+        Datasets used by the evaluation (loaded once, without data_content)
+        """
+        if self._datasets is None:
+            from src.manager.evaluation_results_manager import EvaluationResultsManager
+            self._datasets = EvaluationResultsManager.get_datasets_by_evaluation_result_id(
+                self.db, self.eval_result_id)
+        return self._datasets
+
+    @property
+    def dataset_name_to_score_rate(self) -> dict:
+        return {d.name: d.score_rate for d in self.datasets}
+
+    @property
+    def datasets_name_type_df(self) -> pd.DataFrame:
+        if self._datasets_name_type_df is None:
+            df = pd.DataFrame([[d.name, d.type] for d in self.datasets],
+                              columns=["name", "type"])
+            self._datasets_name_type_df = df.drop_duplicates(subset='name')
+        return self._datasets_name_type_df
+
+    def _parse_legacy_log(self, perspective: str) -> dict:
+        if perspective not in self._logs:
+            start = time.perf_counter()
+            self._logs[perspective] = json.loads(self.quant_results[perspective])
+            self.parse_seconds += time.perf_counter() - start
+            self.parse_count += 1
+        return self._logs[perspective]
+
+    def accuracy(self, perspective: str) -> float | None:
+        """
+        Accuracy of a perspective (None if the perspective was not evaluated)
+        """
+        if not self.quant_results or self.quant_results.get(perspective) is None:
+            return None
+        value = self.quant_results[perspective]
+        if is_log_ref(value):
+            return value.get("accuracy") or 0.0
+        return log_accuracy(self._parse_legacy_log(perspective))
+
+    def gsn_accuracies(self, perspective: str) -> list[dict]:
+        """
+        Mean sample score per GSN perspective: [{"gsn_perspective": "G2-8", "accuracy": 0.75}, ...]
+        """
+        if perspective not in self._gsn_accuracies:
+            if not self.quant_results or perspective not in self.quant_results:
+                result = []
+            elif is_log_ref(self.quant_results[perspective]):
+                result = EvaluationSampleResultManager.get_gsn_accuracies(
+                    self.db, self.eval_result_id, self.quant_results, perspective)
+            else:
+                result = gsn_accuracies_from_log(
+                    self._parse_legacy_log(perspective))
+            self._gsn_accuracies[perspective] = result
+        return self._gsn_accuracies[perspective]
+
+    def gsn_perspectives(self, perspective: str) -> set[str]:
+        """
+        GSN perspectives that appear in the samples of a perspective
+        """
+        return {a["gsn_perspective"] for a in self.gsn_accuracies(perspective)}
@@ -0,0 +1,120 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from src.constants.config import SCORING_JOB_TTL
+from src.utils.logger import logger
+
+# NOTE: inspect_ai does not allow concurrent eval() calls in one process, so scoring jobs run one at a time
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring-job")
+
+
+class ScoringJob:
+    """
+    A /scoring-dataset run executed in the background.
+    Events (paraphrases, result, done, error) are appended as the run progresses and can be read from any offset.
+    """
+
+    def __init__(self, data: dict, model_id: int):
+        self.id = uuid.uuid4().hex
+        self.data = data
+        self.model_id = model_id
+        self.status = "queued"  # "queued", "running", "done", "failed"
+        self.events: list[dict] = []
+        self.result: dict | None = None
+        self.error: str | None = None
+        self.created = time.time()
+        self.finished: float | None = None
+        self.future: Future | None = None
+        self._lock = threading.Lock()
+
+    def add_event(self, event: str, data: dict):
+        with self._lock:
+            self.events.append({"event": event, "data": data})
+
+    def events_since(self, offset: int) -> list[dict]:
+        with self._lock:
+            return self.events[offset:]
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            results = [e["data"] for e in self.events if e["event"] == "result"]
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "results": results,
+            "total_correct": self.result["total_correct"] if self.result else sum(
+                1 for r in results if r["is_correct"] == "C"),
+            "error": self.error,
+        }
+
+
+class ScoringJobManager:
+    """
+    In-process registry of the /scoring-dataset jobs of the API server
+    """
+    _jobs: dict[str, ScoringJob] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def submit(data: dict, model_id: int) -> ScoringJob:
+        """
+        Start a scoring job in the background
+        :param data: dict (question, expected_answer)
+        :param model_id: ID of the AIModel
+        :return: ScoringJob
+        """
+        ScoringJobManager._prune()
+        job = ScoringJob(data, model_id)
+        with ScoringJobManager._lock:
+            ScoringJobManager._jobs[job.id] = job
+        job.future = _executor.submit(ScoringJobManager._run, job)
+        logger.info(f"submit: スコアリングジョブ(ID={job.id}) を登録しました。")
+        return job
+
+    @staticmethod
+    def get(job_id: str) -> ScoringJob | None:
+        with ScoringJobManager._lock:
+            return ScoringJobManager._jobs.get(job_id)
+
+    @staticmethod
+    def _run(job: ScoringJob):
+        from src.db.session import SessionLocal
+        from src.manager.scoring_dataset_manager import ScoringDatasetManager
+        logger.info(f"_run: スコアリングジョブ(ID={job.id}) を開始します。")
+        job.status = "running"
+        db = SessionLocal()
+        try:
+            job.result = ScoringDatasetManager.scoring_results(
+                db, job.data, job.model_id,
+                on_paraphrases=lambda paraphrases: job.add_event(
+                    "paraphrases", {"paraphrases": paraphrases}),
+                on_result=lambda result: job.add_event("result", result),
+                raise_errors=True)
+            # NOTE: Event before status, so that a reader that sees the job done has all its events
+            job.add_event("done", job.result)
+            job.status = "done"
+            logger.info(f"_run: スコアリングジョブ(ID={job.id}) が完了しました。")
+        except Exception as e:
+            logger.error(f"_run: スコアリングジョブ(ID={job.id}) でエラーが発生しました: {e}")
+            job.error = str(e)
+            job.add_event("error", {"detail": job.error})
+            job.status = "failed"
+        finally:
+            job.finished = time.time()
+            db.close()
+
+    @staticmethod
+    def _prune():
+        """
+        Forget jobs that finished more than SCORING_JOB_TTL seconds ago
+        """
+        now = time.time()
+        with ScoringJobManager._lock:
+            for job_id in [job_id for job_id, job in ScoringJobManager._jobs.items()
+                           if job.finished is not None and now - job.finished > SCORING_JOB_TTL]:
+                del ScoringJobManager._jobs[job_id]
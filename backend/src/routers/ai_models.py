@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, Request, HTTPException
 from sqlalchemy.orm import Session
 from src.db.session import get_db
 from src.manager.ai_model_manager import AIModelManager
+from src.manager.evaluation_job_manager import EvaluationJobManager
+from src.inspect.rate_limiter import rate_limiter_registry
 from src.utils.logger import logger
 
 router = APIRouter()
@@ -13,13 +15,29 @@ def list_ai_models(db: Session = Depends(get_db)):
         models = AIModelManager.get_all_models(db)
         logger.info(f"list_ai_models: {len(models)}件のAIモデルを取得しました。")
         return {"ai_models": [
-            {"id": m.id, "name": m.name, "model_name": m.model_name, "url": m.url, "apiKey": m.api_key, "promptFormat": m.api_request_format, "type": m.type}
+            {"id": m.id, "name": m.name, "model_name": m.model_name, "url": m.url, "apiKey": m.api_key, "promptFormat": m.api_request_format, "type": m.type, "rpm_limit": m.rpm_limit, "tpm_limit": m.tpm_limit, "max_concurrency": m.max_concurrency}
             for m in models
         ]}
     except Exception as e:
         logger.error(f"list_ai_models: 取得処理中にエラーが発生しました: {e}")
         raise HTTPException(status_code=500, detail="AIモデル一覧の取得中にエラーが発生しました。")
 
+@router.get("/ai_models/rate_limits")
+def get_rate_limits(db: Session = Depends(get_db)):
+    """
+    Current limits, concurrency and queue depth of the model endpoints
+    (limiters of the API process and of the workers running evaluation jobs)
+    """
+    logger.info("get_rate_limits: レート制限の状態取得を開始します。")
+    try:
+        return {
+            "api": rate_limiter_registry.snapshot(),
+            "workers": EvaluationJobManager.get_running_rate_limits(db),
+        }
+    except Exception as e:
+        logger.error(f"get_rate_limits: 取得処理中にエラーが発生しました: {e}")
+        raise HTTPException(status_code=500, detail="レート制限の状態取得中にエラーが発生しました。")
+
 @router.get("/ai_models/{model_id}")
 def get_ai_model(model_id: int, db: Session = Depends(get_db)):
     logger.info(f"get_ai_model: ID={model_id} のAIモデル取得処理を開始します。")
@@ -29,7 +47,7 @@ def get_ai_model(model_id: int, db: Session = Depends(get_db)):
             logger.info(f"get_ai_model: ID={model_id} のAIモデルは見つかりませんでした。")
             raise HTTPException(status_code=404, detail="AIModel not found")
         logger.info(f"get_ai_model: AIモデル {model.name} を取得しました。")
-        return {"ai_model": {"id": model.id, "name": model.name, "model_name": model.model_name, "url": model.url, "apiKey": model.api_key, "promptFormat": model.api_request_format, "type": model.type}}
+        return {"ai_model": {"id": model.id, "name": model.name, "model_name": model.model_name, "url": model.url, "apiKey": model.api_key, "promptFormat": model.api_request_format, "type": model.type, "rpm_limit": model.rpm_limit, "tpm_limit": model.tpm_limit, "max_concurrency": model.max_concurrency}}
     except HTTPException:
         raise
     except Exception as e:
@@ -47,7 +65,7 @@ async def create_ai_model(request: Request, db: Session = Depends(get_db)):
     try:
         model = AIModelManager.add_model(db, body)
         logger.info(f"create_ai_model: AIモデル {model.name} の追加が完了しました。")
-        return {"ai_model": {"id": model.id, "name": model.name, "model_name": model.model_name, "url": model.url, "apiKey": model.api_key, "promptFormat": model.api_request_format, "type": model.type}}
+        return {"ai_model": {"id": model.id, "name": model.name, "model_name": model.model_name, "url": model.url, "apiKey": model.api_key, "promptFormat": model.api_request_format, "type": model.type, "rpm_limit": model.rpm_limit, "tpm_limit": model.tpm_limit, "max_concurrency": model.max_concurrency}}
     except ValueError as e:
         logger.error(f"create_ai_model: バリデーションエラー: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -69,9 +87,12 @@ async def update_ai_model(model_id: int, request: Request, db: Session = Depends
             logger.info(f"update_ai_model: ID={model_id} のAIモデルは見つかりませんでした。")
             raise HTTPException(status_code=404, detail="AIModel not found")
         logger.info(f"update_ai_model: AIモデル {model.name} の更新が完了しました。")
-        return {"ai_model": {"id": model.id, "name": model.name, "model_name": model.model_name, "url": model.url, "apiKey": model.api_key, "promptFormat": model.api_request_format, "type": model.type}}
+        return {"ai_model": {"id": model.id, "name": model.name, "model_name": model.model_name, "url": model.url, "apiKey": model.api_key, "promptFormat": model.api_request_format, "type": model.type, "rpm_limit": model.rpm_limit, "tpm_limit": model.tpm_limit, "max_concurrency": model.max_concurrency}}
     except HTTPException:
         raise
+    except ValueError as e:
+        logger.error(f"update_ai_model: バリデーションエラー: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"update_ai_model: 更新処理中にエラーが発生しました: {e}")
         raise HTTPException(status_code=500, detail="AIモデルの更新中にエラーが発生しました。")
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Body
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Body, Query
 from sqlalchemy.orm import Session
-from src.db.session import get_db
+from src.db.session import get_db, get_async_db
 from src.manager.qualitative_dataset_manager import QualitativeDatasetService
 from src.manager.quantitative_dataset_manager import QuantitativeDatasetService
 from src.manager.custom_datasets_manager import CustomDatasetsManager
@@ -13,13 +13,17 @@ router = APIRouter()
 
 
 @router.get("/datasets")
-def list_datasets(db: Session = Depends(get_db)):
+async def list_datasets(summary: bool = False, db=Depends(get_async_db)):
+    """
+    List datasets (excluding GSN datasets) without reading their contents.
+    summary=true also returns type, perspective, row_count, column_names, byte_size and content_hash.
+    """
     logger.info("list_datasets: データセット一覧取得処理を開始します。")
     try:
-        qualitative = QualitativeDatasetService.get_all(db)
-        quantitative = QuantitativeDatasetService.get_all(db)
-        result = [
-            {"id": d["id"], "name": d["name"]} for d in qualitative + quantitative
+        summaries = await db.run_sync(DatasetManager.get_summaries, "qualitative") + \
+            await db.run_sync(DatasetManager.get_summaries, "quantitative")
+        result = summaries if summary else [
+            {"id": d["id"], "name": d["name"]} for d in summaries
         ]
         logger.info(f"list_datasets: {len(result)}件のデータセットを取得しました。")
         return {"datasets": result}
@@ -122,3 +126,29 @@ def get_datasets_by_ids(
     except Exception as e:
         logger.error(f"get_datasets_by_ids: 取得処理中にエラーが発生しました: {e}")
         raise HTTPException(status_code=500, detail="データセット取得中にエラーが発生しました。")
+
+
+@router.get("/datasets/{dataset_id}/contents")
+def get_dataset_contents(
+    dataset_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    API to retrieve the rows of a dataset page by page
+    Response example: {"id": 1, "name": "...", "total": 250, "offset": 0, "limit": 100, "contents": [...]}
+    """
+    logger.info(f"get_dataset_contents: ID={dataset_id} のデータセット内容取得処理を開始します。")
+    try:
+        page = DatasetManager.get_contents_page(db, dataset_id, offset, limit)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Dataset not found")
+        logger.info(
+            f"get_dataset_contents: {len(page['contents'])}/{page['total']}件の行を取得しました。")
+        return page
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"get_dataset_contents: 取得処理中にエラーが発生しました: {e}")
+        raise HTTPException(status_code=500, detail="データセット内容の取得中にエラーが発生しました。")
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from src.db.session import get_pool_stats
 
 router = APIRouter()
 
@@ -6,3 +7,11 @@ router = APIRouter()
 async def hello():
     print("/hello endpoint accessed")
     return {"message": "hello"}
+
+
+@router.get("/db/pool_stats")
+def db_pool_stats():
+    """
+    Connection pool metrics of the API process (size, checked_out, overflow, checkouts, held time)
+    """
+    return get_pool_stats()
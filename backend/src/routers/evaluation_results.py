@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from src.db.define_tables import EvaluationResult
-from src.manager.evaluation_results_manager import EvaluationResultsManager
-from src.db.session import get_db
+from src.manager.evaluation_results_manager import EvaluationResultsManager, EVALUATION_RESULT_FIELDS
+from src.manager.evaluation_job_manager import EvaluationJobManager
+from src.db.session import get_db, get_async_db, SessionLocal
 from pydantic import BaseModel
 from typing import List, Optional, Any
-from datetime import date
+from datetime import date, datetime
+import json
 from src.utils.logger import logger
 
 router = APIRouter()
@@ -62,17 +65,19 @@ class QuantitativeRequest(BaseModel):
     evaluation_id: int
     target_ai_model_id: int
     evaluator_ai_model_id: int
+    max_concurrency: Optional[int] = None
+    use_cache: Optional[bool] = None
 
 
 @router.get("/evaluation_results/", response_model=List[EvaluationResultResponse])
-def get_all_evaluation_results(db: Session = Depends(get_db)):
+async def get_all_evaluation_results(db=Depends(get_async_db)):
     """
     Get all evaluation results
     """
     logger.info("get_all_evaluation_results: 全ての評価結果取得処理を開始します。")
     try:
-        evaluation_results = EvaluationResultsManager.get_all_evaluation_results(
-            db)
+        evaluation_results = await db.run_sync(
+            EvaluationResultsManager.get_all_evaluation_results)
         if not evaluation_results:
             logger.info("get_all_evaluation_results: 評価結果が見つかりませんでした。")
             raise HTTPException(
@@ -89,6 +94,85 @@ def get_all_evaluation_results(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="評価結果一覧の取得中にエラーが発生しました。")
 
 
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse comma separated field names (e.g. "id,name,quantitative_eval_state")
+    """
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def _format_result_row(row: dict) -> dict:
+    if isinstance(row.get("created_date"), datetime):
+        row["created_date"] = row["created_date"].strftime("%Y-%m-%d %H:%M:%S")
+    return row
+
+
+@router.get("/evaluation_results/page", response_model=dict)
+async def get_evaluation_results_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[int] = None,
+    fields: Optional[str] = None,
+    db=Depends(get_async_db)
+):
+    """
+    Cursor-based pagination of evaluation results
+    fields: comma separated subset of EVALUATION_RESULT_FIELDS (default: header columns only, without result JSON)
+    Response example: {"items": [...], "next_cursor": 120}
+    """
+    logger.info(
+        f"get_evaluation_results_page: 評価結果のページ取得処理を開始します。(cursor={cursor}, limit={limit})")
+    try:
+        rows, next_cursor = await db.run_sync(
+            EvaluationResultsManager.get_evaluation_results_page,
+            limit=limit, cursor=cursor, fields=_parse_fields(fields))
+        logger.info(
+            f"get_evaluation_results_page: {len(rows)}件の評価結果を取得しました。")
+        return {"items": [_format_result_row(r) for r in rows], "next_cursor": next_cursor}
+    except ValueError as e:
+        logger.error(f"get_evaluation_results_page: 不正なパラメータです: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"get_evaluation_results_page: 取得処理中にエラーが発生しました: {e}")
+        raise HTTPException(status_code=500, detail="評価結果一覧の取得中にエラーが発生しました。")
+
+
+@router.get("/evaluation_results/export")
+def export_evaluation_results(fields: Optional[str] = None, batch_size: int = Query(20, ge=1, le=500)):
+    """
+    Stream evaluation results as NDJSON (one result per line)
+    fields: comma separated subset of EVALUATION_RESULT_FIELDS (default: all fields)
+    """
+    logger.info("export_evaluation_results: 評価結果のエクスポート処理を開始します。")
+    selected = _parse_fields(fields) or EVALUATION_RESULT_FIELDS
+    unknown = [f for f in selected if f not in EVALUATION_RESULT_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {unknown}")
+
+    def generate():
+        # NOTE: The request scoped session is closed before the body is streamed, so use a dedicated session
+        db = SessionLocal()
+        try:
+            cursor = None
+            while True:
+                rows, cursor = EvaluationResultsManager.get_evaluation_results_page(
+                    db, limit=batch_size, cursor=cursor, fields=selected)
+                for row in rows:
+                    yield json.dumps(_format_result_row(row), ensure_ascii=False, default=str) + "\n"
+                if cursor is None:
+                    break
+            logger.info("export_evaluation_results: エクスポートが完了しました。")
+        except Exception as e:
+            logger.error(f"export_evaluation_results: エクスポート中にエラーが発生しました: {e}")
+            raise
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson",
+                             headers={"Content-Disposition": "attachment; filename=evaluation_results.ndjson"})
+
+
 @router.post("/evaluation_result/", response_model=int)
 def create_evaluation_result(request: EvaluationResultCreateRequest, db: Session = Depends(get_db)):
     """
@@ -131,6 +215,11 @@ def exec_quantitative_evaluation(
         evaluation_id: int
         target_ai_model_id: int
         evaluator_ai_model_id: int
+    optional:
+        max_concurrency: int (maximum number of inspect_ai tasks run in parallel)
+        use_cache: bool (false re-queries the models instead of reusing cached responses)
+    return:
+        id of the queued EvaluationJob
     """
     logger.info(
         f"exec_quantitative_evaluation: ID={eval_result_id} の定量評価処理を開始します。")
@@ -147,13 +236,20 @@ def exec_quantitative_evaluation(
             raise HTTPException(
                 status_code=404, detail="No datasets found for the evaluation")
 
-        # NOTE: Execute quantitative evaluation in background and return result_id when complete
-        result_id = EvaluationResultsManager.register_quantitative_result(
-            db, eval_result_id, dataset_ids, request.target_ai_model_id, request.evaluator_ai_model_id, use_gsn)
+        # NOTE: The evaluation itself runs in the evaluation worker (src/worker/evaluation_worker.py).
+        # Return the job id immediately; progress is available from /job and /status.
+        job = EvaluationJobManager.enqueue(db, eval_result_id, {
+            "evaluation_id": request.evaluation_id,
+            "dataset_ids": dataset_ids,
+            "target_ai_model_id": request.target_ai_model_id,
+            "evaluator_ai_model_id": request.evaluator_ai_model_id,
+            "max_concurrency": request.max_concurrency,
+            "use_cache": request.use_cache,
+        })
 
         logger.info(
-            f"exec_quantitative_evaluation: 定量評価(ID={result_id}) の登録が完了しました。")
-        return result_id
+            f"exec_quantitative_evaluation: 定量評価ジョブ(ID={job.id}) の登録が完了しました。")
+        return job.id
     except ValueError:
         logger.error(
             "exec_quantitative_evaluation: 評価用データセットまたはモデルが見つかりませんでした。")
@@ -164,6 +260,23 @@ def exec_quantitative_evaluation(
         raise HTTPException(status_code=500, detail="定量評価の登録中にエラーが発生しました。")
 
 
+@router.get("/evaluation_results/{eval_result_id}/job", response_model=dict)
+def get_eval_job(eval_result_id: int, db: Session = Depends(get_db)):
+    """
+    Return the latest quantitative evaluation job (status, progress, heartbeat) of the result
+    """
+    logger.info(f"get_eval_job: ID={eval_result_id} のジョブ取得処理を開始します。")
+    try:
+        job = EvaluationJobManager.get_latest_by_result_id(db, eval_result_id)
+    except Exception as e:
+        logger.error(f"get_eval_job: ジョブ取得処理中にエラーが発生しました: {e}")
+        raise HTTPException(status_code=500, detail="ジョブ取得中にエラーが発生しました。")
+    if job is None:
+        logger.info("get_eval_job: ジョブが見つかりません。")
+        raise HTTPException(status_code=404, detail="EvaluationJob not found")
+    return EvaluationJobManager.to_dict(job)
+
+
 @router.post("/evaluation_results/{eval_result_id}/qualitative_result", response_model=int)
 def register_qualitative_result(eval_result_id: int, qualitative_result: QualitativeResultRequest, db: Session = Depends(get_db)):
     logger.info(
@@ -224,6 +337,27 @@ def get_10perspective_scores(eval_result_id: int, db: Session = Depends(get_db))
         raise HTTPException(status_code=500, detail="10観点スコアの取得中にエラーが発生しました。")
 
 
+@router.get("/evaluation_results/{eval_result_id}/10perspective_scores/breakdown", response_model=dict)
+def get_10perspective_scores_breakdown(eval_result_id: int, db: Session = Depends(get_db)):
+    """
+    Get 10-perspective scores and the GSN breakdown (qual_score, quant_score, normalization_factor per GSN perspective)
+    """
+    logger.info(
+        f"get_10perspective_scores_breakdown: ID={eval_result_id} の10観点スコア内訳取得処理を開始します。")
+    try:
+        scores, gsn_breakdown = EvaluationResultsManager.get_10perspective_scores_with_breakdown(
+            db, eval_result_id)
+        logger.info("get_10perspective_scores_breakdown: 10観点スコア内訳の取得が完了しました。")
+        return {"scores": scores, "gsn_breakdown": gsn_breakdown}
+    except ValueError:
+        logger.error("get_10perspective_scores_breakdown: EvaluationResultが見つかりません。")
+        raise HTTPException(
+            status_code=404, detail="EvaluationResult not found")
+    except Exception as e:
+        logger.error(f"get_10perspective_scores_breakdown: 取得処理中にエラーが発生しました: {e}")
+        raise HTTPException(status_code=500, detail="10観点スコアの取得中にエラーが発生しました。")
+
+
 @router.get("/evaluation_results/{eval_result_id}/detail", response_model=Any)
 def get_evaluation_result_detail(eval_result_id: int, db: Session = Depends(get_db)):
     """
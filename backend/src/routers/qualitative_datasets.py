@@ -2,15 +2,23 @@ from fastapi import APIRouter, Depends, Request, HTTPException
 from sqlalchemy.orm import Session
 from src.db.session import get_db
 from src.manager.qualitative_dataset_manager import QualitativeDatasetService
+from src.manager.dataset_manager import DatasetManager
 from src.utils.logger import logger
 
 router = APIRouter()
 
 
 @router.get("/qualitative_datasets")
-def list_qualitative_datasets(db: Session = Depends(get_db)):
+def list_qualitative_datasets(summary: bool = False, db: Session = Depends(get_db)):
+    """
+    summary=true returns metadata only (contents can be fetched from /datasets/{id}/contents)
+    """
     logger.info("list_qualitative_datasets: 定性データセット一覧取得処理を開始します。")
     try:
+        if summary:
+            datasets = DatasetManager.get_summaries(db, "qualitative")
+            logger.info(f"list_qualitative_datasets: {len(datasets)}件の定性データセット概要を取得しました。")
+            return {"qualitative_datasets": datasets}
         datasets = QualitativeDatasetService.get_all(db)
         logger.info(f"list_qualitative_datasets: {len(datasets)}件の定性データセットを取得しました。")
         return {"qualitative_datasets": datasets}
@@ -2,15 +2,23 @@ from fastapi import APIRouter, Depends, Request, HTTPException
 from sqlalchemy.orm import Session
 from src.db.session import get_db
 from src.manager.quantitative_dataset_manager import QuantitativeDatasetService
+from src.manager.dataset_manager import DatasetManager
 from src.utils.logger import logger
 import pandas as pd
 
 router = APIRouter()
 
 @router.get("/quantitative_datasets")
-def list_quantitative_datasets(db: Session = Depends(get_db)):
+def list_quantitative_datasets(summary: bool = False, db: Session = Depends(get_db)):
+    """
+    summary=true returns metadata only (contents can be fetched from /datasets/{id}/contents)
+    """
     logger.info("list_quantitative_datasets: 定量データセット一覧取得処理を開始します。")
     try:
+        if summary:
+            datasets = DatasetManager.get_summaries(db, "quantitative")
+            logger.info(f"list_quantitative_datasets: {len(datasets)}件の定量データセット概要を取得しました。")
+            return {"quantitative_datasets": datasets}
         datasets = QuantitativeDatasetService.get_all(db)
         logger.info(f"list_quantitative_datasets: {len(datasets)}件の定量データセットを取得しました。")
         # Loop through datasets and if contents is df, erase the row with NaN
@@ -1,6 +1,11 @@
+import asyncio
+import json
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from src.manager.ai_model_manager import AIModelManager
 from src.manager.scoring_dataset_manager import ScoringDatasetManager
+from src.manager.scoring_job_manager import ScoringJobManager
 from src.db.session import get_db
 from typing import List, Dict
 from pydantic import BaseModel
@@ -8,11 +13,24 @@ from src.utils.logger import logger
 
 router = APIRouter()
 
+# Seconds between checks for new events / keep-alive comments of the event stream
+EVENT_POLL_INTERVAL = 0.2
+KEEPALIVE_INTERVAL = 15
+
 class ScoringRequest(BaseModel):
     question: str
     expected_answer: str
     model_id: int
 
+
+def _submit(request: ScoringRequest):
+    data = {
+        "question": request.question,
+        "expected_answer": request.expected_answer
+    }
+    return ScoringJobManager.submit(data, request.model_id)
+
+
 @router.post("/scoring-dataset")
 def scoring_dataset(request: ScoringRequest, db: Session = Depends(get_db)):
     logger.info("scoring_dataset: スコアリングリクエストの処理を開始します。")
@@ -28,3 +46,66 @@ def scoring_dataset(request: ScoringRequest, db: Session = Depends(get_db)):
     except Exception as e:
         logger.error(f"scoring_dataset: スコアリング処理中にエラーが発生しました: {e}")
         raise HTTPException(status_code=500, detail="スコアリング処理中にエラーが発生しました")
+
+
+@router.post("/scoring-dataset/jobs")
+def create_scoring_job(request: ScoringRequest, db: Session = Depends(get_db)):
+    """
+    Start scoring in the background. Progress: GET /scoring-dataset/jobs/{job_id}/events (Server-Sent Events)
+    """
+    logger.info("create_scoring_job: スコアリングジョブの登録を開始します。")
+    if AIModelManager.get_model_by_id(db, request.model_id) is None:
+        raise HTTPException(status_code=404, detail="AIModel not found")
+    try:
+        job = _submit(request)
+        return {"job_id": job.id, "status": job.status}
+    except Exception as e:
+        logger.error(f"create_scoring_job: 登録処理中にエラーが発生しました: {e}")
+        raise HTTPException(status_code=500, detail="スコアリングジョブの登録中にエラーが発生しました")
+
+
+@router.get("/scoring-dataset/jobs/{job_id}")
+def get_scoring_job(job_id: str):
+    """
+    Status and the verdicts graded so far
+    """
+    job = ScoringJobManager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scoring job not found")
+    return job.to_dict()
+
+
+@router.get("/scoring-dataset/jobs/{job_id}/events")
+async def stream_scoring_job(job_id: str):
+    """
+    Server-Sent Events of a scoring job:
+    paraphrases ({"paraphrases": [...]}), result ({"id", "paraphrase", "is_correct"}) per graded paraphrase,
+    then done ({"results", "total_correct"}) or error ({"detail"}).
+    All events are replayed from the start, so the stream can be opened at any time.
+    """
+    job = ScoringJobManager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scoring job not found")
+
+    async def event_stream():
+        offset = 0
+        idle = 0.0
+        while True:
+            # NOTE: Check completion before reading so that the final events are always sent
+            finished = job.done
+            events = job.events_since(offset)
+            offset += len(events)
+            for event in events:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+            if finished:
+                break
+            if events:
+                idle = 0.0
+            elif idle >= KEEPALIVE_INTERVAL:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+            idle += EVENT_POLL_INTERVAL
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,141 @@
+"""
+Worker processes for quantitative evaluation jobs.
+Each process pulls jobs from the evaluation_job table (SELECT ... FOR UPDATE SKIP LOCKED)
+and runs EvaluationResultsManager.register_quantitative_result outside of the API server.
+
+Usage:
+    PYTHONPATH=/app python src/worker/evaluation_worker.py
+"""
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from src.constants.config import EVAL_WORKER_PROCESSES, EVAL_WORKER_POLL_INTERVAL, EVAL_JOB_HEARTBEAT_INTERVAL
+from src.utils.logger import logger
+
+
+class JobHeartbeat:
+    """
+    Background thread that periodically writes heartbeat, progress and the rate limiter state of a running job.
+    It uses its own DB session because the job session is busy during the evaluation.
+    """
+
+    def __init__(self, job_id: int, interval: float = EVAL_JOB_HEARTBEAT_INTERVAL):
+        self.job_id = job_id
+        self.interval = interval
+        self._progress = None
+        self._message = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+
+    def update(self, progress: float, message: str):
+        """
+        progress_callback for register_quantitative_result
+        """
+        with self._lock:
+            self._progress = progress
+            self._message = message
+        self._wake.set()
+
+    def _run(self):
+        from src.db.session import SessionLocal
+        from src.manager.evaluation_job_manager import EvaluationJobManager
+        from src.inspect.rate_limiter import rate_limiter_registry
+        db = SessionLocal()
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    progress, message = self._progress, self._message
+                EvaluationJobManager.heartbeat(
+                    db, self.job_id, progress=progress, message=message,
+                    rate_limits=rate_limiter_registry.snapshot())
+                self._wake.wait(self.interval)
+                self._wake.clear()
+        finally:
+            db.close()
+
+
+def run_job(db, job) -> None:
+    """
+    Execute a claimed job and record the outcome
+    """
+    from src.manager.evaluation_results_manager import EvaluationResultsManager
+    from src.manager.evaluation_job_manager import EvaluationJobManager
+
+    logger.info(f"run_job: ジョブ(ID={job.id}) の実行を開始します。")
+    payload = job.payload or {}
+    heartbeat = JobHeartbeat(job.id)
+    heartbeat.start()
+    try:
+        use_gsn = EvaluationResultsManager.get_gsn_by_evaluation_id(
+            db, payload.get("evaluation_id"))
+        EvaluationResultsManager.register_quantitative_result(
+            db, job.evaluation_result_id, payload.get("dataset_ids", []),
+            payload.get("target_ai_model_id"), payload.get("evaluator_ai_model_id"), use_gsn,
+            max_concurrency=payload.get("max_concurrency"),
+            use_cache=payload.get("use_cache"),
+            progress_callback=heartbeat.update)
+        heartbeat.stop()
+        EvaluationJobManager.complete(db, job.id)
+        logger.info(f"run_job: ジョブ(ID={job.id}) が完了しました。")
+    except Exception as e:
+        heartbeat.stop()
+        logger.exception(f"run_job: ジョブ(ID={job.id}) の実行中にエラーが発生しました: {e}")
+        db.rollback()
+        EvaluationJobManager.fail(db, job.id, str(e))
+
+
+def worker_loop(worker_index: int) -> None:
+    """
+    Main loop of a single worker process
+    """
+    from src.db.session import SessionLocal
+    from src.manager.evaluation_job_manager import EvaluationJobManager
+
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{worker_index}"
+    logger.info(f"worker_loop: worker={worker_id} を起動しました。")
+    while True:
+        db = SessionLocal()
+        try:
+            job = EvaluationJobManager.claim_next(db, worker_id)
+            if job is None:
+                time.sleep(EVAL_WORKER_POLL_INTERVAL)
+                continue
+            run_job(db, job)
+        except Exception as e:
+            logger.error(f"worker_loop: worker={worker_id} でエラーが発生しました: {e}")
+            time.sleep(EVAL_WORKER_POLL_INTERVAL)
+        finally:
+            db.close()
+
+
+def main(processes: int = EVAL_WORKER_PROCESSES) -> None:
+    # NOTE: spawn so that each process creates its own DB engine/connection pool and inspect_ai state
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=worker_loop, args=(i,), daemon=True)
+               for i in range(processes)]
+    for w in workers:
+        w.start()
+    logger.info(f"main: {processes}個のワーカープロセスを起動しました。")
+    try:
+        for w in workers:
+            w.join()
+    except KeyboardInterrupt:
+        logger.info("main: ワーカープロセスを停止します。")
+        for w in workers:
+            w.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+
+import pandas as pd
+import pytest
+
+# NOTE: src.utils.logger and friends read the DB settings at import; no database is used here
+for _name, _value in {"DB_USER": "test", "DB_PASSWORD": "test", "DB_HOST": "localhost",
+                      "DB_PORT": "5432", "DB_NAME": "test"}.items():
+    os.environ.setdefault(_name, _value)
+
+from src.db.dataset_content import (  # noqa: E402
+    CONTENT_FORMAT_PARQUET, CONTENT_FORMAT_PICKLE, decode_content, encode_content
+)
+
+
+def assert_restored(records, decoded):
+    assert decoded == records
+    for row, decoded_row in zip(records, decoded):
+        assert [type(v) for v in row.values()] == [type(v) for v in decoded_row.values()]
+
+
+def test_records_are_stored_as_parquet():
+    records = [
+        {"text": "q1", "output": "a1", "choices": ["x", "y"], "score": 1.5, "flag": True},
+        {"text": "q2", "output": "a2", "choices": ["z"], "score": 2.0, "flag": False},
+    ]
+    data, content_format = encode_content(records)
+
+    assert content_format == CONTENT_FORMAT_PARQUET
+    assert_restored(records, decode_content(data, content_format))
+
+
+@pytest.mark.parametrize("records", [
+    # None would come back as nan and 3 as 3.0
+    [{"a": 1, "b": None}, {"a": 2, "b": 3}],
+    # Struct keys would be merged
+    [{"n": {"x": 1}}, {"n": {"y": 3}}],
+])
+def test_records_that_parquet_changes_are_pickled(records):
+    data, content_format = encode_content(records)
+
+    assert content_format == CONTENT_FORMAT_PICKLE
+    assert_restored(records, decode_content(data, content_format))
+
+
+def test_dataframe_columns_can_be_projected():
+    df = pd.DataFrame({"text": ["q"], "output": ["a"], "ans1": ["x"], "other": [1]})
+    data, content_format = encode_content(df)
+
+    decoded = decode_content(data, content_format, columns=["text"], columns_like=["ans"])
+    assert content_format == CONTENT_FORMAT_PARQUET
+    assert list(decoded.columns) == ["text", "ans1"]
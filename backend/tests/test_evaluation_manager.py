@@ -0,0 +1,95 @@
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# NOTE: src.db.session builds the PostgreSQL URL at import; the engine is never connected here
+for _name, _value in {"DB_USER": "test", "DB_PASSWORD": "test", "DB_HOST": "localhost",
+                      "DB_PORT": "5432", "DB_NAME": "test"}.items():
+    os.environ.setdefault(_name, _value)
+
+from src.db.define_tables import (  # noqa: E402
+    Base, Dataset, EvaluationPerspective, CustomDatasets, DatasetCustomMapping, Evaluation
+)
+from src.manager.evaluation_manager import EvaluationManager  # noqa: E402
+
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+@pytest.fixture
+def db():
+    session = make_session()
+    try:
+        yield session
+    finally:
+        session.close()
+        session.get_bind().dispose()
+
+
+def seed(db, n_evaluations: int):
+    """
+    Each evaluation uses its own custom dataset mapping a GSN dataset and a user dataset
+    """
+    db.add(EvaluationPerspective(id=1, perspective_name="有害情報の出力制御"))
+    for i in range(n_evaluations):
+        db.add(CustomDatasets(id=i + 1, name=f"custom_{i}"))
+        db.add(Dataset(id=2 * i + 1, name=f"GSN_G1-{i}", type="quantitative",
+                       evaluation_perspective_id=1))
+        db.add(Dataset(id=2 * i + 2, name=f"dataset_{i}", type="quantitative",
+                       evaluation_perspective_id=1))
+    db.flush()
+    for i in range(n_evaluations):
+        for dataset_id in (2 * i + 1, 2 * i + 2):
+            db.add(DatasetCustomMapping(dataset_id=dataset_id, custom_datasets_id=i + 1,
+                                        perspective_id=1, percentage=1.0))
+        db.add(Evaluation(id=i + 1, name=f"evaluation_{i}", created_date=datetime.now(),
+                          custom_datasets_id=i + 1))
+    db.commit()
+
+
+def count_get_all_statements(db) -> tuple[int, list]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        evaluations = EvaluationManager(db).get_all()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements), evaluations
+
+
+@pytest.mark.parametrize("n_evaluations", [3, 30])
+def test_get_all_returns_dataset_names(db, n_evaluations):
+    seed(db, n_evaluations)
+    _, evaluations = count_get_all_statements(db)
+
+    assert len(evaluations) == n_evaluations
+    for i, evaluation in enumerate(sorted(evaluations, key=lambda e: e["id"])):
+        assert evaluation["used_dataset_names"] == [
+            f"dataset_{i}", "Preset Data(有害情報の出力制御)"]
+
+
+def test_get_all_statement_count_does_not_grow_with_evaluations():
+    counts = {}
+    for n_evaluations in (3, 30):
+        db = make_session()
+        try:
+            seed(db, n_evaluations)
+            counts[n_evaluations], _ = count_get_all_statements(db)
+        finally:
+            db.close()
+            db.get_bind().dispose()
+
+    assert counts[3] == counts[30]
@@ -0,0 +1,58 @@
+import os
+import threading
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# NOTE: src.db.session builds the PostgreSQL URL at import; the engine is never connected here
+for _name, _value in {"DB_USER": "test", "DB_PASSWORD": "test", "DB_HOST": "localhost",
+                      "DB_PORT": "5432", "DB_NAME": "test"}.items():
+    os.environ.setdefault(_name, _value)
+
+from src.manager.scoring_context import ScoringContext  # noqa: E402
+
+
+def make_context(db, eval_result_id=1):
+    eval_result = SimpleNamespace(id=eval_result_id, quantitative_results={},
+                                  qualitative_results={})
+    return ScoringContext(db, eval_result)
+
+
+def test_counts_only_statements_inside_the_context():
+    db = sessionmaker(bind=create_engine("sqlite://"))()
+    db.execute(text("SELECT 1"))
+    with make_context(db) as context:
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+    db.execute(text("SELECT 3"))
+
+    assert context.db_queries == 2
+    db.close()
+
+
+def test_concurrent_contexts_on_one_engine_do_not_share_counts():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    make_db = sessionmaker(bind=engine)
+    barrier = threading.Barrier(2)
+    counts = {}
+
+    def run(n_statements):
+        db = make_db()
+        try:
+            with make_context(db, n_statements) as context:
+                barrier.wait()
+                for _ in range(n_statements):
+                    db.execute(text("SELECT 1"))
+                barrier.wait()
+            counts[n_statements] = context.db_queries
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in (3, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counts == {3: 3, 5: 5}
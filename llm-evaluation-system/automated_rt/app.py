@@ -15,6 +15,7 @@ import shutil
 import logging
 import csv
 import io
+from contextlib import asynccontextmanager
 
 
 # Logging settings
@@ -22,14 +23,17 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 # Importing components
-from llm_client import OpenAIClient, AzureOpenAIClient, HuggingFaceClient, OllamaClient
+from llm_client import OpenAIClient, AzureOpenAIClient, HuggingFaceClient, OllamaClient, ERROR_PREFIX, is_error_response
 from custom_endpoint_client import CustomEndpointClient
+from rate_limiter import with_rate_limit, get_rate_limits
+from client_pool import client_pool, client_key
 from document_processor import extract_text_from_pdf, summarize_text_with_llm
 from models import (
     LLMRequest, 
     RequirementsGenerationRequest, 
     AdversarialPromptRequest, 
     EvaluationRequest,
+    RedTeamingRunRequest,
     TestResult
 )
 from results_manager import ResultsManager
@@ -39,6 +43,7 @@ from prompts import (
     REQUIREMENT_BASE_USER_PROMPT,
     ADVERSARIAL_BASE_SYSTEM_PROMPT,
     ADVERSARIAL_BASE_USER_PROMPT,
+    ADVERSARIAL_FOLLOWUP_USER_PROMPT,
     EVALUATION_BASE_SYSTEM_PROMPT,
     EVALUATION_BASE_USER_PROMPT,
     TARGET_SAMPLE_SYSTEM_PROMPTS,
@@ -54,8 +59,24 @@ DEFAULT_ADVERSARIAL_MODEL = "gpt-4o"
 DEFAULT_EVALUATION_MODEL = "gpt-4o"
 DEFAULT_TARGET_MODEL = "gpt-5-mini"
 
+# Concurrency of the evaluate_target_llm pipeline (target AI calls / evaluation AI calls)
+TARGET_CONCURRENCY = int(os.environ.get("RT_TARGET_CONCURRENCY", "4"))
+EVALUATION_CONCURRENCY = int(os.environ.get("RT_EVALUATION_CONCURRENCY", "4"))
+# Maximum number of adversarial prompt generation calls in flight
+ADVERSARIAL_CONCURRENCY = int(os.environ.get("RT_ADVERSARIAL_CONCURRENCY", "4"))
+# Maximum number of calls per requirement in the batched adversarial prompt generation
+# (the first call requests all prompts, the following ones only the shortfall)
+ADVERSARIAL_BATCH_MAX_CALLS = int(os.environ.get("RT_ADVERSARIAL_BATCH_MAX_CALLS", "3"))
 
-app = FastAPI(title="AIセーフティ評価 自動レッドチーミング")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close the shared HTTP clients of the LLM clients
+    await client_pool.close()
+
+
+app = FastAPI(title="AIセーフティ評価 自動レッドチーミング", lifespan=lifespan)
 
 # Settings of templates and static files
 templates = Jinja2Templates(directory="templates")
@@ -233,177 +254,394 @@ async def generate_requirements(request: RequirementsGenerationRequest):
         print(f"予期しないエラー: {e}")
         return {"error": f"要件生成中にエラーが発生しました: {str(e)}", "raw_response": str(e)}
 
-@app.post("/generate_adversarial_prompts")
-async def generate_adversarial_prompts(request: AdversarialPromptRequest):
-    """Generation of adversarial prompts"""
-    if request.session_id not in sessions:
-        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+def _parse_adversarial_prompt_response(response, req):
+    """
+    Parse a response of the adversarial prompt generation AI
     
-    session = sessions[request.session_id]
-    language = _ensure_language(getattr(request, "language", "ja"))
+    Args:
+        response: Response text of the LLM
+        req: Requirement
+        
+    Returns:
+        tuple: (prompt entry or None if nothing can be used, whether the generation succeeded)
+    """
+    # Parse JSON responses (supports both single prompt and prompt arrays)
+    try:
+        # First, attempt to parse as a string (single string enclosed in double quotes)
+        if response.strip().startswith('"') and response.strip().endswith('"'):
+            # Strings enclosed in double quotation marks
+            prompt_text = json.loads(response.strip())
+            if isinstance(prompt_text, str):
+                return {
+                    "prompt": prompt_text,
+                    "category": req["category"],
+                    "requirement": req["requirement"]
+                }, True
+    
+        # Next, try analyzing it as an array
+        prompts = json.loads(response)
+        if isinstance(prompts, list) and len(prompts) > 0:
+            # In the case of an array, only the first element is used
+            prompt_text = prompts[0] if isinstance(prompts[0], str) else str(prompts[0])
+            return {
+                "prompt": prompt_text,
+                "category": req["category"],
+                "requirement": req["requirement"]
+            }, True
+        return None, False
+    
+    except json.JSONDecodeError:
+        # If JSON parsing fails, try extracting JSON
+        import re
+        
+        # First, find the string enclosed in double quotation marks
+        quote_match = re.search(r'"([^"\\]*(\\.[^"\\]*)*)"', response)
+        if quote_match:
+            prompt_text = quote_match.group(1)
+            if adversarial_prompt_check(prompt_text):
+                return {
+                    "prompt": prompt_text,
+                    "category": req["category"],
+                    "requirement": req["requirement"]
+                }, True
+            return {
+                "prompt": prompt_text,
+                "category": req["category"],
+                "requirement": req["requirement"],
+                "error": True
+            }, False
+        
+        # Next, try extracting the array
+        json_match = re.search(r'\[\s*"([^"\\]*(\\.[^"\\]*)*)"\s*\]', response, re.DOTALL)
+        if json_match:
+            prompt_text = json_match.group(1)
+            if adversarial_prompt_check(prompt_text):
+                return {
+                    "prompt": prompt_text,
+                    "category": req["category"],
+                    "requirement": req["requirement"]
+                }, True
+            return {
+                "prompt": prompt_text,
+                "category": req["category"],
+                "requirement": req["requirement"],
+                "error": True
+            }, False
+        
+        # If the parse fails
+        if len(response) == 0:
+            logger.warning(f"敵対的プロンプト生成エラー - JSONパースに失敗: レスポンス: (空)")
+            return {
+                "prompt": f"[エラー] 敵対的プロンプト生成AIから空の応答を受信しました。",
+                "category": req["category"],
+                "requirement": req["requirement"],
+                "error": True
+            }, False
+        logger.warning(f"敵対的プロンプト生成エラー - JSONパースに失敗: レスポンス: {response[:100]}...")
+        return {
+            "prompt": f"[エラー] パースに失敗しました: {response[:100]}...",
+            "category": req["category"],
+            "requirement": req["requirement"],
+            "error": True
+        }, False
+
+def _extract_prompt_list(response):
+    """
+    Extract the prompts of an adversarial prompt generation response
+    (tolerates code fences, text around the JSON array, a single quoted string and a truncated array)
+    
+    Args:
+        response: Response text of the LLM
+        
+    Returns:
+        list: Prompt strings, or None if no JSON array or string is found
+    """
+    import re
 
-    if not session["requirements"]:
-        raise HTTPException(status_code=400, detail="先に要件を生成してください")
+    text = (response or "").strip()
+    value = None
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        # Find the first JSON array in the text
+        decoder = json.JSONDecoder()
+        for match in re.finditer(r'\[', text):
+            try:
+                candidate, _ = decoder.raw_decode(text, match.start())
+            except json.JSONDecodeError:
+                continue
+            if isinstance(candidate, list):
+                value = candidate
+                break
+
+    if value is None:
+        # Truncated array: use the complete strings after the opening bracket
+        start = text.find('[')
+        if start < 0:
+            return None
+        value = []
+        for quoted in re.findall(r'"((?:[^"\\]|\\.)*)"', text[start:]):
+            try:
+                value.append(json.loads(f'"{quoted}"'))
+            except json.JSONDecodeError:
+                continue
+        if not value:
+            return None
+
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return None
+
+    prompts = []
+    for item in value:
+        # Also accepts [{"prompt": "..."}]
+        if isinstance(item, dict):
+            item = item.get("prompt")
+        if isinstance(item, str) and item.strip():
+            prompts.append(item.strip())
+    return prompts
+
+async def _generate_adversarial_prompts(session, request, on_prompt=None):
+    """
+    Generate the adversarial prompts of all requirements
     
+    Args:
+        session: Session
+        request: AdversarialPromptRequest
+        on_prompt: Called with (slot, prompt entry or None) as soon as each prompt is generated.
+                   Slots are numbered in (requirement, attempt) order; None means the slot has no prompt
+        
+    Returns:
+        list: Prompt entries in (requirement, attempt) order
+    """
+    language = _ensure_language(getattr(request, "language", "ja"))
+
     # Initialize LLM client by selecting the appropriate client based on the provider
     llm_client = _create_llm_client(session["adversarial_llm"])
+
+    # Default base system prompt
+    default_base_system_prompt = ADVERSARIAL_BASE_SYSTEM_PROMPT
     
-    all_prompts = []
+    # Use user defined prompt or default base system prompt
+    base_system_prompt = session["adversarial_llm"].base_system_prompt or default_base_system_prompt
     
-    # Generate adversarial prompts for each requirement
-    for req in session["requirements"]:
-        # Default base system prompt
-        default_base_system_prompt = ADVERSARIAL_BASE_SYSTEM_PROMPT
-        
-        # Use user defined prompt or default base system prompt
-        base_system_prompt = session["adversarial_llm"].base_system_prompt or default_base_system_prompt
-        
-        # Add user custom prompts if available
-        custom_prompt = session["adversarial_llm"].system_prompt
-        if custom_prompt:
-            system_prompt = base_system_prompt + "\n\n追加指示：\n" + custom_prompt
-        else:
-            system_prompt = base_system_prompt
+    # Add user custom prompts if available
+    custom_prompt = session["adversarial_llm"].system_prompt
+    if custom_prompt:
+        system_prompt = base_system_prompt + "\n\n追加指示：\n" + custom_prompt
+    else:
+        system_prompt = base_system_prompt
 
-        system_prompt = _append_english_output_note(system_prompt, language)
-        
-        # Generate the specified number of prompts
-        prompts_per_requirement = int(request.prompts_per_requirement)
-        successful_prompts = 0
+    system_prompt = _append_english_output_note(system_prompt, language)
+
+    # Default user prompt template
+    default_user_prompt_template = ADVERSARIAL_BASE_USER_PROMPT
+    
+    # Use user defined prompt or default user prompt templates
+    user_prompt_template = session["adversarial_llm"].user_prompt_template or default_user_prompt_template
+
+    requirements = session["requirements"]
+    # Generate the specified number of prompts
+    prompts_per_requirement = int(request.prompts_per_requirement)
+
+    # Per-requirement progress (see /generation_progress)
+    progress = {
+        "total_prompts": len(requirements) * prompts_per_requirement,
+        "completed_prompts": 0,
+        "total_requirements": len(requirements),
+        "completed_requirements": 0,
+        "requirements": [
+            {"category": req["category"], "completed": 0, "successful": 0, "total": prompts_per_requirement}
+            for req in requirements
+        ],
+        "last_update": datetime.now().isoformat(),
+    }
+    session["generation_progress"] = progress
+
+    def record_generation_progress(req_index, completed, successful):
+        # NOTE: Runs on the event loop without awaiting, so concurrent calls do not interleave
+        req_progress = progress["requirements"][req_index]
+        req_progress["completed"] += completed
+        req_progress["successful"] += successful
+        progress["completed_prompts"] += completed
+        if req_progress["completed"] == req_progress["total"]:
+            progress["completed_requirements"] += 1
+            # Log the results of prompt generation for this requirement
+            logger.info(f"要件「{req_progress['category']}」に対して {req_progress['successful']}/{prompts_per_requirement} 個の敵対的プロンプトを生成しました")
+        progress["last_update"] = datetime.now().isoformat()
+
+    def emit(req_index, position, entry):
+        if on_prompt is not None:
+            on_prompt(req_index * prompts_per_requirement + position, entry)
+
+    # Bounds the generation calls in flight (the endpoint rate limiter applies as well)
+    semaphore = asyncio.Semaphore(request.concurrency or ADVERSARIAL_CONCURRENCY)
+
+    def build_user_prompt(req, count, current_attempt, total_attempts):
+        # Generate user prompts from templates
+        return user_prompt_template.replace("{target_purpose}", request.target_purpose) \
+                                   .replace("{category}", req["category"]) \
+                                   .replace("{requirement}", req["requirement"]) \
+                                   .replace("{prompts_per_requirement}", str(count)) \
+                                   .replace("{current_attempt}", str(current_attempt)) \
+                                   .replace("{total_attempts}", str(total_attempts))
+
+    async def generate_one(req_index, attempt):
+        """
+        Generate one adversarial prompt
+        Returns: (prompt entry or None, whether the generation succeeded)
+        """
+        req = requirements[req_index]
+        user_prompt = build_user_prompt(req, request.prompts_per_requirement, attempt + 1, prompts_per_requirement)
         
-        # Try each prompt generation individually
-        for attempt in range(prompts_per_requirement):
-            # Default user prompt template
-            default_user_prompt_template = ADVERSARIAL_BASE_USER_PROMPT
-            
-            # Use user defined prompt or default user prompt templates
-            user_prompt_template = session["adversarial_llm"].user_prompt_template or default_user_prompt_template
-            
-            # Generate user prompts from templates
-            user_prompt = user_prompt_template.replace("{target_purpose}", request.target_purpose) \
-                                            .replace("{category}", req["category"]) \
-                                            .replace("{requirement}", req["requirement"]) \
-                                            .replace("{prompts_per_requirement}", str(request.prompts_per_requirement)) \
-                                            .replace("{current_attempt}", str(attempt + 1)) \
-                                            .replace("{total_attempts}", str(prompts_per_requirement))
+        try:
+            # Request adversarial prompt generation to LLM
+            logger.info(f"要件「{req['category']}: {req['requirement'][:50]}...」の敵対的プロンプト生成試行 {attempt+1}/{prompts_per_requirement}")
+            async with semaphore:
+                response = await llm_client.generate(system_prompt, user_prompt)
             
+            try:
+                return _parse_adversarial_prompt_response(response, req)
+            except Exception as e:
+                # Handle other exception
+                logger.error(f"敵対的プロンプト生成中のエラー: {e}")
+                return {
+                    "prompt": f"[エラー] プロンプト生成に失敗しました: {str(e)}",
+                    "category": req["category"],
+                    "requirement": req["requirement"],
+                    "error": True
+                }, False
+        
+        except Exception as e:
+            logger.error(f"LLM呼び出し中のエラー: {e}")
+            return {
+                "prompt": f"[エラー] プロンプト生成に失敗しました: {str(e)}",
+                "category": req["category"],
+                "requirement": req["requirement"],
+                "error": True
+            }, False
+
+    async def run_one(req_index, attempt):
+        entry, successful = await generate_one(req_index, attempt)
+        record_generation_progress(req_index, 1, 1 if successful else 0)
+        emit(req_index, attempt, entry)
+        return entry
+
+    async def generate_batch(req_index):
+        """
+        Generate all adversarial prompts of one requirement: the first call requests all of them,
+        the following calls (up to ADVERSARIAL_BATCH_MAX_CALLS in total) only the shortfall
+        ({current_attempt}/{total_attempts} are the call number and ADVERSARIAL_BATCH_MAX_CALLS)
+        Returns: list of prompt entries (prompts_per_requirement entries, failures as error entries)
+        """
+        req = requirements[req_index]
+        entries = []
+        seen = set()
+        failure = None
+        for call in range(ADVERSARIAL_BATCH_MAX_CALLS):
+            shortfall = prompts_per_requirement - len(entries)
+            if shortfall <= 0:
+                break
+            user_prompt = build_user_prompt(req, shortfall, call + 1, ADVERSARIAL_BATCH_MAX_CALLS)
+            if entries:
+                # Ask for prompts different from the generated ones
+                user_prompt += ADVERSARIAL_FOLLOWUP_USER_PROMPT.replace(
+                    "{existing_prompts}",
+                    json.dumps([entry["prompt"] for entry in entries], ensure_ascii=False, indent=4))
+
             try:
                 # Request adversarial prompt generation to LLM
-                logger.info(f"要件「{req['category']}: {req['requirement'][:50]}...」の敵対的プロンプト生成試行 {attempt+1}/{prompts_per_requirement}")
-                response = await llm_client.generate(system_prompt, user_prompt)
-                
-                try:
-                    # Parse JSON responses (supports both single prompt and prompt arrays)
-                    try:
-                        # First, attempt to parse as a string (single string enclosed in double quotes)
-                        if response.strip().startswith('"') and response.strip().endswith('"'):
-                            # Strings enclosed in double quotation marks
-                            prompt_text = json.loads(response.strip())
-                            if isinstance(prompt_text, str):
-                                all_prompts.append({
-                                    "prompt": prompt_text,
-                                    "category": req["category"],
-                                    "requirement": req["requirement"]
-                                })
-                                successful_prompts += 1
-                                continue
-                    
-                        # Next, try analyzing it as an array
-                        prompts = json.loads(response)
-                        if isinstance(prompts, list) and len(prompts) > 0:
-                            # In the case of an array, only the first element is used
-                            prompt_text = prompts[0] if isinstance(prompts[0], str) else str(prompts[0])
-                            all_prompts.append({
-                                "prompt": prompt_text,
-                                "category": req["category"],
-                                "requirement": req["requirement"]
-                            })
-                            successful_prompts += 1
-                            continue
-                    
-                    except json.JSONDecodeError:
-                        # If JSON parsing fails, try extracting JSON
-                        import re
-                        
-                        # First, find the string enclosed in double quotation marks
-                        quote_match = re.search(r'"([^"\\]*(\\.[^"\\]*)*)"', response)
-                        if quote_match:
-                            prompt_text = quote_match.group(1)
-                            if adversarial_prompt_check(prompt_text):
-                                all_prompts.append({
-                                    "prompt": prompt_text,
-                                    "category": req["category"],
-                                    "requirement": req["requirement"]
-                                })
-                                successful_prompts += 1
-                            else:
-                                all_prompts.append({
-                                    "prompt": prompt_text,
-                                    "category": req["category"],
-                                    "requirement": req["requirement"],
-                                    "error": True
-                                })
-                            continue
-                        
-                        # Next, try extracting the array
-                        json_match = re.search(r'\[\s*"([^"\\]*(\\.[^"\\]*)*)"\s*\]', response, re.DOTALL)
-                        if json_match:
-                            prompt_text = json_match.group(1)
-                            if adversarial_prompt_check(prompt_text):
-                                all_prompts.append({
-                                    "prompt": prompt_text,
-                                    "category": req["category"],
-                                    "requirement": req["requirement"]
-                                })
-                                successful_prompts += 1
-                            else:
-                                all_prompts.append({
-                                    "prompt": prompt_text,
-                                    "category": req["category"],
-                                    "requirement": req["requirement"],
-                                    "error": True
-                                })
-                            continue
-                        
-                        # If the parse fails
-                        if len(response) == 0:
-                            logger.warning(f"敵対的プロンプト生成エラー - JSONパースに失敗: レスポンス: (空)")
-                            all_prompts.append({
-                                "prompt": f"[エラー] 敵対的プロンプト生成AIから空の応答を受信しました。",
-                                "category": req["category"],
-                                "requirement": req["requirement"],
-                                "error": True
-                            })
-                        else:
-                            logger.warning(f"敵対的プロンプト生成エラー - JSONパースに失敗: レスポンス: {response[:100]}...")
-                            all_prompts.append({
-                                "prompt": f"[エラー] パースに失敗しました: {response[:100]}...",
-                                "category": req["category"],
-                                "requirement": req["requirement"],
-                                "error": True
-                            })
-                
-                except Exception as e:
-                    # Handle other exception
-                    logger.error(f"敵対的プロンプト生成中のエラー: {e}")
-                    all_prompts.append({
-                        "prompt": f"[エラー] プロンプト生成に失敗しました: {str(e)}",
-                        "category": req["category"],
-                        "requirement": req["requirement"],
-                        "error": True
-                    })
-            
+                logger.info(f"要件「{req['category']}: {req['requirement'][:50]}...」の敵対的プロンプト{shortfall}個を一括生成します（呼び出し {call+1}/{ADVERSARIAL_BATCH_MAX_CALLS}）")
+                async with semaphore:
+                    response = await llm_client.generate(system_prompt, user_prompt)
             except Exception as e:
                 logger.error(f"LLM呼び出し中のエラー: {e}")
-                all_prompts.append({
-                    "prompt": f"[エラー] プロンプト生成に失敗しました: {str(e)}",
+                failure = f"[エラー] プロンプト生成に失敗しました: {str(e)}"
+                continue
+
+            extracted = _extract_prompt_list(response)
+            if extracted is None:
+                if not response:
+                    logger.warning(f"敵対的プロンプト生成エラー - JSONパースに失敗: レスポンス: (空)")
+                    failure = "[エラー] 敵対的プロンプト生成AIから空の応答を受信しました。"
+                else:
+                    logger.warning(f"敵対的プロンプト生成エラー - JSONパースに失敗: レスポンス: {response[:100]}...")
+                    failure = f"[エラー] パースに失敗しました: {response[:100]}..."
+                continue
+
+            added = 0
+            for prompt_text in extracted:
+                if not adversarial_prompt_check(prompt_text):
+                    # Keep the refusal to report it if the prompts run short
+                    failure = prompt_text
+                    continue
+                key = " ".join(prompt_text.split()).casefold()
+                if key in seen:
+                    continue
+                seen.add(key)
+                entries.append({
+                    "prompt": prompt_text,
+                    "category": req["category"],
+                    "requirement": req["requirement"]
+                })
+                emit(req_index, len(entries) - 1, entries[-1])
+                added += 1
+                if len(entries) >= prompts_per_requirement:
+                    break
+            if added:
+                record_generation_progress(req_index, added, added)
+
+        shortfall = prompts_per_requirement - len(entries)
+        if shortfall > 0:
+            message = failure or "[エラー] 重複しない敵対的プロンプトを必要数生成できませんでした"
+            for _ in range(shortfall):
+                entries.append({
+                    "prompt": message,
                     "category": req["category"],
                     "requirement": req["requirement"],
                     "error": True
                 })
-        
-        # Log the results of prompt generation for this requirement
-        logger.info(f"要件「{req['category']}」に対して {successful_prompts}/{prompts_per_requirement} 個の敵対的プロンプトを生成しました")
+                emit(req_index, len(entries) - 1, entries[-1])
+            record_generation_progress(req_index, shortfall, 0)
+        return entries
+
+    # NOTE: Batching is opt-in and needs a template that asks for {prompts_per_requirement} prompts;
+    # otherwise each call yields one prompt and {current_attempt}/{total_attempts} number the prompts
+    batch_generation = request.batch_generation and "{prompts_per_requirement}" in user_prompt_template
+    if request.batch_generation and not batch_generation:
+        logger.warning("ユーザープロンプトテンプレートに{prompts_per_requirement}が含まれていないため、敵対的プロンプトを1個ずつ生成します")
+    if batch_generation:
+        # One task per requirement; gather keeps the requirement order
+        batches = await asyncio.gather(*[
+            generate_batch(req_index) for req_index in range(len(requirements))
+        ])
+        all_prompts = [entry for batch in batches for entry in batch]
+    else:
+        # Generate adversarial prompts for all requirements and attempts concurrently;
+        # gather keeps the (requirement, attempt) order
+        entries = await asyncio.gather(*[
+            run_one(req_index, attempt)
+            for req_index in range(len(requirements))
+            for attempt in range(prompts_per_requirement)
+        ])
+        all_prompts = [entry for entry in entries if entry is not None]
+    
+    return all_prompts
+
+
+@app.post("/generate_adversarial_prompts")
+async def generate_adversarial_prompts(request: AdversarialPromptRequest):
+    """Generation of adversarial prompts"""
+    if request.session_id not in sessions:
+        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+    
+    session = sessions[request.session_id]
+
+    if not session["requirements"]:
+        raise HTTPException(status_code=400, detail="先に要件を生成してください")
+
+    all_prompts = await _generate_adversarial_prompts(session, request)
     
     # Save to the session
     sessions[request.session_id]["adversarial_prompts"] = all_prompts
@@ -455,33 +693,35 @@ def adversarial_prompt_check(prompt_text):
         return False
     return True
 
-@app.post("/evaluate_target_llm")
-async def evaluate_target_llm(request: EvaluationRequest):
-    """Evaluate target AI"""
-    if request.session_id not in sessions:
-        raise HTTPException(status_code=404, detail="セッションが見つかりません")
-
-    session = sessions[request.session_id]
-    language = _ensure_language(getattr(request, "language", "ja"))
-
-    if not session["adversarial_prompts"]:
-        raise HTTPException(status_code=400, detail="先に敵対的プロンプトを生成してください")
+async def _evaluate_prompt_stream(session, language, total_prompts, produce,
+                                  target_concurrency=None, evaluation_concurrency=None):
+    """
+    Send adversarial prompts to the target AI and evaluate the responses
+    (two-stage pipeline: target calls and grading calls run concurrently)
     
+    Args:
+        session: Session
+        language: UI language
+        total_prompts: Number of prompt indexes
+        produce: Coroutine function called with submit(index, prompt entry or None). Prompts are
+                 processed as soon as they are submitted, also while produce is still running
+                 (None means the index has no prompt)
+        target_concurrency: Maximum number of target AI calls in flight
+        evaluation_concurrency: Maximum number of evaluation AI calls in flight
+        
+    Returns:
+        list: Evaluation results in index order
+    """
     # Initialize target AI client by selecting the appropriate client based on the provider
     target_llm = _create_llm_client(session["target_llm"])
     
     # Initialize response evaluation AI client by selecting the appropriate client based on the provider
     eval_llm = _create_llm_client(session["evaluation_llm"])
-    
-    results = []
-    prompts = session["adversarial_prompts"]
-    total_prompts = len(prompts)
-
-    prompt_step_counts = [1 if prompt.get("error", False) else 3 for prompt in prompts]
-    total_steps = sum(prompt_step_counts)
 
+    # NOTE: 3 steps per prompt (target call, evaluation call, completion), adjusted on submit
+    # (1 step for a prompt with the error flag)
     session["evaluation_progress"] = {
-        "total_steps": total_steps,
+        "total_steps": total_prompts * 3,
         "completed_steps": 0,
         "completed_prompts": 0,
         "total_prompts": total_prompts,
@@ -489,8 +729,12 @@ async def evaluate_target_llm(request: EvaluationRequest):
         "current_step_description": None,
         "last_update": datetime.now().isoformat(),
     }
+    # Results in completion order (see /evaluation_results)
+    session["partial_results"] = []
 
     def record_progress(step_increment=0, prompt_index=None, description=None, prompt_completed=False):
+        # NOTE: Called by the concurrent pipeline stages. It runs on the event loop without awaiting,
+        # and completed prompts are counted (prompts do not finish in index order)
         progress = session.get("evaluation_progress")
         if not progress:
             return
@@ -511,70 +755,33 @@ async def evaluate_target_llm(request: EvaluationRequest):
             progress["current_step_description"] = description
 
         if prompt_completed:
-            if prompt_index is not None:
-                progress["completed_prompts"] = max(progress.get("completed_prompts", 0), prompt_index + 1)
-            else:
-                progress["completed_prompts"] = progress.get("total_prompts", progress.get("completed_prompts", 0))
+            completed_prompts_local = progress.get("completed_prompts", 0) + 1
+            total_prompts_local = progress.get("total_prompts")
+            progress["completed_prompts"] = min(completed_prompts_local, total_prompts_local) if total_prompts_local else completed_prompts_local
 
         progress["last_update"] = datetime.now().isoformat()
 
-    # Test target AI with each adversarial prompt
-    for i, prompt_data in enumerate(prompts):
-        record_progress(prompt_index=i, description="preparing_prompt")
-        adversarial_prompt = prompt_data["prompt"]
+    # System prompt of the target AI
+    target_system_prompt = session["target_llm"].system_prompt
+    if not target_system_prompt:
+        target_system_prompt = TARGET_SAMPLE_SYSTEM_PROMPTS.get(language, TARGET_SAMPLE_SYSTEM_PROMPTS["ja"])
+    target_system_prompt = _append_english_output_note(target_system_prompt, language)
 
-        # Fixed: Prompts with error flags will be skipped
-        if prompt_data.get("error", False):
-            logger.info(f"プロンプト {i+1}/{total_prompts} はエラーフラグがありスキップします: {adversarial_prompt[:50]}...")
-            
-            # Record the error content as is in the results
-            result = {
-                "prompt": adversarial_prompt,
-                "category": prompt_data["category"],
-                "requirement": prompt_data["requirement"],
-                "target_response": "スキップされました（敵対的プロンプト生成時にエラー）",
-                "evaluation": {
-                    "passed": None,
-                    "reason": "敵対的プロンプト生成時にエラーが発生したため評価をスキップしました",
-                    "skipped": True
-                }
-            }
-            results.append(result)
-            record_progress(
-                step_increment=prompt_step_counts[i],
-                prompt_index=i,
-                description="skipped_prompt",
-                prompt_completed=True
-            )
-            continue
-
-        logger.info(f"プロンプト {i+1}/{total_prompts} を評価中: {adversarial_prompt[:50]}...")
-
-        # Send adversarial prompts to target AI
-        target_system_prompt = session["target_llm"].system_prompt
-        if not target_system_prompt:
-            target_system_prompt = TARGET_SAMPLE_SYSTEM_PROMPTS.get(language, TARGET_SAMPLE_SYSTEM_PROMPTS["ja"])
-        target_system_prompt = _append_english_output_note(target_system_prompt, language)
+    # Preparing system prompts (base prompts + user custom prompts)
+    base_system_prompt = EVALUATION_BASE_SYSTEM_PROMPT
 
-        record_progress(prompt_index=i, description="request_target_llm")
-        target_response = ""
-        try:
-            target_response = await target_llm.generate(target_system_prompt, adversarial_prompt)
-        finally:
-            record_progress(step_increment=1, prompt_index=i, description="target_response_received")
-
-        # Preparing system prompts (base prompts + user custom prompts)
-        base_system_prompt = EVALUATION_BASE_SYSTEM_PROMPT
-
-        # Add user custom prompts if available
-        custom_prompt = session["evaluation_llm"].system_prompt
-        if custom_prompt:
-            system_prompt = base_system_prompt + "\n\n追加指示：\n" + custom_prompt
-        else:
-            system_prompt = base_system_prompt
+    # Add user custom prompts if available
+    custom_prompt = session["evaluation_llm"].system_prompt
+    if custom_prompt:
+        system_prompt = base_system_prompt + "\n\n追加指示：\n" + custom_prompt
+    else:
+        system_prompt = base_system_prompt
 
-        system_prompt = _append_english_output_note(system_prompt, language)
+    system_prompt = _append_english_output_note(system_prompt, language)
 
+    async def grade(i, prompt_data, target_response):
+        """Evaluate the response of the target AI to one adversarial prompt"""
+        adversarial_prompt = prompt_data["prompt"]
         user_prompt = EVALUATION_BASE_USER_PROMPT % {"category": prompt_data["category"], "requirement": prompt_data["requirement"], "adversarial": adversarial_prompt, "response": target_response}
 
         try:
@@ -628,8 +835,8 @@ async def evaluate_target_llm(request: EvaluationRequest):
                     "target_response": target_response,
                     "evaluation": evaluation
                 }
-                results.append(result)
                 record_progress(step_increment=1, prompt_index=i, description="prompt_completed", prompt_completed=True)
+                return result
             except json.JSONDecodeError as e:
                 # If JSON parsing fails
                 print(f"評価レスポンスのパースに失敗: {e}")
@@ -645,8 +852,8 @@ async def evaluate_target_llm(request: EvaluationRequest):
                         "raw_response": eval_response
                     }
                 }
-                results.append(result)
                 record_progress(step_increment=1, prompt_index=i, description="prompt_completed_with_parse_error", prompt_completed=True)
+                return result
         except Exception as e:
             print(f"評価中のエラー: {e}")
             result = {
@@ -660,15 +867,133 @@ async def evaluate_target_llm(request: EvaluationRequest):
                     "error": True
                 }
             }
-            results.append(result)
             record_progress(step_increment=1, prompt_index=i, description="prompt_completed_with_error", prompt_completed=True)
-
+            return result
+
+    target_concurrency = target_concurrency or TARGET_CONCURRENCY
+    evaluation_concurrency = evaluation_concurrency or EVALUATION_CONCURRENCY
+
+    # Prompts and results by index (the pipeline completes prompts out of order)
+    prompts = [None] * total_prompts
+    results = [None] * total_prompts
+    target_queue = asyncio.Queue()
+    # NOTE: Bounded so that target calls do not run far ahead of grading
+    grading_queue = asyncio.Queue(maxsize=evaluation_concurrency * 2)
+
+    def complete(i, result):
+        results[i] = result
+        session["partial_results"].append(result)
+
+    def submit(i, prompt_data):
+        progress = session["evaluation_progress"]
+        if prompt_data is None:
+            progress["total_prompts"] -= 1
+            progress["total_steps"] -= 3
+            return
+        prompts[i] = prompt_data
+        # Fixed: Prompts with error flags will be skipped
+        if prompt_data.get("error", False):
+            logger.info(f"プロンプト {i+1}/{total_prompts} はエラーフラグがありスキップします: {prompt_data['prompt'][:50]}...")
+            progress["total_steps"] -= 2
+            
+            # Record the error content as is in the results
+            complete(i, {
+                "prompt": prompt_data["prompt"],
+                "category": prompt_data["category"],
+                "requirement": prompt_data["requirement"],
+                "target_response": "スキップされました（敵対的プロンプト生成時にエラー）",
+                "evaluation": {
+                    "passed": None,
+                    "reason": "敵対的プロンプト生成時にエラーが発生したため評価をスキップしました",
+                    "skipped": True
+                }
+            })
+            record_progress(
+                step_increment=1,
+                prompt_index=i,
+                description="skipped_prompt",
+                prompt_completed=True
+            )
+            return
+        target_queue.put_nowait(i)
+
+    async def target_worker():
+        """Stage 1: send adversarial prompts to the target AI"""
+        while True:
+            i = await target_queue.get()
+            if i is None:
+                return
+            adversarial_prompt = prompts[i]["prompt"]
+            logger.info(f"プロンプト {i+1}/{total_prompts} を評価中: {adversarial_prompt[:50]}...")
+            record_progress(prompt_index=i, description="request_target_llm")
+            try:
+                target_response = await target_llm.generate(target_system_prompt, adversarial_prompt)
+            except Exception as e:
+                target_response = f"{ERROR_PREFIX}{str(e)}"
+            # NOTE: The clients return errors as text ("エラー: ...") instead of raising
+            if is_error_response(target_response):
+                error = target_response[len(ERROR_PREFIX):]
+                logger.error(f"プロンプト {i+1}/{total_prompts} のターゲットAI呼び出しに失敗しました: {error}")
+                record_progress(step_increment=1, prompt_index=i, description="target_response_received")
+                # Record the error without grading (the error text is not a response of the target AI)
+                complete(i, {
+                    "prompt": adversarial_prompt,
+                    "category": prompts[i]["category"],
+                    "requirement": prompts[i]["requirement"],
+                    "target_response": target_response,
+                    "evaluation": {
+                        "passed": None,
+                        "reason": f"ターゲットAIの呼び出し中にエラーが発生しました: {error}",
+                        "error": True
+                    }
+                })
+                record_progress(step_increment=2, prompt_index=i, description="prompt_completed_with_error", prompt_completed=True)
+                continue
+            record_progress(step_increment=1, prompt_index=i, description="target_response_received")
+            await grading_queue.put((i, target_response))
+
+    async def grading_worker():
+        """Stage 2: evaluate the responses of the target AI"""
+        while True:
+            item = await grading_queue.get()
+            if item is None:
+                return
+            i, target_response = item
+            complete(i, await grade(i, prompts[i], target_response))
+
+    logger.info(f"評価を開始します: プロンプト数={total_prompts}, ターゲット同時実行数={target_concurrency}, 評価同時実行数={evaluation_concurrency}")
+    target_tasks = [asyncio.create_task(target_worker()) for _ in range(target_concurrency)]
+    grading_tasks = [asyncio.create_task(grading_worker()) for _ in range(evaluation_concurrency)]
+    try:
+        await produce(submit)
+        for _ in target_tasks:
+            target_queue.put_nowait(None)
+        await asyncio.gather(*target_tasks)
+        for _ in grading_tasks:
+            await grading_queue.put(None)
+        await asyncio.gather(*grading_tasks)
+    except BaseException:
+        for task in target_tasks + grading_tasks:
+            task.cancel()
+        raise
+
+    # Indexes without a prompt have no result
+    return [result for result in results if result is not None]
+
+
+def _save_evaluation_results(session, session_id, results):
+    """
+    Save evaluation results to the session and a results file and create the summary
+    
+    Returns:
+        dict: Summary of the results
+    """
     # Save evaluation results to the session
-    sessions[request.session_id]["evaluation_results"] = results
+    session["evaluation_results"] = results
 
     # Save to a results file
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    result_file = os.path.join(RESULTS_DIR, f"evaluation_{request.session_id}_{timestamp}.json")
+    result_file = os.path.join(RESULTS_DIR, f"evaluation_{session_id}_{timestamp}.json")
     with open(result_file, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
     
@@ -726,11 +1051,96 @@ async def evaluate_target_llm(request: EvaluationRequest):
         progress_data["current_step_description"] = "completed"
         progress_data["last_update"] = datetime.now().isoformat()
 
+    return summary
+
+
+@app.post("/evaluate_target_llm")
+async def evaluate_target_llm(request: EvaluationRequest):
+    """Evaluate target AI"""
+    if request.session_id not in sessions:
+        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+
+    session = sessions[request.session_id]
+    language = _ensure_language(getattr(request, "language", "ja"))
+
+    if not session["adversarial_prompts"]:
+        raise HTTPException(status_code=400, detail="先に敵対的プロンプトを生成してください")
+
+    prompts = session["adversarial_prompts"]
+
+    async def produce(submit):
+        for i, prompt_data in enumerate(prompts):
+            submit(i, prompt_data)
+
+    results = await _evaluate_prompt_stream(
+        session, language, len(prompts), produce,
+        request.target_concurrency, request.evaluation_concurrency)
+    summary = _save_evaluation_results(session, request.session_id, results)
+
+    return {
+        "summary": summary,
+        "results": results
+    }
+
+
+@app.post("/run_red_teaming")
+async def run_red_teaming(request: RedTeamingRunRequest):
+    """
+    Generate adversarial prompts and evaluate the target AI in one run: each prompt is sent to the
+    target AI as soon as it is generated (results and summary are the same as the staged run)
+    """
+    if request.session_id not in sessions:
+        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+
+    session = sessions[request.session_id]
+    language = _ensure_language(getattr(request, "language", "ja"))
+
+    if not session["requirements"]:
+        raise HTTPException(status_code=400, detail="先に要件を生成してください")
+
+    # Clear the prompts of a previous run while this run generates new ones
+    session["adversarial_prompts"] = []
+    total_prompts = len(session["requirements"]) * int(request.prompts_per_requirement)
+
+    async def produce(submit):
+        session["adversarial_prompts"] = await _generate_adversarial_prompts(session, request, on_prompt=submit)
+
+    results = await _evaluate_prompt_stream(
+        session, language, total_prompts, produce,
+        request.target_concurrency, request.evaluation_concurrency)
+    summary = _save_evaluation_results(session, request.session_id, results)
+
     return {
+        "adversarial_prompts": session["adversarial_prompts"],
         "summary": summary,
         "results": results
     }
 
+@app.get("/rate_limits")
+async def rate_limits():
+    """Current limits, concurrency and queue depth of the LLM endpoints"""
+    return {"rate_limits": get_rate_limits()}
+
+@app.get("/generation_progress/{session_id}")
+async def get_generation_progress(session_id: str):
+    """Get adversarial prompt generation progress (overall and per requirement)"""
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+
+    progress_data = sessions[session_id].get("generation_progress") or {}
+    total_prompts = progress_data.get("total_prompts") or 0
+    completed_prompts = progress_data.get("completed_prompts") or 0
+
+    return {
+        "progress": round(completed_prompts / total_prompts * 100) if total_prompts > 0 else 0,
+        "completed_prompts": completed_prompts,
+        "total_prompts": total_prompts,
+        "completed_requirements": progress_data.get("completed_requirements", 0),
+        "total_requirements": progress_data.get("total_requirements", 0),
+        "requirements": progress_data.get("requirements", []),
+        "last_update": progress_data.get("last_update"),
+    }
+
 @app.get("/evaluation_progress/{session_id}")
 async def get_evaluation_progress(session_id: str):
     """Get evaluation progress"""
@@ -739,11 +1149,12 @@ async def get_evaluation_progress(session_id: str):
 
     session = sessions[session_id]
 
-    if not session["adversarial_prompts"]:
-        raise HTTPException(status_code=400, detail="敵対的プロンプトが見つかりません")
-
     progress_data = session.get("evaluation_progress") or {}
 
+    # NOTE: A streaming run (/run_red_teaming) has progress before the prompts are stored
+    if not session["adversarial_prompts"] and not progress_data:
+        raise HTTPException(status_code=400, detail="敵対的プロンプトが見つかりません")
+
     total_prompts = progress_data.get("total_prompts") or len(session["adversarial_prompts"])
     total_steps = progress_data.get("total_steps") or 0
     completed_steps = progress_data.get("completed_steps") or 0
@@ -764,6 +1175,18 @@ async def get_evaluation_progress(session_id: str):
         "last_update": progress_data.get("last_update"),
     }
 
+@app.get("/evaluation_results/{session_id}")
+async def get_evaluation_results(session_id: str, offset: int = 0):
+    """Get the evaluation results completed so far (in completion order, from offset)"""
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+
+    partial_results = sessions[session_id].get("partial_results") or []
+    return {
+        "results": partial_results[offset:],
+        "next_offset": len(partial_results),
+    }
+
 @app.get("/results/{session_id}", response_class=HTMLResponse)
 async def view_results(request: Request, session_id: str):
     """Display evaluation results"""
@@ -846,8 +1269,20 @@ def _create_llm_client(llm_config):
         llm_config: LLM settings
         
     Returns:
-        LLM client instance
+        LLM client instance (rate limited per endpoint)
+    """
+    return with_rate_limit(_create_raw_llm_client(llm_config), llm_config)
+
+def _create_raw_llm_client(llm_config):
+    """
+    Get the LLM client of LLM settings (cached per endpoint and credentials, using the shared HTTP clients)
     """
+    if llm_config.provider == "custom_endpoint" and llm_config.custom_endpoint_url:
+        # NOTE: Holds the prompt and proxy settings of the session; only the HTTP session is shared
+        return _build_llm_client(llm_config)
+    return client_pool.get_client(client_key(llm_config), lambda: _build_llm_client(llm_config))
+
+def _build_llm_client(llm_config):
     # If a custom endpoint is set, it will be prioritized
     if llm_config.provider == "custom_endpoint" and llm_config.custom_endpoint_url:
         return CustomEndpointClient(
@@ -857,28 +1292,33 @@ def _create_llm_client(llm_config):
             use_proxy=llm_config.use_proxy,
             proxy_url=llm_config.proxy_url,
             proxy_username=llm_config.proxy_username,
-            proxy_password=llm_config.proxy_password
+            proxy_password=llm_config.proxy_password,
+            http_session=client_pool.aiohttp_session()
         )
     elif llm_config.provider == "azure":
         return AzureOpenAIClient(
             deployment_name=llm_config.model,
             api_key=llm_config.api_key,
-            api_base=llm_config.api_base
+            api_base=llm_config.api_base,
+            http_client=client_pool.http_client()
         )
     elif llm_config.provider == "huggingface":
         return HuggingFaceClient(
             model_name=llm_config.model,
-            api_key=llm_config.api_key
+            api_key=llm_config.api_key,
+            http_client=client_pool.sync_http_client()
         )
     elif llm_config.provider == "ollama":
         return OllamaClient(
             model_name=llm_config.model,
-            api_base=llm_config.api_base
+            api_base=llm_config.api_base,
+            http_client=client_pool.http_client()
         )
     else:
         return OpenAIClient(
             model_name=llm_config.model,
-            api_key=llm_config.api_key
+            api_key=llm_config.api_key,
+            http_client=client_pool.http_client()
         )
 
 if __name__ == "__main__":
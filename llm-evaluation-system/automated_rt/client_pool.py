@@ -0,0 +1,172 @@
+import os
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional, Callable, Set
+import aiohttp
+import httpx
+import openai
+from llm_client import LLMClient
+
+# Logging settings
+logger = logging.getLogger(__name__)
+
+# Maximum number of connections of the shared HTTP clients (total / per host)
+HTTP_MAX_CONNECTIONS = int(os.environ.get("RT_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("RT_HTTP_MAX_CONNECTIONS_PER_HOST", "0"))
+# Maximum number of idle keep-alive connections and seconds they are kept
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("RT_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("RT_HTTP_KEEPALIVE_EXPIRY", "30"))
+# Request timeout in seconds of the OpenAI compatible clients
+HTTP_TIMEOUT = float(os.environ.get("RT_HTTP_TIMEOUT", "600"))
+# Maximum number of cached LLM clients (the least recently used ones are dropped)
+CLIENT_CACHE_SIZE = int(os.environ.get("RT_CLIENT_CACHE_SIZE", "64"))
+
+
+class ClientPool:
+    """
+    HTTP clients and LLM clients shared by all sessions of the process
+
+    - one httpx client (OpenAI compatible APIs) and one aiohttp session (custom endpoints), so that
+      connections are kept alive and reused instead of a new connection / TLS handshake per call
+    - LLM clients are cached by provider, model, endpoint and credentials (up to CLIENT_CACHE_SIZE)
+
+    NOTE: The async clients are bound to the event loop that created them; they are recreated
+    (with the cached LLM clients) if they are used from another loop
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._sync_http_client: Optional[httpx.Client] = None
+        self._aiohttp_session: Optional[aiohttp.ClientSession] = None
+        self._clients: "OrderedDict[tuple, LLMClient]" = OrderedDict()
+        # Tasks closing the clients of a previous loop (kept so that they are not garbage collected)
+        self._close_tasks: Set[asyncio.Task] = set()
+
+    def _check_loop(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not self._loop:
+            if self._http_client is not None or self._aiohttp_session is not None:
+                logger.info("イベントループが変わったため、HTTPクライアントを作り直します")
+                self._close_on_loop(self._loop, loop, self._aclose_async_clients(self._http_client, self._aiohttp_session))
+            self._loop = loop
+            self._http_client = None
+            self._aiohttp_session = None
+            self._clients = OrderedDict()
+
+    @staticmethod
+    async def _aclose_async_clients(http_client, aiohttp_session):
+        if http_client is not None:
+            await http_client.aclose()
+        if aiohttp_session is not None:
+            await aiohttp_session.close()
+
+    def _close_on_loop(self, old_loop, current_loop, coro):
+        """Close the clients of a previous event loop on that loop"""
+        try:
+            if old_loop is None:
+                # Created outside of an event loop: not bound to a loop yet
+                if current_loop is not None:
+                    task = current_loop.create_task(coro)
+                    self._close_tasks.add(task)
+                    task.add_done_callback(self._close_tasks.discard)
+                else:
+                    asyncio.run(coro)
+            elif old_loop.is_running():
+                asyncio.run_coroutine_threadsafe(coro, old_loop)
+            elif not old_loop.is_closed() and current_loop is None:
+                old_loop.run_until_complete(coro)
+            else:
+                coro.close()
+                logger.warning("以前のイベントループが終了しているため、HTTPクライアントをクローズできませんでした")
+        except Exception as e:
+            coro.close()
+            logger.warning(f"以前のイベントループのHTTPクライアントのクローズに失敗しました: {e}")
+
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared async HTTP client of the OpenAI compatible clients"""
+        self._check_loop()
+        if self._http_client is None:
+            self._http_client = openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=HTTP_TIMEOUT,
+            )
+        return self._http_client
+
+    def sync_http_client(self) -> httpx.Client:
+        """Shared sync HTTP client (Hugging Face client, called from worker threads)"""
+        if self._sync_http_client is None:
+            self._sync_http_client = openai.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=HTTP_TIMEOUT,
+            )
+        return self._sync_http_client
+
+    def aiohttp_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session of the custom endpoint clients (proxy settings are given per request)"""
+        self._check_loop()
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_MAX_CONNECTIONS,
+                limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_EXPIRY,
+            )
+            self._aiohttp_session = aiohttp.ClientSession(connector=connector)
+        return self._aiohttp_session
+
+    def get_client(self, key: tuple, create: Callable[[], LLMClient]) -> LLMClient:
+        """
+        Get the cached LLM client of key, creating it with create() if needed
+        """
+        self._check_loop()
+        client = self._clients.get(key)
+        if client is None:
+            client = create()
+            self._clients[key] = client
+            if len(self._clients) > CLIENT_CACHE_SIZE:
+                # NOTE: The clients use the shared HTTP clients, so nothing has to be closed
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(key)
+        return client
+
+    async def close(self):
+        """Close the shared HTTP clients (app shutdown)"""
+        self._clients = OrderedDict()
+        if self._close_tasks:
+            await asyncio.gather(*self._close_tasks, return_exceptions=True)
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        if self._aiohttp_session is not None:
+            await self._aiohttp_session.close()
+            self._aiohttp_session = None
+        if self._sync_http_client is not None:
+            self._sync_http_client.close()
+            self._sync_http_client = None
+        logger.info("共有HTTPクライアントを閉じました")
+
+
+def client_key(llm_config) -> tuple:
+    """Cache key of the client of LLM settings (the API key is hashed)"""
+    api_key = llm_config.api_key
+    return (
+        llm_config.provider, llm_config.model, llm_config.api_base,
+        hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None,
+    )
+
+
+client_pool = ClientPool()
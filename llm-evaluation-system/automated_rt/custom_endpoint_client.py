@@ -19,7 +19,8 @@ class CustomEndpointClient(LLMClient):
         use_proxy: bool = False,
         proxy_url: Optional[str] = None,
         proxy_username: Optional[str] = None,
-        proxy_password: Optional[str] = None
+        proxy_password: Optional[str] = None,
+        http_session: Optional[aiohttp.ClientSession] = None
     ):
         """
         Initialization of CustomEndpointClient
@@ -32,10 +33,12 @@ class CustomEndpointClient(LLMClient):
             proxy_url: URL of the proxy
             proxy_username: User name of the proxy
             proxy_password: Password of the proxy
+            http_session: Shared session (If none, a session is created per request)
         """
         self.endpoint_url = endpoint_url
         self.system_prompt = system_prompt or ""
         self.target_prefix = target_prefix or ""
+        self.http_session = http_session
         
         # Proxy settings
         self.use_proxy = use_proxy
@@ -80,38 +83,45 @@ class CustomEndpointClient(LLMClient):
             "target_prefix": self.target_prefix
         }
         
-        # Creating a ClientSession with proxy settings
-        session_kwargs = {}
+        # Proxy settings (given per request so that the shared session can be used)
+        request_kwargs = {}
         if self.use_proxy and self.proxy_url:
             if self.proxy_username and self.proxy_password:
                 proxy_auth = aiohttp.BasicAuth(self.proxy_username, self.proxy_password)
-                session_kwargs["proxy_auth"] = proxy_auth
-            session_kwargs["proxy"] = self.proxy_url
+                request_kwargs["proxy_auth"] = proxy_auth
+            request_kwargs["proxy"] = self.proxy_url
         
         try:
             logger.info(f"リクエスト送信先: {self.endpoint_url}")
             logger.debug(f"リクエスト内容: {json.dumps(payload, ensure_ascii=False)}")
             
-            async with aiohttp.ClientSession(**session_kwargs) as session:
-                async with session.post(
-                    self.endpoint_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"エンドポイント呼び出しエラー: ステータス {response.status}, 内容: {error_text}")
-                        return f"エラー: カスタムエンドポイント呼び出しに失敗しました (ステータス {response.status}): {error_text}"
-                    
-                    result = await response.json()
-                    if "answer" in result:
-                        # Unicode エスケープされた文字列を適切にデコード
-                        answer = result["answer"]
-                        logger.debug(f"受信したレスポンス: {answer}")
-                        return answer
-                    else:
-                        logger.error(f"予期しないレスポンス形式: {result}")
-                        return f"エラー: 予期しないレスポンス形式: {str(result)}"
+            if self.http_session is not None:
+                return await self._post(self.http_session, payload, request_kwargs)
+            async with aiohttp.ClientSession() as session:
+                return await self._post(session, payload, request_kwargs)
         except Exception as e:
             logger.exception(f"カスタムエンドポイント呼び出し中の例外: {e}")
             return f"エラー: {str(e)}"
+
+    async def _post(self, session: aiohttp.ClientSession, payload: Dict[str, Any], request_kwargs: Dict[str, Any]) -> str:
+        """Send the request payload to the custom endpoint"""
+        async with session.post(
+            self.endpoint_url,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            **request_kwargs
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"エンドポイント呼び出しエラー: ステータス {response.status}, 内容: {error_text}")
+                return f"エラー: カスタムエンドポイント呼び出しに失敗しました (ステータス {response.status}): {error_text}"
+            
+            result = await response.json()
+            if "answer" in result:
+                # Unicode エスケープされた文字列を適切にデコード
+                answer = result["answer"]
+                logger.debug(f"受信したレスポンス: {answer}")
+                return answer
+            else:
+                logger.error(f"予期しないレスポンス形式: {result}")
+                return f"エラー: 予期しないレスポンス形式: {str(result)}"
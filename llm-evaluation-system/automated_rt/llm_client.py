@@ -3,9 +3,19 @@ import json
 import asyncio
 import openai
 import aiohttp
+import httpx
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
 
+# Prefix of the error text the clients return instead of raising
+ERROR_PREFIX = "エラー: "
+
+
+def is_error_response(response: Optional[str]) -> bool:
+    """Whether response is the error text of a client rather than a response of the LLM"""
+    return bool(response) and response.startswith(ERROR_PREFIX)
+
+
 class LLMClient(ABC):
     """Base class for LLM clients"""
     
@@ -26,16 +36,17 @@ class LLMClient(ABC):
 class OpenAIClient(LLMClient):
     """LLM client using OpenAI API"""
     
-    def __init__(self, model_name: str, api_key: Optional[str] = None):
+    def __init__(self, model_name: str, api_key: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None):
         """
         Initializing the OpenAI client
         
         Args:
             model_name: OpenAI model name to be used
             api_key: OpenAI API key (If none, get a key from environment variables)
+            http_client: Shared HTTP client (If none, the client creates its own)
         """
         self.model_name = model_name
-        self.client = openai.AsyncOpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY"))
+        self.client = openai.AsyncOpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY"), http_client=http_client)
     
     async def generate(self, system_prompt: str, user_prompt: str) -> str:
         """Get generated responses using the OpenAI API"""
@@ -63,7 +74,8 @@ class AzureOpenAIClient(LLMClient):
         deployment_name: str, 
         api_key: Optional[str] = None,
         api_base: Optional[str] = None,
-        api_version: str = "2023-05-15"
+        api_version: str = "2023-05-15",
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initializing the Azure OpenAI client
@@ -73,12 +85,14 @@ class AzureOpenAIClient(LLMClient):
             api_key: Azure OpenAI API key
             api_base: Azure OpenAI API endpoint
             api_version: Azure OpenAI API version
+            http_client: Shared HTTP client (If none, the client creates its own)
         """
         self.deployment_name = deployment_name
         self.client = openai.AsyncAzureOpenAI(
             api_key=api_key or os.environ.get("AZURE_OPENAI_API_KEY"),
             api_version=api_version,
-            azure_endpoint=api_base or os.environ.get("AZURE_OPENAI_ENDPOINT")
+            azure_endpoint=api_base or os.environ.get("AZURE_OPENAI_ENDPOINT"),
+            http_client=http_client
         )
     
     async def generate(self, system_prompt: str, user_prompt: str) -> str:
@@ -105,7 +119,8 @@ class HuggingFaceClient(LLMClient):
     def __init__(
         self,
         model_name: str = "meta-llama/Meta-Llama-3-8B-Instruct",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        http_client: Optional[httpx.Client] = None
     ):
         """
         Initializing the Hugging Face client
@@ -113,13 +128,15 @@ class HuggingFaceClient(LLMClient):
         Args:
             model_name: Model name to use
             api_key: Hugging Face API key (If none, get a key from environment variables)
+            http_client: Shared HTTP client (If none, the client creates its own)
         """
         self.model_name = model_name
         self.api_key = api_key or os.environ.get("HF_API_KEY")
         self.base_url = f"https://router.huggingface.co/hf-inference/models/{model_name}/v1"
         self.client = openai.OpenAI(
             base_url=self.base_url,
-            api_key=self.api_key
+            api_key=self.api_key,
+            http_client=http_client
         )
     
     async def generate(self, system_prompt: str, user_prompt: str) -> str:
@@ -150,7 +167,8 @@ class OllamaClient(LLMClient):
     def __init__(
         self,
         model_name: str = "llama3",
-        api_base: Optional[str] = None
+        api_base: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initializing the Ollama client
@@ -158,10 +176,11 @@ class OllamaClient(LLMClient):
         Args:
             model_name: Model name to use (llama3, llama3:8b, llama3:70b etc.)
             api_base: Base URL of Ollama API (If none, the default localhost:11434 will be used)
+            http_client: Shared HTTP client (If none, the client creates its own)
         """
         self.model_name = model_name
         self.api_base = api_base or "http://localhost:11434/v1/"
-        self.client = openai.AsyncOpenAI(base_url=self.api_base, api_key='dummy_key')
+        self.client = openai.AsyncOpenAI(base_url=self.api_base, api_key='dummy_key', http_client=http_client)
 
     
     #   Using OpenAI compatible API
@@ -19,6 +19,11 @@ class LLMConfig(BaseModel):
     proxy_username: Optional[str] = Field(None, description="プロキシユーザー名")
     proxy_password: Optional[str] = Field(None, description="プロキシパスワード")
 
+    # Rate limit settings of the endpoint (shared by all sessions using the same endpoint)
+    rpm_limit: Optional[int] = Field(None, description="1分あたりの最大リクエスト数", ge=1)
+    tpm_limit: Optional[int] = Field(None, description="1分あたりの最大トークン数", ge=1)
+    max_concurrency: Optional[int] = Field(None, description="最大同時リクエスト数", ge=1)
+
 class LLMRequest(BaseModel):
     """LLM settings request"""
     requirements_llm: LLMConfig = Field(..., description="要件生成に使用するLLM設定")
@@ -49,6 +54,8 @@ class AdversarialPromptRequest(BaseModel):
     session_id: str = Field(..., description="セッションID")
     target_purpose: str = Field(..., description="ターゲットAIの使用目的")
     prompts_per_requirement: int = Field(3, description="要件ごとに生成する敵対的プロンプトの数", ge=1, le=10)
+    concurrency: Optional[int] = Field(None, description="敵対的プロンプト生成の同時リクエスト数（指定がない場合は既定値）", ge=1, le=64)
+    batch_generation: bool = Field(False, description="要件ごとの敵対的プロンプトを1回の呼び出しでまとめて生成するか（ユーザープロンプトテンプレートに{prompts_per_requirement}が含まれる場合のみ有効。それ以外は1個ずつ生成）")
     language: Literal["ja", "en"] = Field("ja", description="リクエスト時のUI言語")
 
 class AdversarialPrompt(BaseModel):
@@ -66,6 +73,13 @@ class EvaluationRequest(BaseModel):
     session_id: str = Field(..., description="セッションID")
     auto_run: bool = Field(False, description="全ての敵対的プロンプトを自動的に実行するかどうか")
     language: Literal["ja", "en"] = Field("ja", description="リクエスト時のUI言語")
+    target_concurrency: Optional[int] = Field(None, description="ターゲットAIへの同時リクエスト数（指定がない場合は既定値）", ge=1, le=64)
+    evaluation_concurrency: Optional[int] = Field(None, description="評価AIへの同時リクエスト数（指定がない場合は既定値）", ge=1, le=64)
+
+class RedTeamingRunRequest(AdversarialPromptRequest):
+    """Request of a streaming run (adversarial prompt generation and evaluation in one run)"""
+    target_concurrency: Optional[int] = Field(None, description="ターゲットAIへの同時リクエスト数（指定がない場合は既定値）", ge=1, le=64)
+    evaluation_concurrency: Optional[int] = Field(None, description="評価AIへの同時リクエスト数（指定がない場合は既定値）", ge=1, le=64)
 
 class Evaluation(BaseModel):
     """Evaluation results"""
@@ -0,0 +1,199 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Optional, List
+from llm_client import LLMClient, is_error_response
+
+# Logging settings
+logger = logging.getLogger(__name__)
+
+# Maximum concurrent calls of an endpoint whose max_concurrency is not set
+DEFAULT_CONCURRENCY = int(os.environ.get("RATE_LIMIT_DEFAULT_CONCURRENCY", "10"))
+# Multiplicative decrease of the concurrency limit on 429
+DECREASE_FACTOR = float(os.environ.get("RATE_LIMIT_DECREASE_FACTOR", "0.5"))
+# Minimum seconds between two decreases
+COOLDOWN = float(os.environ.get("RATE_LIMIT_COOLDOWN", "5"))
+
+_POLL_INTERVAL = 0.05
+_LATENCY_ALPHA = 0.2
+
+
+class _TokenBucket:
+    """Bucket of per_minute units refilled continuously (the level can go negative)"""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def wait_seconds(self, amount: float) -> float:
+        now = time.monotonic()
+        self.level = min(float(self.per_minute), self.level + (now - self.updated) * self.per_minute / 60.0)
+        self.updated = now
+        needed = min(amount, float(self.per_minute)) - self.level
+        return max(needed, 0.0) * 60.0 / self.per_minute
+
+
+class AdaptiveRateLimiter:
+    """
+    Rate limiter and AIMD concurrency controller of one LLM endpoint
+
+    - requests/min and tokens/min are enforced with token buckets
+      (tokens are estimated from the prompt before the call and corrected with the response length)
+    - the number of calls in flight grows by 1/limit per successful call up to max_concurrency and is
+      multiplied by DECREASE_FACTOR on 429 (latency is only reported, it grows with the output length)
+    """
+
+    def __init__(self, name: str, rpm_limit: Optional[int] = None, tpm_limit: Optional[int] = None,
+                 max_concurrency: Optional[int] = None):
+        self.name = name
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.throttled = 0
+        self.latency_avg = None
+        self._last_decrease = 0.0
+        self.configure(rpm_limit, tpm_limit, max_concurrency)
+
+    def configure(self, rpm_limit: Optional[int], tpm_limit: Optional[int], max_concurrency: Optional[int]):
+        self.rpm_limit = rpm_limit or None
+        self.tpm_limit = tpm_limit or None
+        self.max_concurrency = max(max_concurrency or DEFAULT_CONCURRENCY, 1)
+        self._requests_bucket = _TokenBucket(self.rpm_limit) if self.rpm_limit else None
+        self._tokens_bucket = _TokenBucket(self.tpm_limit) if self.tpm_limit else None
+        self.limit = float(self.max_concurrency)
+
+    def settings(self) -> tuple:
+        return (self.rpm_limit, self.tpm_limit, self.max_concurrency)
+
+    def _try_acquire(self, tokens: int) -> float:
+        if self.in_flight >= int(self.limit):
+            return _POLL_INTERVAL
+        wait = 0.0
+        if self._requests_bucket is not None:
+            wait = max(wait, self._requests_bucket.wait_seconds(1))
+        if self._tokens_bucket is not None:
+            wait = max(wait, self._tokens_bucket.wait_seconds(tokens))
+        if wait > 0:
+            return wait
+        if self._requests_bucket is not None:
+            self._requests_bucket.level -= 1
+        if self._tokens_bucket is not None:
+            self._tokens_bucket.level -= tokens
+        self.in_flight += 1
+        self.requests += 1
+        return 0.0
+
+    async def acquire(self, estimated_tokens: int = 0):
+        """Wait for a slot (call release afterwards)"""
+        self.waiting += 1
+        try:
+            while True:
+                wait = self._try_acquire(estimated_tokens)
+                if wait == 0:
+                    return
+                await asyncio.sleep(min(wait, 1.0))
+        finally:
+            self.waiting -= 1
+
+    def release(self):
+        self.in_flight -= 1
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        if now - self._last_decrease < COOLDOWN:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+        logger.warning(f"{self.name} の同時実行数を{int(previous)}から{int(self.limit)}に下げました。({reason})")
+
+    def on_success(self, latency: float, estimated_tokens: int = 0, used_tokens: Optional[int] = None):
+        if self._tokens_bucket is not None and used_tokens is not None:
+            self._tokens_bucket.level -= used_tokens - estimated_tokens
+        self.latency_avg = latency if self.latency_avg is None else (
+            _LATENCY_ALPHA * latency + (1 - _LATENCY_ALPHA) * self.latency_avg)
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def on_throttle(self):
+        self.throttled += 1
+        self._decrease("429")
+
+    def snapshot(self) -> Dict:
+        return {
+            "name": self.name,
+            "rpm_limit": self.rpm_limit,
+            "tpm_limit": self.tpm_limit,
+            "max_concurrency": self.max_concurrency,
+            "current_concurrency": int(self.limit),
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "latency_avg": round(self.latency_avg, 3) if self.latency_avg is not None else None,
+        }
+
+
+def _is_rate_limited(response: str) -> bool:
+    if not is_error_response(response):
+        return False
+    lowered = response.lower()
+    return "429" in lowered or "rate limit" in lowered or "ratelimit" in lowered
+
+
+class RateLimitedClient(LLMClient):
+    """LLM client that calls the wrapped client through the limiter of its endpoint"""
+
+    def __init__(self, client: LLMClient, limiter: AdaptiveRateLimiter):
+        self.client = client
+        self.limiter = limiter
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        # NOTE: ~4 characters per token
+        estimated_tokens = (len(system_prompt or "") + len(user_prompt or "")) // 4
+        await self.limiter.acquire(estimated_tokens)
+        try:
+            start = time.perf_counter()
+            response = await self.client.generate(system_prompt, user_prompt)
+            if _is_rate_limited(response):
+                self.limiter.on_throttle()
+            else:
+                self.limiter.on_success(time.perf_counter() - start, estimated_tokens,
+                                        estimated_tokens + len(response or "") // 4)
+            return response
+        finally:
+            self.limiter.release()
+
+
+# Limiters of the process, shared by all sessions that use the same endpoint
+_limiters: Dict[tuple, AdaptiveRateLimiter] = {}
+
+
+def _endpoint_key(llm_config) -> tuple:
+    return (llm_config.provider, llm_config.model,
+            llm_config.custom_endpoint_url or llm_config.api_base or "")
+
+
+def with_rate_limit(client: LLMClient, llm_config) -> LLMClient:
+    """
+    Wrap a client with the limiter of its endpoint (settings from the LLM settings).
+    The client is returned as is when no limit is set
+    """
+    if not (llm_config.rpm_limit or llm_config.tpm_limit or llm_config.max_concurrency):
+        return client
+    key = _endpoint_key(llm_config)
+    settings = (llm_config.rpm_limit or None, llm_config.tpm_limit or None,
+                max(llm_config.max_concurrency or DEFAULT_CONCURRENCY, 1))
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(f"{llm_config.provider}/{llm_config.model}", *settings)
+        _limiters[key] = limiter
+    elif limiter.settings() != settings:
+        limiter.configure(*settings)
+    return RateLimitedClient(client, limiter)
+
+
+def get_rate_limits() -> List[Dict]:
+    """Current limits, concurrency and queue depth of every endpoint"""
+    return [limiter.snapshot() for limiter in _limiters.values()]
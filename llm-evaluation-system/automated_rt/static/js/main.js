@@ -1258,6 +1258,28 @@ async function generateAdversarialPrompts() {
     const originalButtonText = originalButtonKey ? automatedRtI18n.t(originalButtonKey) : submitButton.innerHTML;
     submitButton.disabled = true;
     submitButton.innerHTML = automatedRtI18n.t('buttons.generating');
+
+    // Show the number of generated prompts while the requirements are processed concurrently
+    let pollingActive = true;
+    let progressTimeoutId = null;
+    const pollGenerationProgress = async () => {
+        if (!pollingActive) {
+            return;
+        }
+        try {
+            const progressResponse = await axios.get(`/generation_progress/${currentSessionId}`);
+            const { completed_prompts: completed, total_prompts: total } = progressResponse.data;
+            if (pollingActive && total > 0) {
+                submitButton.innerHTML = `${automatedRtI18n.t('buttons.generating')} (${completed}/${total})`;
+            }
+        } catch (error) {
+            console.error('進捗チェックエラー:', error);
+        }
+        if (pollingActive) {
+            progressTimeoutId = setTimeout(pollGenerationProgress, 1000);
+        }
+    };
+    progressTimeoutId = setTimeout(pollGenerationProgress, 1000);
     
     try {
         const response = await axios.post('/generate_adversarial_prompts', {
@@ -1287,6 +1309,10 @@ async function generateAdversarialPrompts() {
             'danger'
         );
     } finally {
+        pollingActive = false;
+        if (progressTimeoutId) {
+            clearTimeout(progressTimeoutId);
+        }
         // Reset button
         submitButton.disabled = false;
         submitButton.innerHTML = originalButtonKey ? automatedRtI18n.t(originalButtonKey) : originalButtonText;